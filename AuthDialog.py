@@ -3,6 +3,8 @@ from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
                               QMessageBox, QApplication, QCheckBox)
 from PySide6.QtCore import Qt
 from base_classes import App
+from async_runner import get_runner
+from async_bridge import AsyncTask
 from local_storage import LocalCredentialStorage
 from ColorProfile import ColorProfile
 from logger_config import get_logger
@@ -16,6 +18,8 @@ class AuthDialog(QDialog):
         logger.info("Initializing AuthDialog")
         self.app = App()
         self.user = None
+        self.auth_task = None
+        self.credentials_task = None
         self.credential_storage = LocalCredentialStorage()
         # Get color profile from parent if available, otherwise create default
         self.color_profile = getattr(parent, 'color_profile', ColorProfile())
@@ -224,7 +228,7 @@ class AuthDialog(QDialog):
         signin_layout.addLayout(remember_layout)
         
         # Sign in button
-        signin_btn = QPushButton("Sign In")
+        signin_btn = self.signin_btn = QPushButton("Sign In")
         signin_btn.setStyleSheet(f"""
             QPushButton {{
                  background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
@@ -297,7 +301,7 @@ class AuthDialog(QDialog):
         signup_layout.addWidget(self.remember_signup)
         
         # Sign up button
-        signup_btn = QPushButton("Create Account")
+        signup_btn = self.signup_btn = QPushButton("Create Account")
         signup_btn.setStyleSheet(f"""
             QPushButton {{
                 background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
@@ -347,29 +351,8 @@ class AuthDialog(QDialog):
             QMessageBox.warning(self, "Missing Information", "Please enter both email and password.")
             return
         
-        logger.info(f"Attempting sign in for email: {email}")
-        try:
-            self.app.login_or_signup(email, password)
-            if self.app.user:
-                self.user = self.app.user
-                logger.info(f"Sign in successful for user: {email}")
-                
-                # Save credentials if "Remember me" is checked
-                if self.remember_signin.isChecked():
-                    logger.debug("Saving credentials (remember me checked)")
-                    success = self.credential_storage.save_credentials(email, password)
-                    if not success:
-                        logger.warning("Failed to save credentials locally")
-                        QMessageBox.warning(self, "Warning", "Failed to save credentials locally.")
-                
-                QMessageBox.information(self, "Welcome Back! 🎉", f"Successfully signed in as {self.user.name}")
-                self.accept()
-            else:
-                logger.error("Sign in failed - no user object returned")
-                QMessageBox.warning(self, "Sign In Failed", "Please check your credentials and try again.")
-        except Exception as e:
-            logger.error(f"Sign in failed for {email}: {str(e)}", exc_info=True)
-            QMessageBox.warning(self, "Sign In Error", f"Sign in failed: {str(e)}")
+        logger.info("Attempting sign in for email: %s", email)
+        self.run_auth(email, password, None, self.remember_signin.isChecked())
             
     def sign_up(self):
         logger.info("Sign up button clicked")
@@ -382,44 +365,105 @@ class AuthDialog(QDialog):
             QMessageBox.warning(self, "Missing Information", "Please fill in all fields.")
             return
         
-        logger.info(f"Attempting sign up for email: {email}, name: {name}")
-        try:
-            self.app.login_or_signup(email, password, name)
-            if self.app.user:
-                self.user = self.app.user
-                logger.info(f"Sign up successful for user: {email}")
-                
-                # Save credentials if "Remember me" is checked
-                if self.remember_signup.isChecked():
-                    logger.debug("Saving credentials (remember me checked)")
-                    success = self.credential_storage.save_credentials(email, password)
-                    if not success:
-                        logger.warning("Failed to save credentials locally")
-                        QMessageBox.warning(self, "Warning", "Failed to save credentials locally.")
-                
-                QMessageBox.information(self, "Account Created! 🎉", f"Welcome to Emphizor, {self.user.name}!")
-                self.accept()
-            else:
-                logger.error("Sign up failed - no user object returned")
+        logger.info("Attempting sign up for email: %s, name: %s", email, name)
+        self.run_auth(email, password, name, self.remember_signup.isChecked())
+    
+    def run_auth(self, email, password, name, remember):
+        """Sign in (or sign up when a name is given) on the async I/O runner, the dialog stays responsive"""
+        if self.auth_task and self.auth_task.is_running():
+            return
+        self.set_busy(True)
+        self.auth_task = AsyncTask(self)
+        self.auth_task.succeeded.connect(lambda _: self.on_auth_succeeded(email, password, name, remember))
+        self.auth_task.failed.connect(lambda error: self.on_auth_failed(email, name, error))
+        self.auth_task.start(get_runner().run_blocking(self.app.login_or_signup, email, password, name))
+        
+    def set_busy(self, busy):
+        self.signin_btn.setEnabled(not busy)
+        self.signup_btn.setEnabled(not busy)
+        self.signin_btn.setText("Signing in..." if busy else "Sign In")
+        self.signup_btn.setText("Creating account..." if busy else "Create Account")
+        
+    def on_auth_succeeded(self, email, password, name, remember):
+        self.set_busy(False)
+        action = "Sign up" if name else "Sign in"
+        if not self.app.user:
+            logger.error("%s failed - no user object returned", action)
+            if name:
                 QMessageBox.warning(self, "Sign Up Failed", "Account creation failed. Please try again.")
+            else:
+                QMessageBox.warning(self, "Sign In Failed", "Please check your credentials and try again.")
+            return
+        
+        self.user = self.app.user
+        logger.info("%s successful for user: %s", action, email)
+        
+        # Save credentials if "Remember me" is checked
+        if remember:
+            logger.debug("Saving credentials (remember me checked)")
+            success = self.credential_storage.save_credentials(email, password)
+            if not success:
+                logger.warning("Failed to save credentials locally")
+                QMessageBox.warning(self, "Warning", "Failed to save credentials locally.")
+            self.remember_session(email)
+        
+        if name:
+            QMessageBox.information(self, "Account Created! 🎉", f"Welcome to Emphizor, {self.user.name}!")
+        else:
+            QMessageBox.information(self, "Welcome Back! 🎉", f"Successfully signed in as {self.user.name}")
+        self.accept()
+        
+    def remember_session(self, email):
+        """Keep the session tokens so the next start skips the password sign in"""
+        try:
+            tokens = self.app.session_tokens()
         except Exception as e:
-            logger.error(f"Sign up failed for {email}: {str(e)}", exc_info=True)
-            QMessageBox.warning(self, "Sign Up Error", f"Sign up failed: {str(e)}")
+            logger.warning("Could not read auth session: %s", e)
+            return
+        if tokens:
+            self.credential_storage.save_session(email, *tokens)
+        # Tokens refreshed later in this session are saved as well
+        self.app.session_listener = self.credential_storage.save_session
+        
+    def on_auth_failed(self, email, name, error_message):
+        self.set_busy(False)
+        if name:
+            logger.error("Sign up failed for %s: %s", email, error_message)
+            QMessageBox.warning(self, "Sign Up Error", f"Sign up failed: {error_message}")
+        else:
+            logger.error("Sign in failed for %s: %s", email, error_message)
+            QMessageBox.warning(self, "Sign In Error", f"Sign in failed: {error_message}")
+            
+    def reject(self):
+        # A sign in still in flight is abandoned with the dialog
+        if self.auth_task:
+            self.auth_task.cancel()
+        if self.credentials_task:
+            self.credentials_task.cancel()
+        super().reject()
     
     def load_saved_credentials(self):
-        """Load saved credentials and populate the sign-in form"""
+        """Fill in the sign-in form from saved credentials, decrypted off the GUI thread
+        
+        The first start derives the encryption key, the dialog is usable meanwhile.
+        """
         logger.info("Loading saved credentials")
-        try:
-            email, password = self.credential_storage.load_credentials()
-            if email and password:
-                logger.info(f"Loaded saved credentials for email: {email}")
-                self.signin_email.setText(email)
-                self.signin_password.setText(password)
-                self.remember_signin.setChecked(True)
-            else:
-                logger.debug("No saved credentials found")
-        except Exception as e:
-            logger.error(f"Error loading saved credentials: {e}", exc_info=True)
+        self.credentials_task = AsyncTask(self)
+        self.credentials_task.succeeded.connect(self.on_saved_credentials_loaded)
+        self.credentials_task.start(get_runner().run_blocking(self.credential_storage.load_credentials))
+    
+    def on_saved_credentials_loaded(self, credentials):
+        email, password = credentials
+        if not (email and password):
+            logger.debug("No saved credentials found")
+            return
+        # Don't overwrite what the user started typing
+        if self.signin_email.text() or self.signin_password.text():
+            return
+        logger.info("Loaded saved credentials for email: %s", email)
+        self.signin_email.setText(email)
+        self.signin_password.setText(password)
+        self.remember_signin.setChecked(True)
     
     def clear_saved_credentials(self):
         """Clear saved credentials"""
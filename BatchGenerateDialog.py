@@ -0,0 +1,257 @@
+from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QPlainTextEdit,
+                              QProgressBar, QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox)
+from PySide6.QtCore import Qt, QThread, Signal
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+from fsrs import Card
+from base_classes import FullCard
+from ColorProfile import ColorProfile
+from config import Config
+import answer_service
+from logger_config import get_logger
+
+# Set up logger for this module
+logger = get_logger(__name__)
+
+
+def parse_questions(text: str) -> list[str]:
+    """One question per non-empty line, duplicates dropped"""
+    questions = []
+    seen = set()
+    for line in text.splitlines():
+        question = line.strip()
+        if question and question not in seen:
+            seen.add(question)
+            questions.append(question)
+    return questions
+
+
+class BatchAnswerGenerationWorker(QThread):
+    """Worker thread that generates answers for many questions with a bounded number of requests in flight"""
+    answer_ready = Signal(int, str)     # question index, answer
+    answer_failed = Signal(int, str)    # question index, error message
+    progress = Signal(int, int)         # done, total
+
+    def __init__(self, questions, answer_cache=None, max_workers=4):
+        super().__init__()
+        self.questions = list(questions)
+        self.answer_cache = answer_cache
+        self.max_workers = max_workers
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def _generate(self, question):
+        if self._cancelled.is_set():
+            return None
+        return answer_service.generate_answer(question, self.answer_cache)
+
+    def run(self):
+        total = len(self.questions)
+        logger.info("Starting batch answer generation for %s questions with %s workers", total, self.max_workers)
+        done = 0
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="answer")
+        try:
+            futures = {executor.submit(self._generate, question): index
+                       for index, question in enumerate(self.questions)}
+            for future in as_completed(futures):
+                if self._cancelled.is_set():
+                    logger.info("Batch answer generation cancelled after %s of %s", done, total)
+                    break
+                index = futures[future]
+                try:
+                    self.answer_ready.emit(index, future.result())
+                except Exception as e:
+                    logger.warning("Answer generation failed for question %s: %s", index + 1, e)
+                    self.answer_failed.emit(index, str(e))
+                done += 1
+                self.progress.emit(done, total)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+        logger.info("Batch answer generation finished: %s of %s questions processed", done, total)
+
+
+class BatchGenerateDialog(QDialog):
+    """Paste a list of questions, generate all answers, review the drafts and add them as cards"""
+    QUESTION_COLUMN = 0
+    ANSWER_COLUMN = 1
+
+    def __init__(self, user, tags=(), answer_cache=None, parent=None):
+        super().__init__(parent)
+        self.user = user
+        self.tags = set(tags)
+        self.answer_cache = answer_cache
+        self.worker = None
+        self.color_profile = getattr(parent, 'color_profile', ColorProfile())
+        self.setup_ui()
+
+    def setup_ui(self):
+        self.setWindowTitle("Batch Generate Cards")
+        self.resize(900, 700)
+        self.setMinimumSize(600, 450)
+        self.setStyleSheet(f"""
+            QDialog {{
+                background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
+                    stop: 0 {self.color_profile.main_color.name()}, stop: 1 {self.color_profile.gradient_end_color.name()});
+            }}
+            QLabel {{
+                color: white;
+                font-size: 14px;
+            }}
+            QPlainTextEdit, QTableWidget {{
+                background: rgba(255, 255, 255, 0.95);
+                border: none;
+                border-radius: 10px;
+                color: #333;
+                font-size: 13px;
+            }}
+            QPushButton {{
+                background: {self.color_profile.gradient_end_color.darker(130).name()};
+                border: none;
+                border-radius: 12px;
+                color: white;
+                font-weight: bold;
+                font-size: 14px;
+                padding: 10px 20px;
+            }}
+            QPushButton:disabled {{
+                background: rgba(255, 255, 255, 0.3);
+            }}
+        """)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(12)
+
+        self.hint_label = QLabel()
+        layout.addWidget(self.hint_label)
+        self.set_tags(self.tags)
+
+        self.questions_edit = QPlainTextEdit()
+        self.questions_edit.setPlaceholderText("What is photosynthesis?\nWhat is the speed of light?")
+        layout.addWidget(self.questions_edit, 1)
+
+        self.generate_btn = QPushButton("Generate answers")
+        self.generate_btn.clicked.connect(self.start_generation)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setVisible(False)
+        generate_layout = QHBoxLayout()
+        generate_layout.addWidget(self.generate_btn)
+        generate_layout.addWidget(self.progress_bar, 1)
+        layout.addLayout(generate_layout)
+
+        # Draft cards, answers can be edited and unchecked rows are not added
+        self.drafts_table = QTableWidget(0, 2)
+        self.drafts_table.setHorizontalHeaderLabels(["Question", "Answer"])
+        self.drafts_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.drafts_table.verticalHeader().setVisible(False)
+        self.drafts_table.setWordWrap(True)
+        layout.addWidget(self.drafts_table, 2)
+
+        self.add_btn = QPushButton("Add cards")
+        self.add_btn.setEnabled(False)
+        self.add_btn.clicked.connect(self.add_cards)
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.reject)
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addStretch()
+        buttons_layout.addWidget(self.add_btn)
+        buttons_layout.addWidget(close_btn)
+        layout.addLayout(buttons_layout)
+
+    def set_tags(self, tags):
+        """Tags given to the cards added from the drafts"""
+        self.tags = set(tags)
+        tags_text = ", ".join(sorted(self.tags)) if self.tags else "none"
+        self.hint_label.setText(f"Paste one question per line. New cards get the selected tags: {tags_text}")
+
+    def start_generation(self):
+        questions = parse_questions(self.questions_edit.toPlainText())
+        if not questions:
+            QMessageBox.warning(self, "No Questions", "Please enter at least one question.")
+            return
+
+        self.drafts_table.setRowCount(len(questions))
+        for row, question in enumerate(questions):
+            question_item = QTableWidgetItem(question)
+            # Only rows with a generated answer can be checked
+            question_item.setFlags(Qt.ItemFlag.ItemIsEnabled)
+            self.drafts_table.setItem(row, self.QUESTION_COLUMN, question_item)
+            answer_item = QTableWidgetItem("Generating...")
+            answer_item.setFlags(Qt.ItemFlag.ItemIsEnabled)
+            self.drafts_table.setItem(row, self.ANSWER_COLUMN, answer_item)
+
+        self.generate_btn.setEnabled(False)
+        self.questions_edit.setReadOnly(True)
+        self.progress_bar.setRange(0, len(questions))
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+
+        self.worker = BatchAnswerGenerationWorker(questions, self.answer_cache, Config.ANSWER_BATCH_CONCURRENCY)
+        self.worker.answer_ready.connect(self.on_answer_ready)
+        self.worker.answer_failed.connect(self.on_answer_failed)
+        self.worker.progress.connect(self.on_progress)
+        self.worker.finished.connect(self.on_generation_finished)
+        self.worker.start()
+
+    def on_answer_ready(self, row, answer):
+        answer_item = self.drafts_table.item(row, self.ANSWER_COLUMN)
+        answer_item.setText(answer)
+        answer_item.setFlags(Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsEditable | Qt.ItemFlag.ItemIsSelectable)
+        question_item = self.drafts_table.item(row, self.QUESTION_COLUMN)
+        question_item.setFlags(Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsUserCheckable)
+        question_item.setCheckState(Qt.CheckState.Checked)
+        self.add_btn.setEnabled(True)
+
+    def on_answer_failed(self, row, error_message):
+        answer_item = self.drafts_table.item(row, self.ANSWER_COLUMN)
+        answer_item.setText(f"Failed: {error_message}")
+        answer_item.setToolTip(error_message)
+
+    def on_progress(self, done, total):
+        self.progress_bar.setValue(done)
+        self.progress_bar.setFormat(f"{done} / {total}")
+
+    def on_generation_finished(self):
+        self.generate_btn.setEnabled(True)
+        self.questions_edit.setReadOnly(False)
+        if self.worker:
+            self.worker.deleteLater()
+            self.worker = None
+
+    def add_cards(self):
+        """Add every checked draft with an answer as a new card"""
+        added = 0
+        for row in range(self.drafts_table.rowCount()):
+            question_item = self.drafts_table.item(row, self.QUESTION_COLUMN)
+            if not question_item.flags() & Qt.ItemFlag.ItemIsUserCheckable:
+                continue
+            if question_item.checkState() != Qt.CheckState.Checked:
+                continue
+            answer = self.drafts_table.item(row, self.ANSWER_COLUMN).text().strip()
+            if not answer:
+                continue
+            self.user.add_card(FullCard(Card(), question_item.text(), answer, set(self.tags)))
+            # A draft is only added once
+            question_item.setCheckState(Qt.CheckState.Unchecked)
+            question_item.setFlags(Qt.ItemFlag.ItemIsEnabled)
+            added += 1
+        logger.info("Added %s cards from batch generation", added)
+        self.add_btn.setEnabled(False)
+        QMessageBox.information(self, "Cards Added", f"Added {added} cards to your collection.")
+
+    def stop_worker(self, wait_ms=0):
+        """Cancel the remaining questions, requests already sent finish in the background"""
+        if self.worker and self.worker.isRunning():
+            self.worker.cancel()
+            if wait_ms:
+                self.worker.wait(wait_ms)
+
+    def reject(self):
+        self.stop_worker()
+        super().reject()
+
+    def closeEvent(self, event):
+        self.stop_worker()
+        super().closeEvent(event)
@@ -6,11 +6,46 @@ from PySide6.QtGui import QFont, QColor, QPalette
 import random
 import math
 from base_classes import FullCard
+from theme import set_style_property
 from logger_config import get_logger
 
 # Set up logger for this module
 logger = get_logger(__name__)
 
+# Set once on the grid holding the cards, a card switches between the rules with its "state" property
+CARD_STYLESHEET = """
+    QFrame#conceptCard {
+        background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+            stop: 0 #ffffff, stop: 1 #f8f9fa);
+        border: 2px solid #bdc3c7;
+        border-radius: 12px;
+    }
+    QFrame#conceptCard[state="idle"]:hover {
+        background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+            stop: 0 #ecf0f1, stop: 1 #d5dbdb);
+        border-color: #95a5a6;
+    }
+    QFrame#conceptCard[state="selected"] {
+        background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+            stop: 0 #3498db, stop: 1 #2980b9);
+        border: 3px solid #1f5582;
+    }
+    QFrame#conceptCard[state="matched"] {
+        background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+            stop: 0 #2ecc71, stop: 1 #27ae60);
+        border: 3px solid #229954;
+    }
+    QFrame#conceptCard QLabel {
+        color: #2c3e50;
+        font-weight: bold;
+        font-size: 12px;
+        background: transparent;
+    }
+    QFrame#conceptCard[state="selected"] QLabel, QFrame#conceptCard[state="matched"] QLabel {
+        color: white;
+    }
+"""
+
 class CardWidget(QFrame):
     """Simple clickable card widget with animations"""
     def __init__(self, full_card, parent=None, card_type="question"):
@@ -24,6 +59,7 @@ class CardWidget(QFrame):
         self.setup_ui()
         
     def setup_ui(self):
+        self.setObjectName("conceptCard")
         self.setFixedSize(200, 120)
         self.setFrameStyle(QFrame.Shape.Box)
         self.setLineWidth(2)
@@ -42,73 +78,16 @@ class CardWidget(QFrame):
         self.text_label = QLabel(content_text)
         self.text_label.setWordWrap(True)
         self.text_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.text_label.setStyleSheet("""
-            QLabel {
-                color: #2c3e50;
-                font-weight: bold;
-                font-size: 12px;
-                background: transparent;
-            }
-        """)
         layout.addWidget(self.text_label)
         
         self.update_style()
         
     def update_style(self):
-        """Update visual style based on state with smooth color transitions"""
-        if self.matched:
-            self.setStyleSheet("""
-                QFrame {
-                    background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                        stop: 0 #2ecc71, stop: 1 #27ae60);
-                    border: 3px solid #229954;
-                    border-radius: 12px;
-                    box-shadow: 0 4px 8px rgba(0, 0, 0, 0.2);
-                }
-                QLabel {
-                    color: white;
-                    font-weight: bold;
-                    font-size: 12px;
-                    background: transparent;
-                }
-            """)
-        elif self.selected:
-            self.setStyleSheet("""
-                QFrame {
-                    background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                        stop: 0 #3498db, stop: 1 #2980b9);
-                    border: 3px solid #1f5582;
-                    border-radius: 12px;
-                    box-shadow: 0 4px 8px rgba(0, 0, 0, 0.2);
-                }
-                QLabel {
-                    color: white;
-                    font-weight: bold;
-                    font-size: 12px;
-                    background: transparent;
-                }
-            """)
-        else:
-            self.setStyleSheet("""
-                QFrame {
-                    background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                        stop: 0 #ffffff, stop: 1 #f8f9fa);
-                    border: 2px solid #bdc3c7;
-                    border-radius: 12px;
-                    box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-                }
-                QFrame:hover {
-                    background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                        stop: 0 #ecf0f1, stop: 1 #d5dbdb);
-                    border-color: #95a5a6;
-                }
-                QLabel {
-                    color: #2c3e50;
-                    font-weight: bold;
-                    font-size: 12px;
-                    background: transparent;
-                }
-            """)
+        """Switch the card's style rules to match its state"""
+        state = "matched" if self.matched else "selected" if self.selected else "idle"
+        if self.property("state") != state:
+            # The label's color depends on the card's state as well
+            set_style_property(self, "state", state, self.text_label)
             
     def animate_selection(self):
         """Animate card selection with a bounce effect"""
@@ -227,7 +206,7 @@ class ConceptConnectDialog(QDialog):
     
     def __init__(self, user, parent=None):
         super().__init__(parent)
-        logger.info(f"Initializing ConceptConnectDialog for user: {user.email}")
+        logger.info("Initializing ConceptConnectDialog for user: %s", user.email)
         self.user = user
         self.color_profile = getattr(parent, 'color_profile', None)
         self.sound_manager = getattr(parent, 'sound_manager', None)
@@ -241,7 +220,7 @@ class ConceptConnectDialog(QDialog):
         self.score_animation = None
         self.setup_ui()
         self.load_game_cards()
-        logger.info(f"ConceptConnectDialog initialized with {len(self.game_cards)} cards")
+        logger.info("ConceptConnectDialog initialized with %s cards", len(self.game_cards))
         
     def setup_ui(self):
         self.setWindowTitle("Concept Connect - Match Related Cards")
@@ -311,6 +290,7 @@ class ConceptConnectDialog(QDialog):
         game_layout = QVBoxLayout(game_widget)
         
         self.cards_area = QWidget()
+        self.cards_area.setStyleSheet(CARD_STYLESHEET)
         self.cards_layout = QGridLayout(self.cards_area)
         self.cards_layout.setSpacing(15)
         
@@ -10,7 +10,7 @@ logger = get_logger(__name__)
 class EnterStringDialog(QDialog):
     def __init__(self, label_message, title, parent, len_limit):
         super().__init__(parent)
-        logger.info(f"Initializing EnterStringDialog - Title: {title}, Length limit: {len_limit}")
+        logger.info("Initializing EnterStringDialog - Title: %s, Length limit: %s", title, len_limit)
         self.setParent(parent)
         self.len_limit = len_limit
         self.setup_ui(label_message, title)
@@ -13,7 +13,7 @@ logger = get_logger(__name__)
 class PracticeDialog(QDialog):
     def __init__(self, user, app, parent=None):
         super().__init__(parent)
-        logger.info(f"Initializing PracticeDialog for user: {user.email}")
+        logger.info("Initializing PracticeDialog for user: %s", user.email)
         self.user = user
         self.app = app
         self.current_card_index = 0
@@ -22,9 +22,13 @@ class PracticeDialog(QDialog):
         self.cards_reviewed = 0
         self.cant_practice = False
         self.sound_manager = getattr(parent, 'sound_manager', None)
+        self.save_worker = getattr(parent, 'save_worker', None)
         self.setup_ui()
         self.load_due_cards()
-        logger.info(f"PracticeDialog initialized with {len(self.due_cards)} due cards")
+        if not self.cant_practice:
+            user.deck_listeners.append(self.on_deck_replaced)
+            self.finished.connect(lambda: user.deck_listeners.remove(self.on_deck_replaced))
+        logger.info("PracticeDialog initialized with %s due cards", len(self.due_cards))
         
     def setup_ui(self):
         self.setWindowTitle("Practice Session - Emphizor")
@@ -315,11 +319,7 @@ class PracticeDialog(QDialog):
         for button in self.parent().tag_buttons:
             if button.isChecked():
                 selected_tags.add(button.text())
-        self.due_cards = []
-        
-        for full_card in self.user.full_cards:
-            if full_card.card.due <= now and full_card.tags <= selected_tags:
-                self.due_cards.append(full_card)
+        self.due_cards = self.user.due_cards(now, selected_tags)
         
         if not self.due_cards:
             QMessageBox.information(self, "No Due Cards", "No cards are due for review right now. Great job staying on top of your studies!")
@@ -330,6 +330,19 @@ class PracticeDialog(QDialog):
         self.current_card_index = 0
         self.update_display()
         
+    def on_deck_replaced(self):
+        """Drop cards a server sync removed, so they are not graded back into the deck"""
+        cards_by_id = self.user.cards_by_id
+        current = self.due_cards[self.current_card_index] if self.current_card_index < len(self.due_cards) else None
+        remaining = [full_card for full_card in self.due_cards[self.current_card_index:]
+                     if cards_by_id.get(full_card.card_id) is full_card]
+        self.due_cards = self.due_cards[:self.current_card_index] + remaining
+        logger.info("Deck changed during practice, %s cards left", len(remaining))
+        if not remaining or remaining[0] is not current:
+            self.update_display()
+        else:
+            self.progress_label.setText(f"Card {self.current_card_index + 1} of {len(self.due_cards)}")
+        
     def update_display(self):
         """Update the display with current card"""
         if self.current_card_index >= len(self.due_cards):
@@ -363,7 +376,7 @@ class PracticeDialog(QDialog):
     def rate_card(self, rating):
         """Rate the current card and move to next"""
         current_card = self.due_cards[self.current_card_index]
-        logger.info(f"Rating card {self.current_card_index + 1} with rating: {rating}")
+        logger.info("Rating card %s with rating: %s", self.current_card_index + 1, rating)
         
         # Play appropriate sound based on rating
         if self.sound_manager:
@@ -376,33 +389,37 @@ class PracticeDialog(QDialog):
         try:
             updated_card, review_log = self.user.scheduler.review_card(current_card.card, rating)
             
-            # Update the card in the full_card object
-            current_card.card = updated_card
-            
-            # Store the review log
-            self.user.review_logs.append(review_log)
+            # Update the card and store the review log
+            self.user.record_review(current_card, updated_card, review_log)
             self.review_logs.append(review_log)
             
             self.cards_reviewed += 1
-            logger.info(f"Card rated successfully. Total cards reviewed: {self.cards_reviewed}")
+            logger.info("Card rated successfully. Total cards reviewed: %s", self.cards_reviewed)
             
             # Move to next card
             self.current_card_index += 1
             self.update_display()
             
         except Exception as e:
-            logger.error(f"Failed to rate card: {str(e)}", exc_info=True)
+            logger.error("Failed to rate card: %s", e, exc_info=True)
             QMessageBox.warning(self, "Error", f"Failed to rate card: {str(e)}")
             
     def finish_practice(self):
         """Finish the practice session"""
-        logger.info(f"Finishing practice session. Cards reviewed: {self.cards_reviewed}")
+        logger.info("Finishing practice session. Cards reviewed: %s", self.cards_reviewed)
         if self.cards_reviewed > 0:
             try:
-                # Save updated user data
+                # Save updated user data without blocking the dialog
                 logger.info("Saving user data after practice session")
-                self.app.save_user()
-                logger.info("Practice session data saved successfully")
+                if self.save_worker:
+                    self.save_worker.request_save()
+                    # The worker reports the outcome in the main window's status bar
+                    save_note = "Your progress is being saved in the background."
+                    logger.info("Practice session data queued for saving")
+                else:
+                    self.app.save_user()
+                    save_note = "Your progress has been saved."
+                    logger.info("Practice session data saved")
                 
                 # Play success sound for completing practice
                 if self.sound_manager:
@@ -410,9 +427,9 @@ class PracticeDialog(QDialog):
                 
                 QMessageBox.information(self, "Practice Complete", 
                     f"Excellent work! 🎉\n\nYou reviewed {self.cards_reviewed} cards.\n"
-                    f"Your progress has been saved.\n\nKeep up the great studying!")
+                    f"{save_note}\n\nKeep up the great studying!")
             except Exception as e:
-                logger.error(f"Failed to save progress after practice: {str(e)}", exc_info=True)
+                logger.error("Failed to save progress after practice: %s", e, exc_info=True)
                 QMessageBox.warning(self, "Save Error", f"Failed to save progress: {str(e)}")
         else:
             logger.info("Practice session completed with no cards reviewed")
@@ -0,0 +1,109 @@
+from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QSpinBox,
+                              QTableWidget, QTableWidgetItem, QHeaderView)
+from PySide6.QtCore import Qt
+from datetime import datetime, timedelta, timezone
+from ColorProfile import ColorProfile
+import fsrs_stats
+from logger_config import get_logger
+
+# Set up logger for this module
+logger = get_logger(__name__)
+
+
+class StatsDialog(QDialog):
+    """Retention of the deck and the reviews expected over the coming days"""
+    DEFAULT_DAYS = 30
+
+    def __init__(self, user, parent=None):
+        super().__init__(parent)
+        self.user = user
+        self.color_profile = getattr(parent, 'color_profile', ColorProfile())
+        self.setup_ui()
+        self.refresh()
+
+    def setup_ui(self):
+        self.setWindowTitle("Statistics")
+        self.resize(640, 640)
+        self.setMinimumSize(480, 400)
+        self.setStyleSheet(f"""
+            QDialog {{
+                background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
+                    stop: 0 {self.color_profile.main_color.name()}, stop: 1 {self.color_profile.gradient_end_color.name()});
+            }}
+            QLabel {{
+                color: white;
+                font-size: 14px;
+            }}
+            QTableWidget, QSpinBox {{
+                background: rgba(255, 255, 255, 0.95);
+                border: none;
+                border-radius: 10px;
+                color: #333;
+                font-size: 13px;
+            }}
+            QPushButton {{
+                background: {self.color_profile.gradient_end_color.darker(130).name()};
+                border: none;
+                border-radius: 12px;
+                color: white;
+                font-weight: bold;
+                font-size: 14px;
+                padding: 10px 20px;
+            }}
+        """)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(12)
+
+        self.summary_label = QLabel()
+        self.summary_label.setWordWrap(True)
+        layout.addWidget(self.summary_label)
+
+        days_layout = QHBoxLayout()
+        days_layout.addWidget(QLabel("Forecast days:"))
+        self.days_spin = QSpinBox()
+        self.days_spin.setRange(7, 365)
+        self.days_spin.setValue(self.DEFAULT_DAYS)
+        self.days_spin.valueChanged.connect(self.refresh)
+        days_layout.addWidget(self.days_spin)
+        days_layout.addStretch()
+        layout.addLayout(days_layout)
+
+        self.forecast_table = QTableWidget(0, 4)
+        self.forecast_table.setHorizontalHeaderLabels(["Day", "Due", "Expected lapses", "Expected reviews"])
+        self.forecast_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.forecast_table.verticalHeader().setVisible(False)
+        self.forecast_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.forecast_table, 1)
+
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.accept)
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addStretch()
+        buttons_layout.addWidget(close_btn)
+        layout.addLayout(buttons_layout)
+
+    def refresh(self):
+        now = datetime.now(timezone.utc)
+        days = self.days_spin.value()
+        stats = fsrs_stats.deck_forecast(self.user.full_cards, now, days, self.user.scheduler)
+
+        retention = "–" if stats.mean_retrievability is None else f"{stats.mean_retrievability:.1%}"
+        self.summary_label.setText(
+            f"{len(self.user.full_cards)} cards, {stats.reviewed} reviewed at least once\n"
+            f"Average retention now: {retention}\n"
+            f"Overdue: {stats.overdue} | Expected reviews in the next {days} days: "
+            f"{stats.workload_per_day.sum():.0f}")
+
+        self.forecast_table.setRowCount(days)
+        today = now.astimezone().date()
+        for day in range(days):
+            label = "Today" if day == 0 else (today + timedelta(days=day)).strftime("%a %d %b")
+            values = [label, str(int(stats.due_per_day[day])), f"{stats.expected_lapses_per_day[day]:.1f}",
+                      f"{stats.workload_per_day[day]:.1f}"]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.forecast_table.setItem(day, column, item)
@@ -1,6 +1,7 @@
-from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
-                              QPushButton, QScrollArea, QWidget, QFrame, QTextEdit)
-from PySide6.QtCore import Qt
+from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QFrame, QLineEdit,
+                              QListView, QStyledItemDelegate, QStyle, QAbstractItemView, QMessageBox)
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize, QEvent, QTimer, Signal
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QLinearGradient, QPainter, QPen, QKeySequence, QShortcut
 from base_classes import FullCard
 from ColorProfile import ColorProfile
 from logger_config import get_logger
@@ -8,29 +9,243 @@ from logger_config import get_logger
 # Set up logger for this module
 logger = get_logger(__name__)
 
+
+def contiguous_ranges(rows):
+    """Group row numbers into (first, last) blocks, last block first so removals keep earlier rows valid"""
+    ranges = []
+    for row in sorted(set(rows)):
+        if ranges and row == ranges[-1][1] + 1:
+            ranges[-1][1] = row
+        else:
+            ranges.append([row, row])
+    return [tuple(block) for block in reversed(ranges)]
+
+
+class CardListModel(QAbstractListModel):
+    """List model exposing the user's cards to a QListView without per-card widgets"""
+    CardRole = Qt.ItemDataRole.UserRole + 1
+
+    def __init__(self, user, parent=None):
+        super().__init__(parent)
+        self.user = user
+        # Cards matching the current search, None while the whole deck is shown
+        self.filtered_cards = None
+        user.deck_listeners.append(self.deck_replaced)
+
+    def detach(self):
+        """Stop following the deck, called when the view is closed"""
+        if self.deck_replaced in self.user.deck_listeners:
+            self.user.deck_listeners.remove(self.deck_replaced)
+
+    def deck_replaced(self):
+        """Reset after a server sync changed the deck, a search keeps the matches that still exist"""
+        self.beginResetModel()
+        if self.filtered_cards is not None:
+            cards_by_id = self.user.cards_by_id
+            self.filtered_cards = [full_card for full_card in self.filtered_cards
+                                   if cards_by_id.get(full_card.card_id) is full_card]
+        self.endResetModel()
+
+    def cards(self):
+        return self.user.full_cards if self.filtered_cards is None else self.filtered_cards
+
+    def set_filter(self, full_cards):
+        """Show only the given cards, or the whole deck for None"""
+        self.beginResetModel()
+        self.filtered_cards = full_cards
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.cards())
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        cards = self.cards()
+        if not index.isValid() or index.row() >= len(cards):
+            return None
+        full_card = cards[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return full_card.question
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return f"Question: {full_card.question}\n\nAnswer: {full_card.answer}"
+        if role == self.CardRole:
+            return full_card
+        return None
+
+    def remove_card(self, row):
+        """Delete the card shown in a row from the user's deck"""
+        self.remove_rows([row])
+
+    def remove_rows(self, rows):
+        """Delete the cards in the given rows, with one model update per contiguous block"""
+        ranges = contiguous_ranges(rows)
+        if self.filtered_cards is not None and ranges:
+            # One pass over the deck for the whole selection, the blocks only update the view
+            self.user.delete_cards(full_card.card_id for first, last in ranges
+                                   for full_card in self.filtered_cards[first:last + 1])
+        for first, last in ranges:
+            self.beginRemoveRows(QModelIndex(), first, last)
+            if self.filtered_cards is None:
+                self.user.delete_card_range(first, last)
+            else:
+                del self.filtered_cards[first:last + 1]
+            self.endRemoveRows()
+
+
+class CardDelegate(QStyledItemDelegate):
+    """Paints a card row directly, only rows in the viewport are ever drawn"""
+    delete_requested = Signal(int)
+
+    ROW_HEIGHT = 240
+    MARGIN = 6
+    PADDING = 20
+    TEXT_LINES = 2
+
+    def __init__(self, color_profile: ColorProfile, parent=None):
+        super().__init__(parent)
+        accent = color_profile.gradient_end_color
+        # Colors are resolved once instead of on every paint
+        self.badge_start = accent.darker(130)
+        self.badge_end = accent.lighter(110)
+        self.question_color = accent.darker(130)
+        self.answer_color = accent.darker(105)
+        self.box_border = accent.darker(115)
+        self.box_text = accent.darker(120)
+        self.tag_start = accent.darker(120)
+        self.tag_end = accent.lighter(130)
+        self.card_background = QColor(255, 255, 255, 242)
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def _card_rect(self, rect):
+        return rect.adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN)
+
+    def _delete_rect(self, rect):
+        card = self._card_rect(rect)
+        return QRect(card.right() - self.PADDING - 110, card.top() + self.PADDING - 4, 110, 32)
+
+    def _font(self, base, pixel_size, bold=False):
+        font = QFont(base)
+        font.setPixelSize(pixel_size)
+        font.setBold(bold)
+        return font
+
+    def _gradient(self, rect, start, end):
+        gradient = QLinearGradient(rect.topLeft(), rect.bottomRight())
+        gradient.setColorAt(0, start)
+        gradient.setColorAt(1, end)
+        return gradient
+
+    def _draw_pill(self, painter, rect, text, font, start, end):
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(self._gradient(rect, start, end))
+        painter.drawRoundedRect(rect, 12, 12)
+        painter.setPen(QColor("white"))
+        painter.setFont(font)
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, text)
+
+    def _draw_text_box(self, painter, rect, text, font):
+        painter.setPen(QPen(self.box_border, 2))
+        painter.setBrush(QColor("white"))
+        painter.drawRoundedRect(rect, 12, 12)
+        painter.setPen(self.box_text)
+        painter.setFont(font)
+        text_rect = rect.adjusted(12, 6, -12, -6)
+        # Elide to the visible lines, the full text is in the tooltip
+        metrics = QFontMetrics(font)
+        elided = metrics.elidedText(" ".join(text.split()), Qt.TextElideMode.ElideRight,
+                                    text_rect.width() * self.TEXT_LINES - metrics.averageCharWidth() * 4)
+        painter.drawText(text_rect, Qt.AlignmentFlag.AlignTop | Qt.TextFlag.TextWordWrap, elided)
+
+    def paint(self, painter, option, index):
+        full_card = index.data(CardListModel.CardRole)
+        if full_card is None:
+            return
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        card = self._card_rect(option.rect)
+        if option.state & QStyle.StateFlag.State_Selected:
+            painter.setPen(QPen(self.badge_start, 3))
+        else:
+            painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(self.card_background)
+        painter.drawRoundedRect(card, 20, 20)
+
+        left = card.left() + self.PADDING
+        width = card.width() - 2 * self.PADDING
+        top = card.top() + self.PADDING
+
+        # Header with the card number (taken from the row, so it never goes stale) and delete button
+        badge_font = self._font(option.font, 12, bold=True)
+        badge_text = f"Card #{index.row() + 1}"
+        badge_rect = QRect(left, top, QFontMetrics(badge_font).horizontalAdvance(badge_text) + 24, 24)
+        self._draw_pill(painter, badge_rect, badge_text, badge_font, self.badge_start, self.badge_end)
+        self._draw_pill(painter, self._delete_rect(option.rect), "Delete card",
+                        self._font(option.font, 14, bold=True), self.badge_start, self.badge_end)
+        top += 38
+
+        label_font = self._font(option.font, 14, bold=True)
+        text_font = self._font(option.font, 14)
+        box_height = 48
+        for title, text, color in (("Question", full_card.question, self.question_color),
+                                   ("Answer", full_card.answer, self.answer_color)):
+            painter.setPen(color)
+            painter.setFont(label_font)
+            painter.drawText(QRect(left, top, width, 18), Qt.AlignmentFlag.AlignLeft, title)
+            top += 20
+            self._draw_text_box(painter, QRect(left, top, width, box_height), text, text_font)
+            top += box_height + 8
+
+        # Tags as pills on one line, the ones that do not fit are left out
+        tag_font = self._font(option.font, 11, bold=True)
+        tag_metrics = QFontMetrics(tag_font)
+        x = left
+        for tag in sorted(full_card.tags):
+            pill_width = tag_metrics.horizontalAdvance(tag) + 20
+            if x + pill_width > left + width:
+                break
+            self._draw_pill(painter, QRect(x, top, pill_width, 22), tag, tag_font, self.tag_start, self.tag_end)
+            x += pill_width + 6
+
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QEvent.Type.MouseButtonRelease
+                and self._delete_rect(option.rect).contains(event.position().toPoint())):
+            self.delete_requested.emit(index.row())
+            return True
+        return super().editorEvent(event, model, option, index)
+
+
 class ViewCardsDialog(QDialog):
     main_layout : QVBoxLayout
     header_layout : QVBoxLayout
-    cards_container : QWidget
-    cards_layout : QVBoxLayout
-    scroll_area : QScrollArea
+    subtitle_label : QLabel
+    list_view : QListView
+    card_model : CardListModel
+    no_cards_widget : QFrame
+
 
-    
     def __init__(self, user, parent=None):
         super().__init__(parent)
-        logger.info(f"Initializing ViewCardsDialog for user: {user.email}")
+        logger.info("Initializing ViewCardsDialog for user: %s", user.email)
         self.user = user
         # Get color profile from parent if available, otherwise create default
         self.color_profile = getattr(parent, 'color_profile', ColorProfile())
         self.setup_ui()
-        logger.info(f"ViewCardsDialog initialized with {len(user.full_cards)} cards")
-        
+        self.card_model.modelReset.connect(self.on_model_reset)
+        self.finished.connect(self.card_model.detach)
+        logger.info("ViewCardsDialog initialized with %s cards", len(user.full_cards))
+
     def setup_ui(self):
         self.setWindowTitle("Your Flashcard Collection")
         self.resize(900, 700)
         self.setMinimumSize(500, 350)  # Better minimum for small screens
         self.setWindowModality(Qt.WindowModality.ApplicationModal)
-        
+
         # Apply modern styling with purple theme like practice UI
         self.setStyleSheet(f"""
             QDialog {{
@@ -38,11 +253,15 @@ class ViewCardsDialog(QDialog):
                     stop: 0 {self.color_profile.main_color.name()}, stop: 1 {self.color_profile.gradient_end_color.name()});
                 color: white;
             }}
-            QScrollArea {{
+            QListView {{
+                background: transparent;
                 border: none;
                 border-radius: 15px;
+                outline: none;
             }}
-            QScrollArea QWidget {{
+            QListView::item,
+            QListView::item:selected,
+            QListView::item:hover {{
                 background: transparent;
             }}
             QScrollBar:vertical {{
@@ -52,12 +271,12 @@ class ViewCardsDialog(QDialog):
                 margin: 0px;
             }}
             QScrollBar::handle:vertical {{
-                background: {self.parent().color_profile.gradient_end_color.darker(105)};
+                background: {self.color_profile.gradient_end_color.darker(105).name()};
                 border-radius: 6px;
                 min-height: 20px;
             }}
             QScrollBar::handle:vertical:hover {{
-                background: {self.parent().color_profile.gradient_end_color.lighter(105)};
+                background: {self.color_profile.gradient_end_color.lighter(105).name()};
             }}
             QScrollBar::add-line:vertical,
             QScrollBar::sub-line:vertical {{
@@ -66,7 +285,7 @@ class ViewCardsDialog(QDialog):
             }}
             QPushButton {{
                 background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
-                    stop: 0 {self.parent().color_profile.gradient_end_color.darker(130).name()}, stop: 1 {self.parent().color_profile.gradient_end_color.lighter(110).name()});
+                    stop: 0 {self.color_profile.gradient_end_color.darker(130).name()}, stop: 1 {self.color_profile.gradient_end_color.lighter(110).name()});
                 border: none;
                 border-radius: 15px;
                 color: white;
@@ -77,26 +296,26 @@ class ViewCardsDialog(QDialog):
             }}
             QPushButton:hover {{
                 background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
-                    stop: 0 {self.parent().color_profile.gradient_end_color.darker(110).name()}, stop: 1 {self.parent().color_profile.gradient_end_color.lighter(120).name()});
+                    stop: 0 {self.color_profile.gradient_end_color.darker(110).name()}, stop: 1 {self.color_profile.gradient_end_color.lighter(120).name()});
                 transform: translateY(-2px);
                 color: white;
             }}
             QPushButton:pressed {{
                 background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
-                    stop: 0 {self.parent().color_profile.gradient_end_color.lighter(110).name()}, stop: 1 {self.parent().color_profile.gradient_end_color.darker(110).name()});
+                    stop: 0 {self.color_profile.gradient_end_color.lighter(110).name()}, stop: 1 {self.color_profile.gradient_end_color.darker(110).name()});
                 transform: translateY(0px);
                 color: white;
             }}
         """)
-        
+
         # Main layout with responsive spacing
         self.main_layout = QVBoxLayout(self)
         self.main_layout.setContentsMargins(20, 20, 20, 20)  # Smaller margins for small screens
         self.main_layout.setSpacing(15)
-        
+
         # Header section
         self.header_layout = QVBoxLayout()
-        
+
         # Title
         title_label = QLabel("Your Flashcard Collection")
         title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -109,11 +328,11 @@ class ViewCardsDialog(QDialog):
             }
         """)
         self.header_layout.addWidget(title_label)
-        
+
         # Subtitle with count
-        subtitle_label = QLabel(f"{self.user.name}'s Library • {len(self.user.full_cards)} cards")
-        subtitle_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        subtitle_label.setStyleSheet("""
+        self.subtitle_label = QLabel()
+        self.subtitle_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.subtitle_label.setStyleSheet("""
             QLabel {
                 color: rgba(255, 255, 255, 0.8);
                 font-size: 14px;
@@ -121,72 +340,50 @@ class ViewCardsDialog(QDialog):
                 margin-bottom: 15px;
             }
         """)
-        self.header_layout.addWidget(subtitle_label)
-        
+        self.header_layout.addWidget(self.subtitle_label)
+
         self.main_layout.addLayout(self.header_layout)
-        
-        # Scroll area for cards
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        
-        # Container widget for cards
-        self.cards_container = QWidget()
-        self.cards_layout = QVBoxLayout(self.cards_container)
-        self.cards_layout.setSpacing(10)  # Smaller spacing for mobile
-        self.cards_layout.setContentsMargins(5, 5, 5, 5)
-        
-        # Add each card as a widget
-        if self.user.full_cards:
-            for i, full_card in enumerate(self.user.full_cards):
-                card_widget = self.create_card_widget(full_card, i + 1)
-                self.cards_layout.addWidget(card_widget)
-        else:
-            # No cards message
-            no_cards_widget = QFrame()
-            no_cards_widget.setStyleSheet("""
-                QFrame {
-                    background: rgba(255, 255, 255, 0.1);
-                    border: 2px dashed rgba(255, 255, 255, 0.3);
-                    border-radius: 20px;
-                    padding: 30px;
-                    margin: 15px;
-                }
-            """)
-            no_cards_layout = QVBoxLayout(no_cards_widget)
-            
-            no_cards_icon = QLabel("📚")
-            no_cards_icon.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            no_cards_icon.setStyleSheet("font-size: 48px; margin-bottom: 10px;")
-            no_cards_layout.addWidget(no_cards_icon)
-            
-            no_cards_label = QLabel("No cards found")
-            no_cards_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            no_cards_label.setStyleSheet("""
-                color: white;
-                font-size: 18px;
-                font-weight: 600;
-                margin-bottom: 5px;
-            """)
-            no_cards_layout.addWidget(no_cards_label)
-            
-            no_cards_hint = QLabel("Create some flashcards to get started!")
-            no_cards_hint.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            no_cards_hint.setStyleSheet("""
-                color: rgba(255, 255, 255, 0.7);
+
+        # Search box, filtering waits for a short pause in typing
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Search questions and answers...")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.setStyleSheet("""
+            QLineEdit {
+                background: rgba(255, 255, 255, 0.9);
+                border: none;
+                border-radius: 12px;
+                padding: 8px 12px;
                 font-size: 14px;
-                font-style: italic;
-            """)
-            no_cards_layout.addWidget(no_cards_hint)
-            
-            self.cards_layout.addWidget(no_cards_widget)
-        
-        # Add stretch to push cards to top
-        self.cards_layout.addStretch()
-        
-        self.scroll_area.setWidget(self.cards_container)
-        self.main_layout.addWidget(self.scroll_area)
-        
+                color: #333;
+            }
+        """)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(self.apply_search)
+        self.search_edit.textChanged.connect(self.search_timer.start)
+        self.main_layout.addWidget(self.search_edit)
+
+        # Card list, rows are painted by the delegate so opening cost does not grow with the deck
+        self.card_model = CardListModel(self.user, self)
+        self.card_delegate = CardDelegate(self.color_profile, self)
+        self.card_delegate.delete_requested.connect(self.delete_card_at)
+
+        self.list_view = QListView()
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.list_view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.list_view.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.list_view.setModel(self.card_model)
+        self.list_view.setItemDelegate(self.card_delegate)
+        self.list_view.selectionModel().selectionChanged.connect(self.update_delete_selected_button)
+        self.main_layout.addWidget(self.list_view)
+
+        self.no_cards_widget = self.create_no_cards_widget()
+        self.main_layout.addWidget(self.no_cards_widget)
+        self.update_card_count()
+
         # Close button
         close_btn = QPushButton("Close")
         close_btn.setStyleSheet("""
@@ -204,191 +401,108 @@ class ViewCardsDialog(QDialog):
             }
         """)
         close_btn.clicked.connect(self.accept)
-        self.main_layout.addWidget(close_btn)
-    
-    
-    def delete_card(self, card_to_delete):
-        self.user.full_cards.remove(card_to_delete)
-        while self.cards_layout.count():
-            item = self.cards_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        if self.user.full_cards:
-            for i, full_card in enumerate(self.user.full_cards):
-                card_widget = self.create_card_widget(full_card, i + 1)
-                self.cards_layout.addWidget(card_widget)
-        else:
-            no_cards_widget = QFrame()
-            no_cards_widget.setStyleSheet("""
-                QFrame {
-                    background: rgba(255, 255, 255, 0.1);
-                    border: 2px dashed rgba(255, 255, 255, 0.3);
-                    border-radius: 20px;
-                    padding: 30px;
-                    margin: 15px;
-                }
-            """)
-            no_cards_layout = QVBoxLayout(no_cards_widget)
-            no_cards_icon = QLabel("📚")
-            no_cards_icon.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            no_cards_icon.setStyleSheet("font-size: 48px; margin-bottom: 10px;")
-            no_cards_layout.addWidget(no_cards_icon)
-            no_cards_label = QLabel("No cards found")
-            no_cards_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            no_cards_label.setStyleSheet("""
-                color: white;
-                font-size: 18px;
-                font-weight: 600;
-                margin-bottom: 5px;
-            """)
-            no_cards_layout.addWidget(no_cards_label)
-            no_cards_hint = QLabel("Create some flashcards to get started!")
-            no_cards_hint.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            no_cards_hint.setStyleSheet("""
-                color: rgba(255, 255, 255, 0.7);
-                font-size: 14px;
-                font-style: italic;
-            """)
-            no_cards_layout.addWidget(no_cards_hint)
-            self.cards_layout.addWidget(no_cards_widget)
-        self.cards_layout.addStretch()
-        subtitle_labels = [self.header_layout.itemAt(i).widget() for i in range(self.header_layout.count())]
-        for label in subtitle_labels:
-            if isinstance(label, QLabel) and f"{self.user.name}'s Library" in label.text():
-                label.setText(f"{self.user.name}'s Library • {len(self.user.full_cards)} cards")
-                break
-            
-    def create_card_widget(self, full_card: FullCard, card_number: int):
-        """Create a widget for displaying a single card"""
-        card_frame = QFrame()
-        card_frame.setStyleSheet("""
+
+        # Bulk delete of the selected cards (Ctrl/Shift+click to select several)
+        self.delete_selected_btn = QPushButton("Delete selected")
+        self.delete_selected_btn.setEnabled(False)
+        self.delete_selected_btn.clicked.connect(self.delete_selected_cards)
+        QShortcut(QKeySequence(QKeySequence.StandardKey.Delete), self, self.delete_selected_cards)
+
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addWidget(self.delete_selected_btn)
+        buttons_layout.addStretch()
+        buttons_layout.addWidget(close_btn)
+        self.main_layout.addLayout(buttons_layout)
+
+    def create_no_cards_widget(self):
+        """Create the placeholder shown when the deck is empty"""
+        no_cards_widget = QFrame()
+        no_cards_widget.setStyleSheet("""
             QFrame {
-                background: rgba(255, 255, 255, 0.95);
-                border: none;
+                background: rgba(255, 255, 255, 0.1);
+                border: 2px dashed rgba(255, 255, 255, 0.3);
                 border-radius: 20px;
-                padding: 0px;
-                margin: 3px;
+                padding: 30px;
+                margin: 15px;
             }
         """)
-        
-        card_layout = QVBoxLayout(card_frame)
-        card_layout.setContentsMargins(20, 20, 20, 20)  # Responsive margins
-        card_layout.setSpacing(12)
-        
-        # Card header with number
-        header_layout = QHBoxLayout()
-        
-        number_label = QLabel(f"Card #{card_number}")
-        number_label.setStyleSheet(f"""
-            QLabel {{
-                background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
-                    stop: 0 {self.parent().color_profile.gradient_end_color.darker(130).name()}, stop: 1 {self.parent().color_profile.gradient_end_color.lighter(110).name()});
-                color: white;
-                font-weight: bold;
-                font-size: 12px;
-                padding: 6px 12px;
-                border-radius: 12px;
-            }}
-        """)
-        header_layout.addWidget(number_label)
-        header_layout.addStretch()
-        delete_card_button = QPushButton(self)
-        delete_card_button.setText('Delete card')
-        header_layout.addWidget(delete_card_button)
-        delete_card_button.clicked.connect(lambda: self.delete_card(full_card))
-        
-        card_layout.addLayout(header_layout)
-        
-        # Question section
-        question_label = QLabel("Question")
-        question_label.setStyleSheet(f"""
-            QLabel {{
-                color: {self.parent().color_profile.gradient_end_color.darker(130).name()};
-                font-weight: bold;
-                font-size: 14px;
-                margin-bottom: 3px;
-            }}
-        """)
-        card_layout.addWidget(question_label)
-        
-        question_text = QLabel(full_card.question)
-        question_text.setWordWrap(True)
-        question_text.setStyleSheet(f"""
-            QLabel {{
-                background: #fff;
-                border: 2px solid {self.parent().color_profile.gradient_end_color.darker(115).name()};
-                border-radius: 12px;
-                padding: 12px;
-                font-size: 14px;
-                line-height: 1.4;
-                color: {self.parent().color_profile.gradient_end_color.darker(120).name()};
-                min-height: 30px;
-            }}
-        """)
-        card_layout.addWidget(question_text)
-        
-        # Answer section
-        answer_label = QLabel("Answer")
-        answer_label.setStyleSheet(f"""
-            QLabel {{
-                color: {self.parent().color_profile.gradient_end_color.darker(105).name()};
-                font-weight: bold;
-                font-size: 14px;
-                margin-bottom: 3px;
-            }}
+        no_cards_layout = QVBoxLayout(no_cards_widget)
+
+        no_cards_icon = QLabel("📚")
+        no_cards_icon.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        no_cards_icon.setStyleSheet("font-size: 48px; margin-bottom: 10px;")
+        no_cards_layout.addWidget(no_cards_icon)
+
+        no_cards_label = QLabel("No cards found")
+        no_cards_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        no_cards_label.setStyleSheet("""
+            color: white;
+            font-size: 18px;
+            font-weight: 600;
+            margin-bottom: 5px;
         """)
-        card_layout.addWidget(answer_label)
-        
-        answer_text = QLabel(full_card.answer)
-        answer_text.setWordWrap(True)
-        answer_text.setStyleSheet(f"""
-            QLabel {{
-                background: #fff;
-                border: 2px solid {self.parent().color_profile.gradient_end_color.darker(115).name()};
-                border-radius: 12px;
-                padding: 12px;
-                font-size: 14px;
-                line-height: 1.4;
-                color: {self.parent().color_profile.gradient_end_color.darker(120).name()};
-                min-height: 30px;
-            }}
+        no_cards_layout.addWidget(no_cards_label)
+
+        no_cards_hint = QLabel("Create some flashcards to get started!")
+        no_cards_hint.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        no_cards_hint.setStyleSheet("""
+            color: rgba(255, 255, 255, 0.7);
+            font-size: 14px;
+            font-style: italic;
         """)
-        card_layout.addWidget(answer_text)
-        
-        # Tags section
-        if full_card.tags:
-            tags_label = QLabel("Tags")
-            tags_label.setStyleSheet(f"""
-                QLabel {{
-                    color: {self.parent().color_profile.gradient_end_color.lighter(90).name()};
-                    font-weight: bold;
-                    font-size: 14px;
-                    margin-bottom: 3px;
-                }}
-            """)
-            card_layout.addWidget(tags_label)
-            
-            tags_container = QWidget()
-            tags_layout = QHBoxLayout(tags_container)
-            tags_layout.setContentsMargins(0, 0, 0, 0)
-            tags_layout.setSpacing(6)
-            
-            for tag in full_card.tags:
-                tag_label = QLabel(tag)
-                tag_label.setStyleSheet(f"""
-                    QLabel {{
-                        background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
-                            stop: 0 {self.parent().color_profile.gradient_end_color.darker(120).name()}, stop: 1 {self.parent().color_profile.gradient_end_color.lighter(130).name()});
-                        color: white;
-                        padding: 4px 10px;
-                        border-radius: 12px;
-                        font-size: 11px;
-                        font-weight: 600;
-                    }}
-                """)
-                tags_layout.addWidget(tag_label)
-            
-            tags_layout.addStretch()
-            card_layout.addWidget(tags_container)
-        
-        return card_frame 
\ No newline at end of file
+        no_cards_layout.addWidget(no_cards_hint)
+        return no_cards_widget
+
+    def update_card_count(self):
+        """Refresh the subtitle and show the placeholder when nothing is listed"""
+        shown = self.card_model.rowCount()
+        self.list_view.setVisible(shown > 0)
+        self.no_cards_widget.setVisible(shown == 0)
+        subtitle = f"{self.user.name}'s Library • {len(self.user.full_cards)} cards"
+        if self.card_model.filtered_cards is not None:
+            subtitle += f" • {shown} matching"
+        self.subtitle_label.setText(subtitle)
+
+    def on_model_reset(self):
+        self.update_card_count()
+        self.update_delete_selected_button()
+
+    def apply_search(self):
+        query = self.search_edit.text().strip()
+        if query:
+            matches = self.user.search_cards(query)
+            logger.debug("Search '%s' matched %s cards", query, len(matches))
+            self.card_model.set_filter(matches)
+        else:
+            self.card_model.set_filter(None)
+        self.update_card_count()
+        self.update_delete_selected_button()
+
+    def update_delete_selected_button(self):
+        count = len(self.list_view.selectionModel().selectedRows())
+        self.delete_selected_btn.setEnabled(count > 0)
+        self.delete_selected_btn.setText(f"Delete selected ({count})" if count else "Delete selected")
+
+    def delete_card_at(self, row):
+        logger.info("Deleting card in row %s", row)
+        self.card_model.remove_card(row)
+        self.update_card_count()
+
+    def delete_selected_cards(self):
+        rows = [index.row() for index in self.list_view.selectionModel().selectedRows()]
+        if not rows:
+            return
+        if len(rows) > 1:
+            reply = QMessageBox.question(self, "Delete Cards", f"Delete {len(rows)} selected cards?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+            if reply != QMessageBox.StandardButton.Yes:
+                return
+            # A server sync can reset the rows while the question is open
+            rows = [index.row() for index in self.list_view.selectionModel().selectedRows()]
+        logger.info("Deleting %s selected cards", len(rows))
+        self.card_model.remove_rows(rows)
+        self.update_card_count()
+        self.update_delete_selected_button()
+
+    def delete_card(self, card_to_delete: FullCard):
+        self.delete_card_at(self.card_model.cards().index(card_to_delete))
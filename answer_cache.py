@@ -0,0 +1,105 @@
+"""
+Answer cache for Emphizor
+Keeps generated flashcard answers in an SQLite file under ~/.emphizor, so asking for the
+same question again with the same model and prompt returns instantly without an API call
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from logger_config import get_logger
+
+# Set up logger for this module
+logger = get_logger(__name__)
+
+SCHEMA_SQL = """
+create table if not exists answers (
+    key text primary key,
+    answer text not null,
+    created_at real not null,
+    last_used real not null
+);
+create index if not exists answers_last_used_idx on answers (last_used);
+"""
+
+
+def normalize_question(question: str) -> str:
+    """Ignore case and whitespace differences between otherwise equal questions"""
+    return " ".join(question.split()).casefold()
+
+
+def cache_key(question: str, model: str, prompt_version) -> str:
+    payload = json.dumps([normalize_question(question), model, prompt_version])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AnswerCache:
+    """Least recently used answers, dropped after ttl_seconds or beyond max_entries"""
+
+    def __init__(self, app_data_dir=None, max_entries=5000, ttl_seconds=30 * 24 * 3600):
+        self.app_data_dir = Path(app_data_dir) if app_data_dir else Path.home() / ".emphizor"
+        self.db_file = self.app_data_dir / "answer_cache.sqlite3"
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        # Opened on first use so creating the main window never touches the disk
+        if self._conn is None:
+            self.app_data_dir.mkdir(exist_ok=True)
+            self._conn = sqlite3.connect(self.db_file, check_same_thread=False)
+            self._conn.executescript(SCHEMA_SQL)
+            logger.debug("Answer cache opened: %s", self.db_file)
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get(self, question: str, model: str, prompt_version):
+        """Cached answer for the question, or None if missing or expired"""
+        key = cache_key(question, model, prompt_version)
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute("select answer, created_at from answers where key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            answer, created_at = row
+            with conn:
+                if now - created_at > self.ttl_seconds:
+                    conn.execute("delete from answers where key = ?", (key,))
+                    logger.debug("Cached answer expired")
+                    return None
+                conn.execute("update answers set last_used = ? where key = ?", (now, key))
+        logger.info("Answer served from cache")
+        return answer
+
+    def put(self, question: str, model: str, prompt_version, answer: str):
+        key = cache_key(question, model, prompt_version)
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("insert or replace into answers (key, answer, created_at, last_used) values (?, ?, ?, ?)",
+                             (key, answer, now, now))
+                self._evict(conn, now)
+
+    def _evict(self, conn, now):
+        conn.execute("delete from answers where created_at < ?", (now - self.ttl_seconds,))
+        (count,) = conn.execute("select count(*) from answers").fetchone()
+        if count > self.max_entries:
+            conn.execute("delete from answers where key in "
+                         "(select key from answers order by last_used limit ?)", (count - self.max_entries,))
+            logger.debug("Evicted %s least recently used answers", count - self.max_entries)
+
+    def __len__(self):
+        with self._lock:
+            (count,) = self._connection().execute("select count(*) from answers").fetchone()
+        return count
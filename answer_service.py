@@ -0,0 +1,160 @@
+"""
+Answer generation service for Emphizor
+Builds the OpenRouter request for a flashcard question and returns the generated answer,
+going through the answer cache first
+"""
+
+import json
+import time
+import http_client
+from config import Config
+from logger_config import get_logger
+
+# Set up logger for this module
+logger = get_logger(__name__)
+
+# Changing this prompt needs a bump of Config.ANSWER_PROMPT_VERSION so old cached answers are not reused
+SYSTEM_PROMPT = ("You are an expert tutor helping create flashcards. Given a question, provide a clear, concise, "
+                 "and accurate answer that would be perfect for a flashcard. Keep it focused and educational. "
+                 "Answer in the language of the question. Include only the answer, no other text or symbols. "
+                 "Use plain text without markdown formatting.")
+
+
+class AnswerGenerationError(Exception):
+    """Raised when the API did not return an answer"""
+
+
+def build_request(question: str, stream=False) -> dict:
+    return {
+        "model": Config.OPENROUTER_MODEL,
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": f"Create a flashcard answer for this question: {question}"},
+        ],
+        "max_tokens": 777,
+        "temperature": 0.7,
+        "stream": stream,
+    }
+
+
+def cached_answer(question: str, answer_cache):
+    if answer_cache is None:
+        return None
+    try:
+        return answer_cache.get(question, Config.OPENROUTER_MODEL, Config.ANSWER_PROMPT_VERSION)
+    except Exception as e:
+        logger.warning("Could not read answer cache: %s", e)
+        return None
+
+
+def cache_answer(question: str, answer: str, answer_cache):
+    if answer_cache is None:
+        return
+    try:
+        answer_cache.put(question, Config.OPENROUTER_MODEL, Config.ANSWER_PROMPT_VERSION, answer)
+    except Exception as e:
+        logger.warning("Could not write answer cache: %s", e)
+
+
+def _headers() -> dict:
+    return {
+        "Authorization": f"Bearer {Config.OPENROUTER_API_KEY}",
+        "Content-Type": "application/json",
+    }
+
+
+def generate_answer(question: str, answer_cache=None) -> str:
+    """Answer for a flashcard question, from the cache or from OpenRouter
+
+    Raises AnswerGenerationError for API errors and ValueError for missing configuration.
+    """
+    cached = cached_answer(question, answer_cache)
+    if cached is not None:
+        return cached
+
+    Config.validate_config()
+    logger.info("Sending request to OpenRouter API with model: %s", Config.OPENROUTER_MODEL)
+    response = http_client.get_client().post(
+        Config.OPENROUTER_BASE_URL,
+        headers=_headers(),
+        data=json.dumps(build_request(question)),
+        timeout=30
+    )
+    logger.info("API response received with status code: %s (%s)", response.status_code, response.timing)
+
+    if response.status_code != 200:
+        logger.error("API request failed: %s - %s", response.status_code, response.text)
+        raise AnswerGenerationError(f"API request failed: {response.status_code} - {response.text}")
+
+    result = response.json()
+    if not result.get('choices'):
+        logger.error("API response missing choices or empty response")
+        raise AnswerGenerationError("No answer generated from API")
+
+    answer = result['choices'][0]['message']['content'].strip()
+    logger.info("AI answer generated successfully (length: %s characters)", len(answer))
+    cache_answer(question, answer, answer_cache)
+    return answer
+
+
+def iter_stream_deltas(lines):
+    """Text pieces from the lines of a chat completions server-sent event stream"""
+    for line in lines:
+        # Blank lines separate events, lines starting with ':' are keep-alive comments
+        if not line or line.startswith(":") or not line.startswith("data:"):
+            continue
+        data = line[len("data:"):].strip()
+        if data == "[DONE]":
+            return
+        chunk = json.loads(data)
+        if "error" in chunk:
+            raise AnswerGenerationError(f"API stream error: {chunk['error'].get('message', chunk['error'])}")
+        for choice in chunk.get("choices", []):
+            content = (choice.get("delta") or {}).get("content")
+            if content:
+                yield content
+
+
+def stream_answer(question: str, on_delta, answer_cache=None) -> str:
+    """Like generate_answer, but passes the answer text to on_delta piece by piece as it arrives
+
+    A cached answer is passed to on_delta in one piece.
+    """
+    cached = cached_answer(question, answer_cache)
+    if cached is not None:
+        on_delta(cached)
+        return cached
+
+    Config.validate_config()
+    logger.info("Streaming answer from OpenRouter API with model: %s", Config.OPENROUTER_MODEL)
+    start = time.perf_counter()
+    response = http_client.get_client().post(
+        Config.OPENROUTER_BASE_URL,
+        headers=_headers(),
+        data=json.dumps(build_request(question, stream=True)),
+        timeout=30,
+        stream=True
+    )
+    with response:
+        logger.info("API stream opened with status code: %s (%s)", response.status_code, response.timing)
+        if response.status_code != 200:
+            logger.error("API request failed: %s - %s", response.status_code, response.text)
+            raise AnswerGenerationError(f"API request failed: {response.status_code} - {response.text}")
+
+        # text/event-stream usually comes without a charset, requests would assume latin-1
+        response.encoding = "utf-8"
+        pieces = []
+        for delta in iter_stream_deltas(response.iter_lines(decode_unicode=True)):
+            if not pieces:
+                logger.info("First token after %.0fms", (time.perf_counter() - start) * 1000)
+            pieces.append(delta)
+            on_delta(delta)
+
+    answer = "".join(pieces).strip()
+    if not answer:
+        logger.error("API stream ended without an answer")
+        raise AnswerGenerationError("No answer generated from API")
+    logger.info("AI answer streamed successfully (length: %s characters, %.0fms)",
+                len(answer), (time.perf_counter() - start) * 1000)
+    cache_answer(question, answer, answer_cache)
+    return answer
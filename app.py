@@ -5,9 +5,13 @@ Main application entry point with GUI and authentication
 """
 
 import sys
+import startup_profiler
+# Installed before anything heavy is imported, so the profile covers the whole startup
+startup_profiler.start()
 from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QTimer
 from gui import MainWindow
-from logger_config import get_logger
+from logger_config import get_logger, log_startup_banner
 
 # Set up logger for this module
 logger = get_logger(__name__)
@@ -33,20 +37,25 @@ def main():
         
         # Only show window if authentication was successful
         if window.user:
-            logger.info(f"User authentication successful for: {window.user.email}")
+            logger.info("User authentication successful for: %s", window.user.email)
             window.show()
+            startup_profiler.mark("main window shown")
+            # Reported once the window is painted and the deferred startup work is done
+            QTimer.singleShot(0, startup_profiler.finish)
             logger.info("Main window shown, entering application event loop")
             return app.exec()
         else:
             logger.warning("Authentication failed or cancelled by user")
+            startup_profiler.finish()
             return 0
             
     except Exception as e:
-        logger.error(f"Critical error in main application: {str(e)}", exc_info=True)
+        logger.error("Critical error in main application: %s", e, exc_info=True)
         return 1
 
 if __name__ == "__main__":
+    log_startup_banner()
     logger.info("Emphizor application starting up...")
     exit_code = main()
-    logger.info(f"Emphizor application exiting with code: {exit_code}")
+    logger.info("Emphizor application exiting with code: %s", exit_code)
     sys.exit(exit_code) 
\ No newline at end of file
@@ -0,0 +1,47 @@
+"""
+Qt bridge for the async I/O runner
+Turns the outcome of an AsyncRunner future into signals delivered on the GUI thread
+"""
+
+from PySide6.QtCore import QObject, Signal
+from logger_config import get_logger
+
+# Set up logger for this module
+logger = get_logger(__name__)
+
+
+class AsyncTask(QObject):
+    """Watches one future, emits succeeded or failed when it is done and nothing when it was cancelled
+
+    The future completes on the runner's thread, Qt queues the signals to the
+    thread this object lives in.
+    """
+    succeeded = Signal(object)
+    failed = Signal(str)
+    progress = Signal(object)  # emitted by the running call itself, e.g. streamed text
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.future = None
+
+    def start(self, future):
+        self.future = future
+        future.add_done_callback(self._on_done)
+        return self
+
+    def _on_done(self, future):
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            logger.warning("Async task failed: %s", error, exc_info=error)
+            self.failed.emit(str(error))
+        else:
+            self.succeeded.emit(future.result())
+
+    def is_running(self) -> bool:
+        return self.future is not None and not self.future.done()
+
+    def cancel(self):
+        if self.future is not None:
+            self.future.cancel()
@@ -0,0 +1,109 @@
+"""
+Async I/O runner for Emphizor
+Runs one asyncio event loop in a background thread. Network calls are submitted to it from
+the GUI thread, run concurrently, and can all be cancelled when the window closes
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from logger_config import get_logger
+
+# Set up logger for this module
+logger = get_logger(__name__)
+
+
+class AsyncRunner:
+    """Event loop thread that runs coroutines and blocking calls, returning concurrent futures
+
+    The supabase and requests clients are synchronous, run_blocking awaits them
+    in the loop's executor so any number of calls can be in flight together.
+    """
+
+    def __init__(self, max_workers=8):
+        self.max_workers = max_workers
+        self._loop = None
+        self._thread = None
+        self._executor = None
+        self._futures = set()
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._loop is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="io")
+                self._loop = asyncio.new_event_loop()
+                self._loop.set_default_executor(self._executor)
+                ready = threading.Event()
+                self._thread = threading.Thread(target=self._run_loop, args=(self._loop, ready),
+                                                name="asyncio-loop", daemon=True)
+                self._thread.start()
+                ready.wait()
+                logger.debug("Async runner started with %s I/O workers", self.max_workers)
+            return self._loop
+
+    @staticmethod
+    def _run_loop(loop, ready):
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+        loop.run_forever()
+        loop.close()
+
+    def submit(self, coro):
+        """Schedule a coroutine on the loop, returns a concurrent.futures.Future"""
+        future = asyncio.run_coroutine_threadsafe(coro, self._ensure_started())
+        with self._lock:
+            self._futures.add(future)
+        future.add_done_callback(self._forget)
+        return future
+
+    def _forget(self, future):
+        with self._lock:
+            self._futures.discard(future)
+
+    async def _call_blocking(self, func, args, kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+    def run_blocking(self, func, *args, **kwargs):
+        """Run a blocking function on the I/O executor, returns a concurrent.futures.Future"""
+        return self.submit(self._call_blocking(func, args, kwargs))
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._futures)
+
+    def cancel_all(self):
+        """Cancel everything still pending, blocking calls already running finish but their result is dropped"""
+        with self._lock:
+            futures = list(self._futures)
+        for future in futures:
+            future.cancel()
+        if futures:
+            logger.info("Cancelled %s pending I/O tasks", len(futures))
+
+    def stop(self, timeout=3.0):
+        self.cancel_all()
+        with self._lock:
+            loop, thread, executor = self._loop, self._thread, self._executor
+            self._loop = self._thread = self._executor = None
+        if loop is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        executor.shutdown(wait=False, cancel_futures=True)
+        logger.debug("Async runner stopped")
+
+
+_runner = None
+_runner_lock = threading.Lock()
+
+
+def get_runner() -> AsyncRunner:
+    """The process-wide runner shared by the sign in dialog and the main window"""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = AsyncRunner()
+        return _runner
@@ -0,0 +1,92 @@
+"""
+Benchmarks for Emphizor
+Measures hot paths on synthetic data, run with:
+    python benchmark.py [number of cards]      deck memory
+    python benchmark.py fit [history sizes]    scheduler optimizer fit time
+"""
+
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from fsrs import Card, Rating, Scheduler
+from base_classes import FullCard
+from scheduler_optimizer import fit_parameters
+
+TAGS = ["math", "physics", "chemistry", "biology", "history", "language", "hard", "exam"]
+
+
+def make_deck(count: int, seed=0) -> list[FullCard]:
+    """Cards with short texts and one to three of a handful of tags, as in a typical deck"""
+    rng = random.Random(seed)
+    return [FullCard(Card(), f"Question number {i}?", f"Answer number {i}.",
+                     set(rng.sample(TAGS, rng.randint(1, 3))))
+            for i in range(count)]
+
+
+def measure_deck_memory(count: int) -> dict:
+    """Bytes allocated for a deck of `count` cards and the number of objects the GC has to track"""
+    gc.collect()
+    tracked_before = len(gc.get_objects())
+    tracemalloc.start()
+    start = time.perf_counter()
+    deck = make_deck(count)
+    elapsed = time.perf_counter() - start
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    gc.collect()
+    tracked = len(gc.get_objects()) - tracked_before
+    result = {
+        "cards": count,
+        "bytes": allocated,
+        "bytes_per_card": allocated / count,
+        "gc_objects_per_card": tracked / count,
+        "tag_sets": len({id(full_card.tags) for full_card in deck}),
+        "build_seconds": elapsed,
+    }
+    del deck
+    return result
+
+
+def make_review_log_dicts(count: int, seed=0) -> list[dict]:
+    """A review history of `count` logs over a tenth as many cards, each reviewed when due"""
+    rng = random.Random(seed)
+    scheduler = Scheduler()
+    deck = [Card() for _ in range(max(1, count // 10))]
+    log_dicts = []
+    while len(log_dicts) < count:
+        index = rng.randrange(len(deck))
+        rating = Rating.Again if rng.random() < 0.15 else rng.choice([Rating.Hard, Rating.Good, Rating.Good, Rating.Easy])
+        deck[index], review_log = scheduler.review_card(deck[index], rating, review_datetime=deck[index].due)
+        log_dicts.append(review_log.to_dict())
+    return log_dicts
+
+
+def measure_fit_time(sizes) -> list[tuple[int, float]]:
+    """Seconds the optimizer takes for review histories of the given sizes, run in this process"""
+    log_dicts = make_review_log_dicts(max(sizes))
+    results = []
+    for size in sizes:
+        start = time.perf_counter()
+        fit_parameters(log_dicts[:size])
+        results.append((size, time.perf_counter() - start))
+    return results
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "fit":
+        sizes = [int(size) for size in sys.argv[2:]] or [1_000, 5_000, 20_000, 50_000]
+        for size, seconds in measure_fit_time(sizes):
+            print(f"Optimizer fit on {size} reviews: {seconds:.1f}s ({seconds / size * 1e6:.0f}µs per review)")
+        return
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    memory = measure_deck_memory(count)
+    print(f"Deck of {memory['cards']} cards: {memory['bytes'] / 2 ** 20:.1f} MiB, "
+          f"{memory['bytes_per_card']:.0f} bytes and {memory['gc_objects_per_card']:.1f} "
+          f"GC-tracked objects per card, {memory['tag_sets']} distinct tag sets, "
+          f"built in {memory['build_seconds']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Normalized card storage for Emphizor
+Keeps cards and review logs in their own Supabase tables keyed by user id and card id,
+and migrates users from the old single-row JSON blob layout
+"""
+
+from logger_config import get_logger
+
+# Set up logger for this module
+logger = get_logger(__name__)
+
+# Storage layout versions stored in users.storage_version
+BLOB_STORAGE_VERSION = 1
+NORMALIZED_STORAGE_VERSION = 2
+
+# Supabase returns at most 1000 rows per select, larger writes are split as well
+PAGE_SIZE = 1000
+
+# Tables expected by NormalizedStorage (run once in the Supabase SQL editor)
+SCHEMA_SQL = """
+create table if not exists cards (
+    user_id bigint not null references users(id) on delete cascade,
+    card_id bigint not null,
+    question text not null,
+    answer text not null,
+    tags text[] not null default '{}',
+    card jsonb not null,
+    primary key (user_id, card_id)
+);
+
+create table if not exists review_logs (
+    id bigserial primary key,
+    user_id bigint not null references users(id) on delete cascade,
+    card_id bigint,
+    review_datetime timestamptz,
+    log jsonb not null
+);
+create index if not exists review_logs_user_id_idx on review_logs (user_id, id);
+
+alter table users add column if not exists storage_version int not null default 1;
+"""
+
+
+def card_row(user_id, card_dict: dict) -> dict:
+    """Build a cards table row from a FullCard.to_dict() style dictionary"""
+    return {
+        "user_id": user_id,
+        "card_id": card_dict["card"]["card_id"],
+        "question": card_dict["question"],
+        "answer": card_dict["answer"],
+        "tags": list(card_dict["tags"]),
+        "card": card_dict["card"],
+    }
+
+
+def review_log_row(user_id, log_dict: dict) -> dict:
+    """Build a review_logs table row from a ReviewLog.to_dict() dictionary"""
+    card_id = log_dict.get("card_id")
+    if card_id is None and isinstance(log_dict.get("card"), dict):
+        # Older fsrs versions embed the whole card in the log
+        card_id = log_dict["card"].get("card_id")
+    return {
+        "user_id": user_id,
+        "card_id": card_id,
+        "review_datetime": log_dict.get("review_datetime"),
+        "log": log_dict,
+    }
+
+
+def _chunks(items, size=PAGE_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class NormalizedStorage:
+    """Reads and writes cards and review logs as individual rows"""
+
+    def __init__(self, supabase):
+        self.supabase = supabase
+
+    def _select_all(self, table, columns, user_id, order):
+        rows = []
+        offset = 0
+        while True:
+            response = (self.supabase.table(table).select(columns)
+                        .eq("user_id", user_id)
+                        .order(order)
+                        .range(offset, offset + PAGE_SIZE - 1)
+                        .execute())
+            page = response.data or []
+            rows.extend(page)
+            if len(page) < PAGE_SIZE:
+                return rows
+            offset += PAGE_SIZE
+
+    def load_cards(self, user_id) -> list[dict]:
+        """Load all card rows of a user, each shaped like FullCard.to_dict()"""
+        logger.debug("Loading cards for user id %s", user_id)
+        rows = self._select_all("cards", "card_id, question, answer, tags, card", user_id, "card_id")
+        logger.info("Loaded %s card rows for user id %s", len(rows), user_id)
+        return rows
+
+    def load_review_logs_page(self, user_id, offset, limit) -> list[dict]:
+        """One page of a user's review log dictionaries in review order"""
+        response = (self.supabase.table("review_logs").select("id, log")
+                    .eq("user_id", user_id)
+                    .order("id")
+                    .range(offset, offset + limit - 1)
+                    .execute())
+        rows = response.data or []
+        logger.debug("Loaded %s review logs for user id %s from offset %s", len(rows), user_id, offset)
+        return [row["log"] for row in rows]
+
+    def load_review_logs(self, user_id) -> list[dict]:
+        """Load all review log dictionaries of a user in review order"""
+        logger.debug("Loading review logs for user id %s", user_id)
+        rows = self._select_all("review_logs", "id, log", user_id, "id")
+        logger.info("Loaded %s review logs for user id %s", len(rows), user_id)
+        return [row["log"] for row in rows]
+
+    def upsert_cards(self, user_id, card_dicts: list[dict]):
+        rows = [card_row(user_id, card_dict) for card_dict in card_dicts]
+        for chunk in _chunks(rows):
+            self.supabase.table("cards").upsert(chunk, on_conflict="user_id,card_id").execute()
+
+    def delete_cards(self, user_id, card_ids):
+        card_ids = list(card_ids)
+        for chunk in _chunks(card_ids):
+            self.supabase.table("cards").delete().eq("user_id", user_id).in_("card_id", chunk).execute()
+
+    def insert_review_logs(self, user_id, log_dicts: list[dict]):
+        rows = [review_log_row(user_id, log_dict) for log_dict in log_dicts]
+        for chunk in _chunks(rows):
+            self.supabase.table("review_logs").insert(chunk).execute()
+
+    def save_changes(self, user, changes):
+        """Upload only the cards and review logs recorded in a ChangeSet"""
+        dirty_ids = changes.dirty_card_ids
+        if dirty_ids:
+            dirty_cards = [card.to_dict() for card in list(user.full_cards) if card.card_id in dirty_ids]
+            logger.debug("Upserting %s changed cards", len(dirty_cards))
+            self.upsert_cards(user.id, dirty_cards)
+        if changes.deleted:
+            logger.debug("Deleting %s cards", len(changes.deleted))
+            self.delete_cards(user.id, changes.deleted)
+        if changes.review_logs:
+            logger.debug("Inserting %s review logs", len(changes.review_logs))
+            self.insert_review_logs(user.id, [log.to_dict() for log in changes.review_logs])
+
+    def migrate_user(self, user_id, full_cards: list[dict], review_logs: list[dict]):
+        """One-time copy of a blob layout user into the normalized tables
+
+        Safe to run again if interrupted: cards are upserted, previously copied
+        review logs are replaced, and the blob is only cleared at the very end.
+        """
+        logger.info("Migrating user id %s to normalized storage: %s cards, %s review logs",
+                    user_id, len(full_cards), len(review_logs))
+        self.upsert_cards(user_id, full_cards)
+        self.supabase.table("review_logs").delete().eq("user_id", user_id).execute()
+        self.insert_review_logs(user_id, review_logs)
+        self.supabase.table("users").update({
+            "full_cards": [],
+            "review_logs": [],
+            "storage_version": NORMALIZED_STORAGE_VERSION,
+        }).eq("id", user_id).execute()
+        logger.info("Migration of user id %s complete", user_id)
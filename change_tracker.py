@@ -0,0 +1,172 @@
+"""
+Change tracking module for Emphizor
+Records which cards, review logs and scheduler settings changed since the last successful save
+"""
+
+import threading
+from logger_config import get_logger
+
+# Set up logger for this module
+logger = get_logger(__name__)
+
+
+class ChangeSet:
+    """Snapshot of the changes that a single save has to upload"""
+
+    def __init__(self):
+        self.added = set()
+        self.edited = set()
+        self.reviewed = set()
+        self.deleted = set()
+        self.review_logs = []
+        self.scheduler_changed = False
+
+    @property
+    def dirty_card_ids(self):
+        """Ids of cards that have to be (re)uploaded"""
+        return (self.added | self.edited | self.reviewed) - self.deleted
+
+    @property
+    def cards_changed(self):
+        return bool(self.dirty_card_ids or self.deleted)
+
+    def is_empty(self):
+        return not (self.cards_changed or self.review_logs or self.scheduler_changed)
+
+    def copy(self):
+        changes = ChangeSet()
+        changes.added = set(self.added)
+        changes.edited = set(self.edited)
+        changes.reviewed = set(self.reviewed)
+        changes.deleted = set(self.deleted)
+        changes.review_logs = list(self.review_logs)
+        changes.scheduler_changed = self.scheduler_changed
+        return changes
+
+    def union(self, other):
+        """Changes of both sets, used to see everything not uploaded yet"""
+        changes = self.copy()
+        changes.added |= other.added
+        changes.edited |= other.edited
+        changes.reviewed |= other.reviewed
+        changes.deleted |= other.deleted
+        changes.review_logs = other.review_logs + changes.review_logs
+        changes.scheduler_changed = changes.scheduler_changed or other.scheduler_changed
+        return changes
+
+    def to_dict(self):
+        """Serialize the card ids and scheduler flag (review logs are stored separately)"""
+        return {
+            "added": sorted(self.added),
+            "edited": sorted(self.edited),
+            "reviewed": sorted(self.reviewed),
+            "deleted": sorted(self.deleted),
+            "scheduler_changed": self.scheduler_changed,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict, review_logs=None):
+        changes = cls()
+        changes.added = set(data.get("added", []))
+        changes.edited = set(data.get("edited", []))
+        changes.reviewed = set(data.get("reviewed", []))
+        changes.deleted = set(data.get("deleted", []))
+        changes.scheduler_changed = data.get("scheduler_changed", False)
+        changes.review_logs = list(review_logs or [])
+        return changes
+
+    def __repr__(self):
+        return (f"ChangeSet(added={len(self.added)}, edited={len(self.edited)}, "
+                f"reviewed={len(self.reviewed)}, deleted={len(self.deleted)}, "
+                f"review_logs={len(self.review_logs)}, scheduler_changed={self.scheduler_changed})")
+
+
+class ChangeTracker:
+    """Thread-safe accumulator of unsaved changes for one user
+
+    Changes taken by a save stay in flight until the save calls saved() or restore().
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = ChangeSet()
+        self._in_flight = []
+
+    def card_added(self, card_id):
+        with self._lock:
+            self._pending.deleted.discard(card_id)
+            self._pending.added.add(card_id)
+
+    def card_edited(self, card_id):
+        with self._lock:
+            self._pending.edited.add(card_id)
+
+    def card_reviewed(self, card_id, review_log):
+        with self._lock:
+            self._pending.reviewed.add(card_id)
+            self._pending.review_logs.append(review_log)
+
+    def card_deleted(self, card_id):
+        with self._lock:
+            was_unsaved = card_id in self._pending.added
+            self._pending.added.discard(card_id)
+            self._pending.edited.discard(card_id)
+            self._pending.reviewed.discard(card_id)
+            # A card that never reached the server has nothing to delete there
+            if not was_unsaved:
+                self._pending.deleted.add(card_id)
+
+    def scheduler_changed(self):
+        with self._lock:
+            self._pending.scheduler_changed = True
+
+    def has_changes(self):
+        with self._lock:
+            return not self._pending.is_empty()
+
+    def snapshot(self):
+        """Return a copy of the pending changes without clearing them"""
+        with self._lock:
+            return self._pending.copy()
+
+    def unsaved(self):
+        """The pending changes together with those a running save has taken
+
+        Everything a copy downloaded from the server must not overwrite.
+        """
+        with self._lock:
+            changes = self._pending.copy()
+            for in_flight in self._in_flight:
+                changes = in_flight.union(changes)
+            return changes
+
+    def take(self):
+        """Return all pending changes and start tracking from a clean state"""
+        with self._lock:
+            changes = self._pending
+            self._pending = ChangeSet()
+            self._in_flight.append(changes)
+        logger.debug("Took pending changes: %s", changes)
+        return changes
+
+    def saved(self, changes):
+        """Forget taken changes that reached the server"""
+        with self._lock:
+            self._discard_in_flight(changes)
+
+    def _discard_in_flight(self, changes):
+        self._in_flight = [in_flight for in_flight in self._in_flight if in_flight is not changes]
+
+    def restore(self, changes):
+        """Put back changes from a failed save so the next save retries them"""
+        with self._lock:
+            self._discard_in_flight(changes)
+            pending = self._pending
+            # Deletions made after the failed save win over older edits
+            pending.added |= changes.added - pending.deleted
+            pending.edited |= changes.edited - pending.deleted
+            pending.reviewed |= changes.reviewed - pending.deleted
+            pending.deleted |= changes.deleted - pending.added
+            pending.review_logs = changes.review_logs + pending.review_logs
+            pending.scheduler_changed = pending.scheduler_changed or changes.scheduler_changed
+        logger.debug("Restored changes after failed save: %s", changes)
@@ -21,6 +21,22 @@ class Config:
     OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1/chat/completions"
     OPENROUTER_MODEL = "google/gemini-2.5-flash-lite-preview-06-17"
     
+    # Generated answer cache, bump the prompt version whenever the answer prompt changes
+    ANSWER_PROMPT_VERSION = 1
+    # Show single answers token by token as they are generated
+    ANSWER_STREAMING = os.getenv('EMPHIZOR_ANSWER_STREAMING', '1') != '0'
+    ANSWER_CACHE_TTL_DAYS = int(os.getenv('EMPHIZOR_ANSWER_CACHE_TTL_DAYS', '30'))
+    ANSWER_CACHE_MAX_ENTRIES = int(os.getenv('EMPHIZOR_ANSWER_CACHE_MAX_ENTRIES', '5000'))
+    # Requests in flight at once when generating answers for a batch of questions
+    ANSWER_BATCH_CONCURRENCY = int(os.getenv('EMPHIZOR_ANSWER_BATCH_CONCURRENCY', '4'))
+    
+    # Kept-alive connections per host in the shared HTTP session, at least the batch concurrency
+    HTTP_POOL_SIZE = int(os.getenv('EMPHIZOR_HTTP_POOL_SIZE', '10'))
+    
+    # Where the key encrypting saved credentials is kept: "file" (~/.emphizor/key.key) or
+    # "keyring", the system keyring through the optional keyring package
+    CREDENTIAL_KEY_STORE = os.getenv('EMPHIZOR_KEY_STORE', 'file')
+    
     @classmethod
     def validate_config(cls):
         """Validate that required configuration is present"""
@@ -30,6 +46,6 @@ class Config:
             raise ValueError("OPENROUTER_API_KEY not found in environment variables. Please create a .env file with your OpenRouter API key.")
         
         logger.info("Configuration validation successful")
-        logger.debug(f"OpenRouter model: {cls.OPENROUTER_MODEL}")
-        logger.debug(f"OpenRouter base URL: {cls.OPENROUTER_BASE_URL}")
+        logger.debug("OpenRouter model: %s", cls.OPENROUTER_MODEL)
+        logger.debug("OpenRouter base URL: %s", cls.OPENROUTER_BASE_URL)
         return True 
\ No newline at end of file
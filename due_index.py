@@ -0,0 +1,62 @@
+"""
+Due card index for Emphizor
+Keeps cards ordered by their due time so due queries only touch cards that are actually due
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+
+
+def _due_key(full_card):
+    return (full_card.card.due.timestamp(), full_card.card_id)
+
+
+class DueIndex:
+    """Sorted (due timestamp, card id) keys with a lookup back to the cards
+
+    Counting due cards is a binary search, listing them costs O(log n + k)
+    for k due cards instead of a scan over the whole deck.
+    """
+
+    def __init__(self, full_cards=()):
+        self._cards = {full_card.card_id: full_card for full_card in full_cards}
+        self._key_by_id = {card_id: _due_key(full_card) for card_id, full_card in self._cards.items()}
+        self._keys = sorted(self._key_by_id.values())
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, card_id):
+        return card_id in self._key_by_id
+
+    def add(self, full_card):
+        if full_card.card_id in self._key_by_id:
+            self.update(full_card)
+            return
+        key = _due_key(full_card)
+        self._cards[full_card.card_id] = full_card
+        self._key_by_id[full_card.card_id] = key
+        insort(self._keys, key)
+
+    def remove(self, card_id):
+        key = self._key_by_id.pop(card_id, None)
+        if key is None:
+            return
+        del self._cards[card_id]
+        del self._keys[bisect_left(self._keys, key)]
+
+    def update(self, full_card):
+        """Re-sort a card after its due time changed, e.g. after a review"""
+        self.remove(full_card.card_id)
+        self.add(full_card)
+
+    def count_due(self, now: datetime) -> int:
+        return bisect_right(self._keys, (now.timestamp(), float("inf")))
+
+    def due_card_ids(self, now: datetime) -> list:
+        """Ids of all cards due at `now`, most overdue first"""
+        end = self.count_due(now)
+        return [card_id for _, card_id in self._keys[:end]]
+
+    def due_cards(self, now: datetime) -> list:
+        return [self._cards[card_id] for card_id in self.due_card_ids(now)]
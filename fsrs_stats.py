@@ -0,0 +1,117 @@
+"""
+Deck statistics for Emphizor
+FSRS retrievability, due forecasts and expected workload computed with NumPy over the whole deck
+at once instead of one fsrs.Card at a time
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+import numpy as np
+from logger_config import get_logger
+
+# Set up logger for this module
+logger = get_logger(__name__)
+
+SECONDS_PER_DAY = 86400.0
+# Forgetting curve decay of FSRS-4.5 and FSRS-5, FSRS-6 learns it as its 21st parameter
+DEFAULT_DECAY = 0.5
+
+
+@dataclass
+class DeckArrays:
+    """Scheduling fields of a deck as parallel arrays, times in seconds since the epoch
+
+    Cards that were never reviewed have NaN stability, difficulty and last_review.
+    """
+    card_ids: np.ndarray
+    stability: np.ndarray
+    difficulty: np.ndarray
+    last_review: np.ndarray
+    due: np.ndarray
+
+    def __len__(self):
+        return len(self.card_ids)
+
+
+@dataclass
+class DeckForecast:
+    """Statistics of a deck at one moment, the per-day arrays start with today and hold overdue cards"""
+    retrievability: np.ndarray
+    mean_retrievability: Optional[float]
+    reviewed: int
+    overdue: int
+    due_per_day: np.ndarray
+    expected_lapses_per_day: np.ndarray
+    workload_per_day: np.ndarray
+
+
+def decay_of(scheduler) -> float:
+    parameters = getattr(scheduler, "parameters", None) or ()
+    if len(parameters) >= 21:
+        return float(parameters[20])
+    return DEFAULT_DECAY
+
+
+def retrievability(stability, elapsed_days, decay=DEFAULT_DECAY):
+    """FSRS forgetting curve R = (1 + factor * t / S) ** -decay, which gives R = 0.9 at t = S"""
+    factor = 0.9 ** (-1.0 / decay) - 1.0
+    return (1.0 + factor * np.asarray(elapsed_days) / np.asarray(stability)) ** -decay
+
+
+def _timestamp(moment) -> float:
+    return moment.timestamp() if moment is not None else np.nan
+
+
+def deck_arrays(full_cards) -> DeckArrays:
+    """Copy the scheduling fields of the cards into arrays, the only per-card Python loop"""
+    rows = np.array([(full_card.card_id,
+                      np.nan if full_card.card.stability is None else full_card.card.stability,
+                      np.nan if full_card.card.difficulty is None else full_card.card.difficulty,
+                      _timestamp(full_card.card.last_review),
+                      _timestamp(full_card.card.due)) for full_card in full_cards],
+                    dtype=np.float64).reshape(-1, 5)
+    return DeckArrays(rows[:, 0].astype(np.int64), rows[:, 1], rows[:, 2], rows[:, 3], rows[:, 4])
+
+
+def forecast(arrays: DeckArrays, now: datetime, days=30, decay=DEFAULT_DECAY) -> DeckForecast:
+    """Current retrievability of every card and the reviews expected on each of the next `days` days
+
+    A card due on a day counts as one review and, with the chance it has been
+    forgotten by then, as one more review in relearning the same day.
+    """
+    now_ts = now.timestamp()
+    reviewed = ~np.isnan(arrays.last_review) & (arrays.stability > 0)
+    stability = arrays.stability[reviewed]
+    last_review = arrays.last_review[reviewed]
+
+    current = np.zeros(len(arrays))
+    current[reviewed] = retrievability(stability, np.maximum(now_ts - last_review, 0.0) / SECONDS_PER_DAY, decay)
+    lapse_chance = np.zeros(len(arrays))
+    interval_days = np.maximum(arrays.due[reviewed] - last_review, 0.0) / SECONDS_PER_DAY
+    lapse_chance[reviewed] = 1.0 - retrievability(stability, interval_days, decay)
+
+    day = np.floor((arrays.due - now_ts) / SECONDS_PER_DAY)
+    in_horizon = day < days
+    day_index = np.maximum(day[in_horizon], 0).astype(np.int64)
+    due_per_day = np.bincount(day_index, minlength=days)
+    expected_lapses = np.bincount(day_index, weights=lapse_chance[in_horizon], minlength=days)
+
+    reviewed_count = int(np.count_nonzero(reviewed))
+    return DeckForecast(
+        retrievability=current,
+        mean_retrievability=float(current[reviewed].mean()) if reviewed_count else None,
+        reviewed=reviewed_count,
+        overdue=int(np.count_nonzero(day < 0)),
+        due_per_day=due_per_day,
+        expected_lapses_per_day=expected_lapses,
+        workload_per_day=due_per_day + expected_lapses,
+    )
+
+
+def deck_forecast(full_cards, now: datetime, days=30, scheduler=None) -> DeckForecast:
+    arrays = deck_arrays(full_cards)
+    result = forecast(arrays, now, days, decay_of(scheduler))
+    logger.debug("Forecast for %s cards over %s days: %s reviewed, %s overdue",
+                 len(arrays), days, result.reviewed, result.overdue)
+    return result
@@ -1,96 +1,31 @@
 from PySide6.QtWidgets import QColorDialog, QApplication, QMainWindow, QDialog, QLineEdit, QVBoxLayout, QLabel, QHBoxLayout, QDialogButtonBox, QPushButton, QMessageBox
-from PySide6.QtCore import Qt, QThread, Signal
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtGui import QTextCursor
 from datetime import datetime, timezone
-import requests
-import json
+import sys
 from design import Ui_MainWindow
-from EnterStringDialog import EnterStringDialog
-from AuthDialog import AuthDialog
-from ViewCardsDialog import ViewCardsDialog
-from PracticeDialog import PracticeDialog
-from ConceptConnectDialog import ConceptConnectDialog
-from base_classes import FullCard, App
+from base_classes import FullCard, App, SignInRequiredError
+from local_storage import LocalCredentialStorage
 from fsrs import Card
 from ColorProfile import ColorProfile
 from config import Config
 from logger_config import get_logger
-from sound_manager import SoundManager
+from save_queue import SaveWorker
+from answer_cache import AnswerCache
+from theme import get_theme_engine, ROLE_PROPERTY, TAG_ROLE
+from async_runner import get_runner
+from async_bridge import AsyncTask
+import startup_profiler
+# Dialogs, QtMultimedia, NumPy, requests and the optimizer are imported where they are
+# first used, so the sign in dialog and the main window come up without loading them
 
 # Set up logger for this module
 logger = get_logger(__name__)
 
-class AnswerGenerationWorker(QThread):
-    """Worker thread for generating answers using OpenRouter API"""
-    answer_generated = Signal(str)
-    error_occurred = Signal(str)
-    
-    def __init__(self, question):
-        super().__init__()
-        self.question = question
-        logger.debug(f"AnswerGenerationWorker initialized with question: {question[:50]}...")
-        
-    def run(self):
-        logger.info("Starting AI answer generation process")
-        try:
-            # Validate config
-            logger.debug("Validating OpenRouter configuration")
-            Config.validate_config()
-            logger.debug("OpenRouter configuration validated successfully")
-            
-            # Prepare the API request
-            headers = {
-                "Authorization": f"Bearer {Config.OPENROUTER_API_KEY}",
-                "Content-Type": "application/json",
-            }
-            
-            data = {
-                "model": Config.OPENROUTER_MODEL,
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": "You are an expert tutor helping create flashcards. Given a question, provide a clear, concise, and accurate answer that would be perfect for a flashcard. Keep it focused and educational. Answer in the language of the question. Include only the answer, no other text or symbols. Use plain text without markdown formatting."
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Create a flashcard answer for this question: {self.question}"
-                    }
-                ],
-                "max_tokens": 777,
-                "temperature": 0.7
-            }
-            
-            logger.info(f"Sending request to OpenRouter API with model: {Config.OPENROUTER_MODEL}")
-            response = requests.post(
-                Config.OPENROUTER_BASE_URL,
-                headers=headers,
-                data=json.dumps(data),
-                timeout=30
-            )
-            
-            logger.info(f"API response received with status code: {response.status_code}")
-            
-            if response.status_code == 200:
-                result = response.json()
-                if 'choices' in result and len(result['choices']) > 0:
-                    answer = result['choices'][0]['message']['content'].strip()
-                    logger.info(f"AI answer generated successfully (length: {len(answer)} characters)")
-                    self.answer_generated.emit(answer)
-                else:
-                    logger.error("API response missing choices or empty response")
-                    self.error_occurred.emit("No answer generated from API")
-            else:
-                logger.error(f"API request failed: {response.status_code} - {response.text}")
-                self.error_occurred.emit(f"API request failed: {response.status_code} - {response.text}")
-                
-        except Exception as e:
-            logger.error(f"Error in AI answer generation: {str(e)}", exc_info=True)
-            self.error_occurred.emit(f"Error generating answer: {str(e)}")
-
 class MainWindow(QMainWindow):
     tags: set
     tag_buttons: list[QPushButton]
     tag_len_limit = 50
-    enter_string_dialog: EnterStringDialog
     color_profile: ColorProfile
     first_color_dialog: QColorDialog
     second_color_dialog: QColorDialog
@@ -101,8 +36,13 @@ class MainWindow(QMainWindow):
         self.tag_buttons = []  # Initialize empty list of buttons
         self.app = None
         self.user = None
+        self.runner = get_runner()
+        self.sync_task = None
+        self.sync_credentials = None
+        self.save_worker = None
         self.color_profile = ColorProfile()
-        self.sound_manager = SoundManager(self)
+        self._sound_manager = None
+        self.scheduler_optimizer = None
         logger.debug("MainWindow base attributes initialized")
         
         # Show authentication dialog first
@@ -123,90 +63,75 @@ class MainWindow(QMainWindow):
         self.ui.actionfirst_color.triggered.connect(self.first_color_action_clicked)
         self.ui.actionsecond_color.triggered.connect(self.second_color_action_clicked)
         self.ui.delete_tag_button.clicked.connect(self.delete_tag_button_clicked)
+        
+        # Fit the FSRS parameters to the review history
+        self.optimize_action = self.ui.menuFile.addAction("Optimize scheduler")
+        self.optimize_action.triggered.connect(self.optimize_scheduler_clicked)
+        
+        # Way back online when the saved session is no longer accepted
+        self.sign_in_action = self.ui.menuFile.addAction("Sign in again...")
+        self.sign_in_action.triggered.connect(self.sign_in_again)
+        self.optimize_task = None
 
         # Add Concept Connect game button
         self.concept_connect_button = QPushButton("🎯 Concept Connect")
         self.concept_connect_button.clicked.connect(self.concept_connect_clicked)
         self.ui.buttonsLayout.addWidget(self.concept_connect_button)
         
+        # Batch generation of cards from a list of questions
+        self.batch_generate_button = QPushButton("📝 Batch Generate")
+        self.batch_generate_button.clicked.connect(self.batch_generate_clicked)
+        self.ui.buttonsLayout.addWidget(self.batch_generate_button)
+        self.batch_dialog = None
+        
+        # Retention and review forecast of the deck
+        self.stats_button = QPushButton("📊 Statistics")
+        self.stats_button.clicked.connect(self.stats_clicked)
+        self.ui.buttonsLayout.addWidget(self.stats_button)
+        self.deck_retention = None
+        self.stats_task = None
+        
         # Add AI generation functionality
-        self.answer_worker = None
+        self.answer_task = None
         self.setup_ai_generation()
+        self.setup_save_worker()
         # Update window title with user name
         if self.user:
             self.setWindowTitle(f"Emphizor - {self.user.name}")
-            self.update_status_bar()
             # Load existing tags from user's cards
             self.load_existing_tags()
         
         self.connect_buttons_to_update_status_bar()
-    def set_generate_button_styling(self):
-        self.generate_btn.setStyleSheet(f"""
-            QPushButton {{
-                background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
-                    stop: 0 {self.color_profile.main_color.name()}, stop: 1 {self.color_profile.gradient_end_color.name()});
-               
-                border-radius: 0px;
-                color: white;
-                font-weight: bold;
-                font-size: 16px;
-                padding: 15px 25px;
-                min-height: 25px;
-            }}
-            QPushButton:hover {{
-                background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
-                    stop: 0 {self.color_profile.gradient_end_color.name()}, stop: 1 {self.color_profile.main_color.name()});
-                border-color: {self.color_profile.main_color.name()};
-                color: white;
-                transform: translateY(-3px);
-            }}
-            QPushButton:pressed {{
-                background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
-                    stop: 0 {self.color_profile.main_color.darker(105).name()}, stop: 1 {self.color_profile.gradient_end_color.lighter(110).name()});
-                color: white;
-                transform: translateY(0px);
-            }}
-            QPushButton:disabled {{
-                background: rgba(255, 255, 255, 0.1);
-                border: 2px solid rgba(255, 255, 255, 0.3);
-                color: rgba(255, 255, 255, 0.5);
-            }}
-        """)
+        self.update_status_bar()
+        
+        # Opened from the local cache, bring it up to date with the server
+        if self.sync_credentials:
+            self.start_server_sync(*self.sync_credentials)
+        
+        # Runs once the event loop has painted the window
+        QTimer.singleShot(0, self.finish_startup)
+        
+    def finish_startup(self):
+        """Work that is not needed to show the main window, done right after it is shown"""
+        self.refresh_deck_stats()
+        self.sound_manager  # load the sounds now rather than on the first click
+        startup_profiler.mark("deferred startup work done")
+        
+    @property
+    def sound_manager(self):
+        """The sound manager, QtMultimedia is imported and the sounds are loaded on first use"""
+        if self._sound_manager is None:
+            from sound_manager import SoundManager
+            self._sound_manager = SoundManager(self)
+        return self._sound_manager
+        
     def setup_ai_generation(self):
         """Setup AI generation functionality for the answer field"""
+        self.answer_cache = AnswerCache(max_entries=Config.ANSWER_CACHE_MAX_ENTRIES,
+                                        ttl_seconds=Config.ANSWER_CACHE_TTL_DAYS * 24 * 3600)
         # Add Generate Answer button
         self.generate_btn = QPushButton("Generate Answer")
-        self.generate_btn.setStyleSheet(f"""
-            QPushButton {{
-                background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
-                    stop: 0 {self.color_profile.main_color.name()}, stop: 1 {self.color_profile.gradient_end_color.name()});
-                border: 2px solid {self.color_profile.gradient_end_color.darker(105).name()};
-                border-radius: 15px;
-                color: white;
-                font-weight: bold;
-                font-size: 16px;
-                padding: 15px 25px;
-                min-height: 25px;
-            }}
-            QPushButton:hover {{
-                background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
-                    stop: 0 {self.color_profile.gradient_end_color.name()}, stop: 1 {self.color_profile.main_color.name()});
-                border-color: {self.color_profile.main_color.name()};
-                color: white;
-                transform: translateY(-3px);
-            }}
-            QPushButton:pressed {{
-                background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
-                    stop: 0 {self.color_profile.main_color.darker(105).name()}, stop: 1 {self.color_profile.gradient_end_color.lighter(110).name()});
-                color: white;
-                transform: translateY(0px);
-            }}
-            QPushButton:disabled {{
-                background: rgba(255, 255, 255, 0.1);
-                border: 2px solid rgba(255, 255, 255, 0.3);
-                color: rgba(255, 255, 255, 0.5);
-            }}
-        """)
+        self.generate_btn.setObjectName("generateAnswerButton")
         self.generate_btn.clicked.connect(self.generate_answer)
         
         # Add the button to the layout after the question field
@@ -219,25 +144,43 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "No Question", "Please enter a question first.")
             return
         
-        # If a worker is already running, don't start another one
-        if self.answer_worker and self.answer_worker.isRunning():
+        # If a generation is already running, don't start another one
+        if self.answer_task and self.answer_task.is_running():
             return
         
-        # Clean up any previous worker
-        if self.answer_worker:
-            self.answer_worker.deleteLater()
-            self.answer_worker = None
+        # Clean up any previous task
+        if self.answer_task:
+            self.answer_task.deleteLater()
+            self.answer_task = None
         
         # Disable generate button during generation
         self.generate_btn.setEnabled(False)
         self.generate_btn.setText("Generating...")
         
-        # Start the worker thread
-        self.answer_worker = AnswerGenerationWorker(question)
-        self.answer_worker.answer_generated.connect(self.on_answer_generated)
-        self.answer_worker.error_occurred.connect(self.on_error_occurred)
-        self.answer_worker.finished.connect(self.on_worker_finished)
-        self.answer_worker.start()
+        # A streamed answer is written into the answer field as it arrives
+        if Config.ANSWER_STREAMING:
+            self.ui.textEdit.clear()
+        
+        # Run the request on the async I/O runner
+        import answer_service
+        logger.info("Starting AI answer generation process")
+        self.answer_task = AsyncTask(self)
+        self.answer_task.succeeded.connect(self.on_answer_generated)
+        self.answer_task.progress.connect(self.on_partial_answer)
+        self.answer_task.failed.connect(self.on_error_occurred)
+        if Config.ANSWER_STREAMING:
+            future = self.runner.run_blocking(answer_service.stream_answer, question,
+                                              self.answer_task.progress.emit, self.answer_cache)
+        else:
+            future = self.runner.run_blocking(answer_service.generate_answer, question, self.answer_cache)
+        self.answer_task.start(future)
+        
+    def on_partial_answer(self, text):
+        """Append the next piece of a streamed answer"""
+        cursor = self.ui.textEdit.textCursor()
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertText(text)
+        self.ui.textEdit.setTextCursor(cursor)
         
     def on_answer_generated(self, answer):
         """Handle successful answer generation"""
@@ -251,29 +194,139 @@ class MainWindow(QMainWindow):
         self.generate_btn.setEnabled(True)
         self.generate_btn.setText("Generate Answer")
         
-    def on_worker_finished(self):
-        """Handle worker thread completion"""
-        if self.answer_worker:
-            self.answer_worker.deleteLater()
-            self.answer_worker = None
-            
-        # Make window responsive with better minimum sizes
-        self.resize(1000, 700)
-        self.setMinimumSize(600, 400)  # Smaller minimum for better small screen support
-
-        
     def authenticate_user(self):
-        """Show authentication dialog and return True if successful"""
+        """Open the cached deck or show authentication dialog, return True if successful"""
+        if self.open_from_cache():
+            return True
         logger.info("Showing authentication dialog")
+        from AuthDialog import AuthDialog
         auth_dialog = AuthDialog(self)
+        QTimer.singleShot(0, lambda: startup_profiler.mark("sign in dialog shown"))
         if auth_dialog.exec() == QDialog.DialogCode.Accepted:
             self.app = auth_dialog.get_app()
             self.user = auth_dialog.get_user()
-            logger.info(f"Authentication successful for user: {self.user.email if self.user else 'Unknown'}")
+            logger.info("Authentication successful for user: %s", self.user.email if self.user else 'Unknown')
             return True
         logger.warning("Authentication dialog cancelled or failed")
         return False
     
+    def setup_save_worker(self):
+        """Start the background worker that uploads changes"""
+        self.save_worker = SaveWorker(self.app)
+        self.save_worker.save_started.connect(self.on_save_started)
+        self.save_worker.save_succeeded.connect(self.on_save_succeeded)
+        self.save_worker.save_retry_scheduled.connect(self.on_save_retry_scheduled)
+        self.save_worker.save_failed.connect(self.on_save_failed)
+        self.save_worker.start()
+        
+    def on_save_started(self):
+        self.statusBar().showMessage("Saving... 💾", 2000)
+        
+    def on_save_succeeded(self):
+        self.statusBar().showMessage("Data saved successfully! ✅", 3000)
+        
+    def on_save_retry_scheduled(self, attempt, delay):
+        self.statusBar().showMessage(f"Save failed, retrying in {delay:.0f}s (attempt {attempt})... 🔄", int(delay * 1000))
+        
+    def on_save_failed(self, error_message):
+        logger.error("Background save failed: %s", error_message)
+        self.sound_manager.play_error()
+        self.statusBar().showMessage("Save failed - changes are kept on this computer ❌", 5000)
+        
+    def open_from_cache(self):
+        """Open the locally cached deck of a remembered user without waiting for the server"""
+        credential_storage = LocalCredentialStorage()
+        session_email, access_token, refresh_token = credential_storage.load_session()
+        email, password = credential_storage.load_credentials()
+        session_tokens = None
+        if session_email:
+            # The session is newer than a saved password of another account
+            if email != session_email:
+                password = None
+            email = session_email
+            session_tokens = (access_token, refresh_token)
+        if not email or not (session_tokens or password):
+            return False
+        app = App()
+        user = app.load_cached_user(email)
+        if not user:
+            logger.info("No cached deck for %s, falling back to sign in", email)
+            return False
+        app.session_listener = credential_storage.save_session
+        self.app = app
+        self.user = user
+        self.sync_credentials = (email, password, session_tokens)
+        logger.info("Opened cached deck for %s, server sync deferred", email)
+        return True
+    
+    def start_server_sync(self, email, password, session_tokens=None):
+        """Reconcile the cached deck with the server in the background"""
+        self.statusBar().showMessage("Syncing with server... 🔄", 3000)
+        logger.info("Starting background sync with server for %s", email)
+        self.sync_task = AsyncTask(self)
+        self.sync_task.succeeded.connect(self.on_server_user_loaded)
+        self.sync_task.failed.connect(self.on_sync_failed)
+        self.sync_task.start(self.runner.run_blocking(self.app.fetch_server_user, email, password, session_tokens))
+        
+    def on_server_user_loaded(self, server_user):
+        """Merge the server copy into the open deck and upload offline changes"""
+        self.app.reconcile(server_user)
+        self.on_deck_synced()
+        
+    def on_deck_synced(self):
+        """Show the synced deck and upload offline changes"""
+        known_buttons = len(self.tag_buttons)
+        self.load_existing_tags()
+        for button in self.tag_buttons[known_buttons:]:
+            button.clicked.connect(self.update_status_bar)
+        self.refresh_deck_stats()
+        if self.user.changes.has_changes():
+            self.save_worker.request_save()
+        self.statusBar().showMessage("Synced with server ✅", 3000)
+        
+    def on_sync_failed(self, error_message):
+        """Keep working from the local cache when the server cannot be reached"""
+        error = self.sync_task.future.exception() if self.sync_task else None
+        if isinstance(error, SignInRequiredError):
+            logger.warning("Saved session was rejected: %s", error_message)
+            # Retrying with the same tokens can never succeed
+            LocalCredentialStorage().clear_credentials()
+            reply = QMessageBox.question(self, "Sign In Required",
+                "Your saved sign in has expired. Your changes are kept on this computer.\n\n"
+                "Sign in now to sync them?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+            if reply == QMessageBox.StandardButton.Yes:
+                self.sign_in_again()
+            else:
+                self.statusBar().showMessage("Offline mode - use File > Sign in again to sync 📴", 5000)
+            return
+        logger.warning("Background sync failed, staying offline: %s", error_message)
+        self.statusBar().showMessage("Offline mode - changes are kept locally 📴", 5000)
+        
+    def sign_in_again(self):
+        """Sign in with the dialog and continue with the server copy of the deck
+        
+        Changes not uploaded yet are written to the local cache first, the sign in merges them back.
+        """
+        if self.user:
+            try:
+                self.app.local_cache.store_changes(self.user, self.user.changes.unsaved())
+            except Exception as e:
+                logger.error("Failed to write changes to local cache: %s", e, exc_info=True)
+        from AuthDialog import AuthDialog
+        auth_dialog = AuthDialog(self)
+        if auth_dialog.exec() != QDialog.DialogCode.Accepted:
+            self.statusBar().showMessage("Offline mode - use File > Sign in again to sync 📴", 5000)
+            return
+        self.app = auth_dialog.get_app()
+        self.user = auth_dialog.get_user()
+        self.save_worker.app = self.app
+        if self.batch_dialog:
+            self.batch_dialog.user = self.user
+        logger.info("Signed in again as %s", self.user.email)
+        self.setWindowTitle(f"Emphizor - {self.user.name}")
+        self.on_deck_synced()
+        
     def get_selected_tags(self):
         res = set()
         for button in self.tag_buttons:
@@ -282,247 +335,23 @@ class MainWindow(QMainWindow):
         return res
 
     def setup_modern_styling(self):
-        """Apply modern styling to the application"""
-        # Main window styling with purple theme like practice UI
-        self.setStyleSheet(f"""
-            QMainWindow {{ 
-                background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
-                    stop: 0 {self.color_profile.main_color.name()}, stop: 1 {self.color_profile.gradient_end_color.name()});
-                color: white;
-            }}
-            
-            QLabel {{
-                color: white;
-                font-weight: 600;
-                font-size: 14px;
-            }}
-            
-            QPushButton {{
-                background: rgba(255, 255, 255, 0.95);
-                border: 2px solid rgba(255, 255, 255, 0.3);
-                border-radius: 15px;
-                padding: 12px 20px;
-                font-weight: 700;
-                font-size: 14px;
-                color: {self.color_profile.gradient_end_color.darker(140).name()};
-                min-height: 20px;
-            }}
-            
-            QPushButton:hover {{
-                background: white;
-                border-color: {self.color_profile.gradient_end_color.darker(140).name()};
-                color: ;
-                transform: translateY(-2px);
-            }}
-            
-            QPushButton:pressed {{
-                background: rgba(240, 240, 240, 0.9);
-                border-color: {self.color_profile.main_color.lighter(120).name()};
-                color: {self.color_profile.main_color.darker(140).name()};
-                transform: translateY(0px);
-            }}
-            
-            QPushButton:checked {{
-                background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
-                    stop: 0 {self.color_profile.gradient_end_color.darker(130).name()}, stop: 1 {self.color_profile.gradient_end_color.lighter(110).name()});
-                border-color: {self.color_profile.gradient_end_color.darker(110).name()};
-                color: white;
-            }}
-            
-            QTextEdit {{
-                background: rgba(255, 255, 255, 0.98);
-                border: 2px solid rgba(255, 255, 255, 0.3);
-                border-radius: 15px;
-                padding: 15px;
-                font-size: 16px;
-                color: {self.color_profile.main_color.darker(140).name()};
-                selection-background-color: {self.color_profile.gradient_end_color.darker(130).name()};
-                selection-color: white;
-            }}
-            
-            QTextEdit:focus {{
-                border-color: {self.color_profile.gradient_end_color.darker(105).name()};
-                background: white;
-                color: {self.color_profile.main_color.darker(140).name()};
-            }}
-            
-            QMenuBar {{
-                background: rgba(255, 255, 255, 0.1);
-                border: none;
-                border-radius: 8px;
-                color: white;
-                font-weight: 600;
-                font-size: 14px;
-                padding: 5px;
-            }}
-            
-            QMenuBar::item {{
-                padding: 8px 16px;
-                border-radius: 6px;
-                color: white;
-            }}
-            
-            QMenuBar::item:selected {{
-                background: {self.color_profile.gradient_end_color.darker(130).name()};
-                color: white;
-            }}
-            
-            QMenu {{
-                background: rgba(255, 255, 255, 0.98);
-                border: 2px solid {self.color_profile.gradient_end_color.darker(130).name()};
-                border-radius: 12px;
-                padding: 8px;
-            }}
-            
-            QMenu::item {{
-                padding: 8px 16px;
-                border-radius: 6px;
-                color: {self.color_profile.main_color.darker(140).name()};
-            }}
-            
-            QMenu::item:selected {{
-                background: {self.color_profile.main_color.darker(140).name()}
-                color: {self.color_profile.gradient_end_color.darker(110).name()};
-            }}
-            
-            QStatusBar {{
-                background: rgba(255, 255, 255, 0.1);
-                border: none;
-                border-radius: 8px;
-                color: white;
-                font-weight: 600;
-                font-size: 13px;
-                padding: 5px;
-            }}
-        """)
-        
-        # Style specific buttons with purple theme
-        if hasattr(self.ui, 'addCartButton'):
-            self.ui.addCartButton.setStyleSheet(f"""
-                QPushButton {{
-                    background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
-                        stop: 0 {self.color_profile.gradient_end_color.darker(130).name()}, stop: 1 {self.color_profile.gradient_end_color.lighter(110).name()});
-                    border: 2px solid {self.color_profile.gradient_end_color.darker(110).name()};
-                    border-radius: 15px;
-                    color: white;
-                    font-weight: bold;
-                    font-size: 16px;
-                    padding: 15px 25px;
-                    min-height: 25px;
-                }}
-                QPushButton:hover {{
-                    background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
-                        stop: 0 {self.color_profile.gradient_end_color.darker(110).name()}, stop: 1 {self.color_profile.gradient_end_color.lighter(120).name()});
-                    border-color: {self.color_profile.gradient_end_color.darker(130).name()};
-                    color: white;
-                    transform: translateY(-3px);
-                }}
-                QPushButton:pressed {{
-                    background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
-                        stop: 0 {self.color_profile.gradient_end_color.lighter(110).name()}, stop: 1 {self.color_profile.gradient_end_color.darker(110).name()});
-                    color: white;
-                    transform: translateY(0px);
-                }}
-            """)
-        
-        if hasattr(self.ui, 'viewCardsButton'):
-            self.ui.viewCardsButton.setStyleSheet(f"""
-                QPushButton {{
-                    background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
-                        stop: 0 {self.color_profile.gradient_end_color.lighter(110).name()}, stop: 1 {self.color_profile.gradient_end_color.darker(105).name()});
-                    border: 2px solid {self.color_profile.gradient_end_color.name()};
-                    border-radius: 15px;
-                    color: white;
-                    font-weight: bold;
-                    font-size: 16px;
-                    padding: 15px 25px;
-                    min-height: 25px;
-                }}
-                QPushButton:hover {{
-                    background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
-                        stop: 0 {self.color_profile.gradient_end_color.lighter(120).name()}, stop: 1 {self.color_profile.gradient_end_color.name()});
-                    border-color: {self.color_profile.gradient_end_color.lighter(110).name()};
-                    color: white;
-                    transform: translateY(-3px);
-                }}
-                QPushButton:pressed {{
-                    background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
-                        stop: 0 {self.color_profile.gradient_end_color.darker(105).name()}, stop: 1 {self.color_profile.gradient_end_color.lighter(105).name()});
-                    color: white;
-                    transform: translateY(0px);
-                }}
-            """)
-        
-        if hasattr(self.ui, 'practiceButton'):
-            self.ui.practiceButton.setStyleSheet(f"""
-                QPushButton {{
-                    background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
-                        stop: 0 {self.color_profile.gradient_end_color.darker(130).name()}, stop: 1 {self.color_profile.gradient_end_color.lighter(110).name()});
-                    border: 2px solid {self.color_profile.gradient_end_color.darker(110).name()};
-                    border-radius: 15px;
-                    color: white;
-                    font-weight: bold;
-                    font-size: 16px;
-                    padding: 15px 25px;
-                    min-height: 25px;
-                }}
-                QPushButton:hover {{
-                    background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
-                        stop: 0 {self.color_profile.gradient_end_color.darker(130).name()}, stop: 1 {self.color_profile.gradient_end_color.darker(130).name()});
-                    border-color: {self.color_profile.gradient_end_color.darker(130).name()};
-                    color: white;
-                    transform: translateY(-3px);
-                }}
-                QPushButton:pressed {{
-                    background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
-                        stop: 0 {self.color_profile.gradient_end_color.lighter(110).name()}, stop: 1 {self.color_profile.gradient_end_color.darker(110).name()});
-                    color: white;
-                    transform: translateY(0px);
-                }}
-            """)
-        
+        """Apply the color profile to the whole application, one stylesheet for every widget"""
+        get_theme_engine().apply(self.color_profile)
         
     def load_existing_tags(self):
         """Load and display existing tags from user's cards"""
         if not self.user or not self.user.full_cards:
             return
             
-        # Extract unique tags from all cards
-        all_tags = set()
-        for card in self.user.full_cards:
-            all_tags.update(card.tags)
-        
         # Add tag buttons for each unique tag
-        for tag in sorted(all_tags):
+        for tag in self.user.all_tags():
             if tag not in self.tags:
                 self.tags.add(tag)
                 button = QPushButton(self)
                 button.setText(tag)
+                button.setToolTip(f"{self.user.tag_index.count(tag)} cards")
                 button.setCheckable(True)
-                button.setStyleSheet(f"""
-                    QPushButton {{
-                        background: rgba(255, 255, 255, 0.9);
-                        border: 2px solid rgba(255, 255, 255, 0.3);
-                        border-radius: 12px;
-                        padding: 8px 12px;
-                        margin: 3px;
-                        font-weight: 600;
-                        font-size: 13px;
-                        color: {self.color_profile.main_color.darker(140).name()};
-                        min-width: 60px;
-                    }}
-                    QPushButton:hover {{
-                        background: white;
-                        border-color: {self.color_profile.gradient_end_color.darker(115).name()};
-                        color: {self.color_profile.gradient_end_color.darker(110).name()};
-                    }}
-                    QPushButton:checked {{
-                        background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
-                            stop: 0 {self.color_profile.gradient_end_color.darker(130).name()}, stop: 1 {self.color_profile.gradient_end_color.lighter(110).name()});
-                        border-color: {self.color_profile.gradient_end_color.darker(110).name()};
-                        color: white;
-                    }}
-                """)
+                button.setProperty(ROLE_PROPERTY, TAG_ROLE)
                 self.ui.verticalLayout.addWidget(button)
                 self.tag_buttons.append(button)
                 
@@ -532,16 +361,7 @@ class MainWindow(QMainWindow):
             return 0
             
         now = datetime.now(timezone.utc)
-        due_count = 0
-        selected_tags = set()
-        for btn in self.tag_buttons:
-            if btn.isChecked():
-                selected_tags.add(btn.text())
-        for full_card in self.user.full_cards:
-            if full_card.card.due <= now and full_card.tags <= selected_tags:
-                due_count += 1
-                
-        return due_count
+        return self.user.count_due(now, self.get_selected_tags())
         
     def update_status_bar(self):
         """Update the status bar with current user and card information"""
@@ -552,37 +372,37 @@ class MainWindow(QMainWindow):
         due_cards = self.count_due_cards()
         
         status_text = f"Welcome, {self.user.name} ✨ | {total_cards} cards total | {due_cards} due for review"
+        if self.deck_retention is not None:
+            status_text += f" | {self.deck_retention:.0%} average retention"
         self.statusBar().showMessage(status_text)
         
+    def refresh_deck_stats(self):
+        """Recompute the deck's average retention after reviews or deletions, the status bar shows it when done
+        
+        Kept out of update_status_bar, which runs on every tag click. The stats read every card,
+        so they are computed on the runner's thread from a copy of the card list.
+        """
+        self.update_status_bar()
+        if not self.user:
+            return
+        if self.stats_task:
+            # Only the newest deck counts, an older result is dropped
+            self.stats_task.cancel()
+        import fsrs_stats
+        self.stats_task = AsyncTask(self)
+        self.stats_task.succeeded.connect(self.on_deck_stats_computed)
+        self.stats_task.start(self.runner.run_blocking(fsrs_stats.deck_forecast, list(self.user.full_cards),
+                                                       datetime.now(timezone.utc), 1, self.user.scheduler))
+        
+    def on_deck_stats_computed(self, deck_forecast):
+        self.deck_retention = deck_forecast.mean_retrievability
+        self.update_status_bar()
+        
     def create_enter_string_dialog(self, label_message, title):
+        from EnterStringDialog import EnterStringDialog
         self.enter_string_dialog = EnterStringDialog(label_message, title, self, self.tag_len_limit)
         self.enter_string_dialog.accepted.connect(self.add_tag_button)
         
-    def tag_button_set_styling(self, button):
-        button.setStyleSheet(f"""
-                    QPushButton {{
-                        background: rgba(255, 255, 255, 0.9);
-                        border: 2px solid rgba(255, 255, 255, 0.3);
-                        border-radius: 12px;
-                        padding: 8px 12px;
-                        margin: 3px;
-                        font-weight: 600;
-                        font-size: 13px;
-                        color: {self.color_profile.main_color.darker(140).name()};
-                        min-width: 60px;
-                    }}
-                    QPushButton:hover {{
-                        background: white;
-                        border-color: {self.color_profile.gradient_end_color.darker(115).name()};
-                        color: {self.color_profile.gradient_end_color.darker(110).name()};
-                    }}
-                    QPushButton:checked {{
-                        background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
-                            stop: 0 {self.color_profile.gradient_end_color.darker(130).name()}, stop: 1 {self.color_profile.gradient_end_color.lighter(110).name()});
-                        border-color: {self.color_profile.gradient_end_color.darker(110).name()};
-                        color: white;
-                    }}
-                                 """)
     def add_tag_button(self):
         tag_text = self.enter_string_dialog.line_edit.text()
         if tag_text not in self.tags:
@@ -590,7 +410,7 @@ class MainWindow(QMainWindow):
             button = QPushButton(self)
             button.setText(tag_text)
             button.setCheckable(True)  # Make tags selectable
-            self.tag_button_set_styling(button)
+            button.setProperty(ROLE_PROPERTY, TAG_ROLE)
             self.ui.verticalLayout.addWidget(button)
             self.tag_buttons.append(button)
             self.tag_buttons[-1].clicked.connect(self.update_status_bar)
@@ -608,11 +428,17 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Error", "User not authenticated.")
             return
             
-        logger.info(f"Opening view cards dialog for user: {self.user.email}")
+        logger.info("Opening view cards dialog for user: %s", self.user.email)
+        from ViewCardsDialog import ViewCardsDialog
         view_dialog = ViewCardsDialog(self.user, self)
         view_dialog.exec()
         logger.info("View cards dialog closed")
         
+        # Upload deletions made in the library
+        if self.user.changes.has_changes():
+            self.save_worker.request_save()
+        self.refresh_deck_stats()
+        
     def practice_clicked(self):
         """Start a practice session"""
         logger.info("Practice button clicked")
@@ -622,7 +448,8 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Error", "User not authenticated.")
             return
             
-        logger.info(f"Starting practice session for user: {self.user.email}")
+        logger.info("Starting practice session for user: %s", self.user.email)
+        from PracticeDialog import PracticeDialog
         practice_dialog = PracticeDialog(self.user, self.app, self)
         if practice_dialog.cant_practice is False:
             logger.info("Practice dialog opened successfully")
@@ -632,7 +459,7 @@ class MainWindow(QMainWindow):
         
         # Update status bar after practice session
         logger.debug("Updating status bar after practice session")
-        self.update_status_bar()
+        self.refresh_deck_stats()
     
     def concept_connect_clicked(self):
         """Start a Concept Connect game session"""
@@ -641,9 +468,75 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Error", "User not authenticated.")
             return
             
+        from ConceptConnectDialog import ConceptConnectDialog
         concept_connect_dialog = ConceptConnectDialog(self.user, self)
         concept_connect_dialog.exec()
         
+    def batch_generate_clicked(self):
+        """Generate answers for many questions and add the reviewed drafts as cards"""
+        self.sound_manager.play_click()
+        if not self.user:
+            QMessageBox.warning(self, "Error", "User not authenticated.")
+            return
+        
+        selected_tags = {button.text() for button in self.tag_buttons if button.isChecked()}
+        # Kept between openings so drafts and a running batch are not lost
+        if self.batch_dialog is None:
+            from BatchGenerateDialog import BatchGenerateDialog
+            self.batch_dialog = BatchGenerateDialog(self.user, selected_tags, self.answer_cache, self)
+        else:
+            self.batch_dialog.set_tags(selected_tags)
+        self.batch_dialog.exec()
+        
+        if self.user.changes.has_changes():
+            self.save_worker.request_save()
+        self.update_status_bar()
+        
+    def optimize_scheduler_clicked(self):
+        """Fit the scheduler to the review history in the background"""
+        if not self.user:
+            QMessageBox.warning(self, "Error", "User not authenticated.")
+            return
+        if self.optimize_task and self.optimize_task.is_running():
+            self.statusBar().showMessage("Scheduler optimization is already running ⚙️", 3000)
+            return
+        
+        if self.scheduler_optimizer is None:
+            from scheduler_optimizer import SchedulerOptimizer
+            self.scheduler_optimizer = SchedulerOptimizer()
+        
+        logger.info("Starting scheduler optimization for %s", self.user.email)
+        self.optimize_action.setEnabled(False)
+        self.statusBar().showMessage("Optimizing scheduler from your review history... ⚙️")
+        self.optimize_task = AsyncTask(self)
+        self.optimize_task.succeeded.connect(self.on_scheduler_optimized)
+        self.optimize_task.failed.connect(self.on_optimize_failed)
+        self.optimize_task.start(self.runner.run_blocking(self.scheduler_optimizer.optimize,
+                                                          self.user.review_logs, self.user.scheduler))
+        
+    def on_scheduler_optimized(self, scheduler):
+        self.optimize_action.setEnabled(True)
+        self.user.set_scheduler(scheduler)
+        self.save_worker.request_save()
+        logger.info("Optimized scheduler is in use")
+        self.statusBar().showMessage("Scheduler optimized for your review history ✅", 3000)
+        
+    def on_optimize_failed(self, error_message):
+        self.optimize_action.setEnabled(True)
+        self.update_status_bar()
+        QMessageBox.warning(self, "Optimization Failed", f"Could not optimize the scheduler:\n{error_message}")
+        
+    def stats_clicked(self):
+        """Show retention and the review forecast of the deck"""
+        self.sound_manager.play_click()
+        if not self.user:
+            QMessageBox.warning(self, "Error", "User not authenticated.")
+            return
+        
+        from StatsDialog import StatsDialog
+        stats_dialog = StatsDialog(self.user, self)
+        stats_dialog.exec()
+        
     def save_clicked(self):
         """Manual save/sync functionality"""
         logger.info("Manual save button clicked")
@@ -652,37 +545,38 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Error", "User not authenticated.")
             return
             
-        try:
-            logger.info("Starting manual save operation")
-            self.statusBar().showMessage("Saving... 💾", 2000)
-            self.app.save_user()
-            logger.info("Manual save completed successfully")
-            self.statusBar().showMessage("Data saved successfully! ✅", 3000)
-        except Exception as e:
-            logger.error(f"Manual save failed: {str(e)}", exc_info=True)
-            self.statusBar().showMessage("Save failed! ❌", 3000)
-            QMessageBox.warning(self, "Error", f"Failed to save: {str(e)}")
+        logger.info("Queueing manual save operation")
+        self.save_worker.request_save()
             
     def closeEvent(self, event):
         """Handle application close event - auto-save before closing"""
-        # Clean up answer worker thread
-        if self.answer_worker and self.answer_worker.isRunning():
-            self.answer_worker.quit()
-            self.answer_worker.wait(3000)  # Wait up to 3 seconds for clean shutdown
+        # Drop pending answer generation and sync, their results are no longer needed
+        self.runner.cancel_all()
+        if self.batch_dialog:
+            self.batch_dialog.stop_worker(wait_ms=3000)
             
-        if self.user and self.app:
-            try:
-                self.app.save_user()
+        if self.user and self.app and self.save_worker:
+            if self.save_worker.flush(timeout=5.0):
                 self.statusBar().showMessage("Auto-saved user data before closing", 3000)
-            except Exception as e:
+            else:
                 self.statusBar().showMessage("Failed to auto-save! ❌", 3000)
-                # Ask user if they want to close without saving
+                # Changes stay in the local cache and are uploaded on the next start
                 reply = QMessageBox.question(self, "Save Error", 
-                    f"Failed to save data: {str(e)}\n\nDo you want to close without saving?",
+                    "Could not reach the server. Your changes are kept on this computer "
+                    "and will be uploaded next time.\n\nDo you want to close now?",
                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
                 if reply == QMessageBox.StandardButton.No:
                     event.ignore()
                     return
+            self.save_worker.stop()
+        if self.scheduler_optimizer:
+            self.scheduler_optimizer.shutdown()
+        self.runner.stop()
+        self.answer_cache.close()
+        # Only loaded once an answer has been generated
+        http_client = sys.modules.get("http_client")
+        if http_client:
+            http_client.get_client().close()
         
         event.accept()
         
@@ -698,7 +592,7 @@ class MainWindow(QMainWindow):
             # Get question and answer from text fields
             question = self.ui.CardDescriptionTextEdit.toPlainText().strip()
             answer = self.ui.textEdit.toPlainText().strip()
-            logger.debug(f"Card input - Question length: {len(question)}, Answer length: {len(answer)}")
+            logger.debug("Card input - Question length: %s, Answer length: %s", len(question), len(answer))
             
             if not question or not answer:
                 logger.warning("Add card attempted with empty question or answer")
@@ -710,26 +604,25 @@ class MainWindow(QMainWindow):
             for button in self.tag_buttons:
                 if button.isChecked():
                     selected_tags.add(button.text())
-            logger.debug(f"Selected tags for new card: {selected_tags}")
+            logger.debug("Selected tags for new card: %s", selected_tags)
                     
             # Create new card
             card = Card()
             full_card = FullCard(card, question, answer, selected_tags)
-            logger.debug(f"Created new FullCard with {len(selected_tags)} tags")
+            logger.debug("Created new FullCard with %s tags", len(selected_tags))
             
             # Add to user's cards
             if self.user and hasattr(self.user, 'full_cards'):
-                self.user.full_cards.append(full_card)
-                logger.info(f"Card added to user's collection. Total cards: {len(self.user.full_cards)}")
+                self.user.add_card(full_card)
+                logger.info("Card added to user's collection. Total cards: %s", len(self.user.full_cards))
             else:
                 logger.error("User object missing or invalid")
                 QMessageBox.warning(self, "Error", "User data is invalid.")
                 return
             
-            # Save to database
-            logger.info("Saving user data to database")
-            self.app.save_user()
-            logger.info("User data saved successfully")
+            # Save to database in the background
+            logger.info("Queueing save of user data")
+            self.save_worker.request_save()
             
             # Play success sound
             self.sound_manager.play_success()
@@ -749,7 +642,7 @@ class MainWindow(QMainWindow):
             self.update_status_bar()
             
         except Exception as e:
-            logger.error(f"Error adding card: {str(e)}", exc_info=True)
+            logger.error("Error adding card: %s", e, exc_info=True)
             self.sound_manager.play_error()
             QMessageBox.warning(self, "Error", f"Failed to add card: {str(e)}")
 
@@ -760,9 +653,6 @@ class MainWindow(QMainWindow):
     def first_color_selected(self):
         self.color_profile.gradient_end_color = self.first_color_dialog.selectedColor()
         self.setup_modern_styling()
-        for btn in self.tag_buttons:
-            self.tag_button_set_styling(btn)
-        self.set_generate_button_styling()
 
     def first_color_action_clicked(self):
         self.first_color_dialog = QColorDialog(self)
@@ -772,9 +662,6 @@ class MainWindow(QMainWindow):
     def second_color_selected(self):
         self.color_profile.main_color = self.second_color_dialog.selectedColor()
         self.setup_modern_styling()
-        for btn in self.tag_buttons:
-            self.tag_button_set_styling(btn)
-        self.set_generate_button_styling()
 
     def second_color_action_clicked(self):
         self.second_color_dialog = QColorDialog(self)
@@ -794,8 +681,7 @@ class MainWindow(QMainWindow):
                         w.setParent(None)
                         w.deleteLater()
                 self.tag_buttons.remove(button)
-        for card in self.user.full_cards:
-            card.tags = card.tags - to_delete_names
+        self.user.remove_tags(to_delete_names)
 
         self.tags -= to_delete_names
 
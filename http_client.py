@@ -0,0 +1,152 @@
+"""
+HTTP client for Emphizor
+One shared requests session with a connection pool, so repeated API calls reuse
+open keep-alive connections instead of paying DNS, TCP and TLS setup every time
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from config import Config
+from logger_config import get_logger
+
+# Set up logger for this module
+logger = get_logger(__name__)
+
+# Time spent opening a connection during the current request, per thread
+_connect_timing = threading.local()
+
+
+def _record_connect(start):
+    _connect_timing.seconds = getattr(_connect_timing, "seconds", 0.0) + time.perf_counter() - start
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        _record_connect(start)
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        _record_connect(start)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose new connections record how long connecting (DNS, TCP and TLS) took"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+@dataclass
+class RequestTiming:
+    """Seconds spent on one request
+
+    connect is None when a pooled connection was reused, total is None for a
+    streamed response until the caller has read its body.
+    """
+    connect: Optional[float]
+    ttfb: float
+    total: Optional[float]
+
+    def __str__(self):
+        connect = "reused" if self.connect is None else f"{self.connect * 1000:.0f}ms"
+        total = "streaming" if self.total is None else f"{self.total * 1000:.0f}ms"
+        return f"connect {connect}, ttfb {self.ttfb * 1000:.0f}ms, total {total}"
+
+
+class HttpClient:
+    """Thread-safe wrapper around a pooled requests.Session"""
+
+    def __init__(self, pool_size=10):
+        self.pool_size = pool_size
+        self._session = None
+        self._lock = threading.Lock()
+
+    def _get_session(self) -> requests.Session:
+        with self._lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = TimedHTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session = session
+                logger.debug("HTTP session created with pool size %s", self.pool_size)
+            return self._session
+
+    def request(self, method, url, stream=False, **kwargs) -> requests.Response:
+        """Send a request on a pooled connection, the response carries a RequestTiming as .timing
+
+        With stream=True the body is left unread, the caller has to consume or close the response.
+        """
+        session = self._get_session()
+        _connect_timing.seconds = 0.0
+        start = time.perf_counter()
+        # Streaming returns as soon as the headers arrive, which gives the time to first byte
+        response = session.request(method, url, stream=True, **kwargs)
+        ttfb = time.perf_counter() - start
+        total = None
+        if not stream:
+            response.content  # read the body and give the connection back to the pool
+            total = time.perf_counter() - start
+        connect = _connect_timing.seconds or None
+        response.timing = RequestTiming(connect, ttfb, total)
+        if stream:
+            self._time_body(response, start)
+        logger.debug("%s %s -> %s (%s)", method, url, response.status_code, response.timing)
+        return response
+
+    @staticmethod
+    def _time_body(response, start):
+        """Fill in timing.total once the caller has read the whole streamed body"""
+        iter_content = response.iter_content
+
+        def timed_iter_content(*args, **kwargs):
+            yield from iter_content(*args, **kwargs)
+            response.timing.total = time.perf_counter() - start
+
+        # iter_lines and .content both read through iter_content
+        response.iter_content = timed_iter_content
+
+    def post(self, url, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> HttpClient:
+    """The process-wide client used for all outbound API calls"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient(pool_size=Config.HTTP_POOL_SIZE)
+        return _client
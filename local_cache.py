@@ -0,0 +1,206 @@
+"""
+Local deck cache for Emphizor
+Mirrors the user's cards and scheduler in an SQLite file under ~/.emphizor and keeps review logs
+that are not uploaded yet in a review journal, so the app can open instantly and keep working
+without a network connection
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from review_journal import ReviewJournal
+from logger_config import get_logger
+
+# Set up logger for this module
+logger = get_logger(__name__)
+
+SCHEMA_SQL = """
+create table if not exists users (
+    email text primary key,
+    user_id integer,
+    name text not null,
+    scheduler text not null,
+    pending text not null default '{}'
+);
+
+create table if not exists cards (
+    email text not null,
+    card_id integer not null,
+    data text not null,
+    primary key (email, card_id)
+);
+
+-- Unsynced review logs of older versions, moved to the review journal when a deck is opened
+create table if not exists review_logs (
+    seq integer primary key autoincrement,
+    email text not null,
+    card_id integer,
+    review_datetime text,
+    data text not null,
+    synced integer not null default 0,
+    unique (email, card_id, review_datetime)
+);
+"""
+
+
+def _merge_pending(stored: dict, changes: dict) -> dict:
+    merged = {}
+    for key in ("added", "edited", "reviewed", "deleted"):
+        merged[key] = sorted(set(stored.get(key, [])) | set(changes.get(key, [])))
+    deleted = set(merged["deleted"])
+    for key in ("added", "edited", "reviewed"):
+        merged[key] = [card_id for card_id in merged[key] if card_id not in deleted]
+    merged["scheduler_changed"] = stored.get("scheduler_changed", False) or changes.get("scheduler_changed", False)
+    return merged
+
+
+class LocalDeckCache:
+    """SQLite mirror of the decks of users who signed in on this machine"""
+
+    def __init__(self, app_data_dir=None):
+        self.app_data_dir = Path(app_data_dir) if app_data_dir else Path.home() / ".emphizor"
+        self.db_file = self.app_data_dir / "deck_cache.sqlite3"
+        self._conn = None
+        self._lock = threading.Lock()
+        self._journals = {}
+
+    def _connection(self):
+        # Opened on first use so creating an App never touches the disk
+        if self._conn is None:
+            self.app_data_dir.mkdir(exist_ok=True)
+            self._conn = sqlite3.connect(self.db_file, check_same_thread=False)
+            self._conn.executescript(SCHEMA_SQL)
+            logger.debug("Local deck cache opened: %s", self.db_file)
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def journal(self, email: str) -> ReviewJournal:
+        """The review journal of a user, files are named by a hash so emails never become paths"""
+        with self._lock:
+            journal = self._journals.get(email)
+            if journal is None:
+                name = hashlib.sha256(email.encode("utf-8")).hexdigest()[:32]
+                journal = ReviewJournal(self.app_data_dir / "journals" / f"{name}.bin")
+                self._journals[email] = journal
+            return journal
+
+    def has_user(self, email: str) -> bool:
+        with self._lock:
+            row = self._connection().execute("select 1 from users where email = ?", (email,)).fetchone()
+        return row is not None
+
+    def load_user_data(self, email: str) -> dict | None:
+        """Return the cached user as plain dictionaries, or None if never cached"""
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute("select user_id, name, scheduler, pending from users where email = ?",
+                               (email,)).fetchone()
+            if row is None:
+                logger.debug("No cached deck for %s", email)
+                return None
+            user_id, name, scheduler, pending = row
+            card_rows = conn.execute("select data from cards where email = ? order by card_id", (email,)).fetchall()
+            legacy_rows = conn.execute("select data from review_logs where email = ? and synced = 0 order by seq",
+                                       (email,)).fetchall()
+        journal = self.journal(email)
+        if legacy_rows:
+            journal.append([json.loads(data) for (data,) in legacy_rows])
+            with self._lock:
+                conn = self._connection()
+                with conn:
+                    conn.execute("delete from review_logs where email = ?", (email,))
+            logger.info("Moved %s unsynced review logs of %s to the review journal", len(legacy_rows), email)
+        # Only logs that still have to be uploaded, the history itself stays on the server
+        log_dicts = journal.unsynced()
+        logger.info("Loaded cached deck for %s: %s cards, %s unsynced review logs", email, len(card_rows), len(log_dicts))
+        return {
+            "id": user_id,
+            "name": name,
+            "email": email,
+            "scheduler": json.loads(scheduler),
+            "full_cards": [json.loads(data) for (data,) in card_rows],
+            "unsynced_review_logs": log_dicts,
+            "pending": json.loads(pending),
+        }
+
+    def store_user(self, user):
+        """Replace the cached copy of a user with a full snapshot of the open deck
+
+        The user's changes that are not uploaded yet stay pending. Review logs are not copied,
+        the review journal keeps the logs recorded on this machine until they are uploaded.
+        """
+        pending = user.changes.unsaved().to_dict()
+        logger.info("Writing full deck snapshot for %s to local cache", user.email)
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("delete from cards where email = ?", (user.email,))
+                conn.execute("delete from review_logs where email = ?", (user.email,))
+                conn.execute("insert or replace into users (email, user_id, name, scheduler, pending) "
+                             "values (?, ?, ?, ?, ?)",
+                             (user.email, user.id, user.name, json.dumps(user.scheduler.to_dict()),
+                              json.dumps(pending)))
+                conn.executemany("insert into cards (email, card_id, data) values (?, ?, ?)",
+                                 [(user.email, card.card_id, json.dumps(card.to_dict())) for card in user.full_cards])
+
+    def store_changes(self, user, changes):
+        """Write a ChangeSet locally and remember it as not yet uploaded
+
+        The review logs of the ChangeSet are already in the review journal, they were written when recorded.
+        """
+        dirty_ids = changes.dirty_card_ids
+        dirty_cards = [card for card in list(user.full_cards) if card.card_id in dirty_ids]
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                row = conn.execute("select pending from users where email = ?", (user.email,)).fetchone()
+                stored = json.loads(row[0]) if row else {}
+                pending = _merge_pending(stored, changes.to_dict())
+                conn.execute("insert or replace into users (email, user_id, name, scheduler, pending) "
+                             "values (?, ?, ?, ?, ?)",
+                             (user.email, user.id, user.name, json.dumps(user.scheduler.to_dict()),
+                              json.dumps(pending)))
+                conn.executemany("insert or replace into cards (email, card_id, data) values (?, ?, ?)",
+                                 [(user.email, card.card_id, json.dumps(card.to_dict())) for card in dirty_cards])
+                conn.executemany("delete from cards where email = ? and card_id = ?",
+                                 [(user.email, card_id) for card_id in changes.deleted])
+        logger.debug("Stored %s in local cache for %s", changes, user.email)
+
+    def mark_synced(self, email: str, changes):
+        """Forget pending markers for changes that reached the server"""
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                row = conn.execute("select pending from users where email = ?", (email,)).fetchone()
+                if row is None:
+                    return
+                pending = json.loads(row[0])
+                synced = changes.to_dict()
+                for key in ("added", "edited", "reviewed", "deleted"):
+                    done = set(synced[key])
+                    pending[key] = [card_id for card_id in pending.get(key, []) if card_id not in done]
+                if changes.scheduler_changed:
+                    pending["scheduler_changed"] = False
+                conn.execute("update users set pending = ? where email = ?", (json.dumps(pending), email))
+        # Matched record by record, a review whose journal append failed has no record
+        self.journal(email).mark_logs_synced([review_log.to_dict() for review_log in changes.review_logs])
+
+    def apply_server_changes(self, user, updated_cards, removed_card_ids):
+        """Write cards that changed on the server side during a reconcile"""
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("update users set user_id = ?, scheduler = ? where email = ?",
+                             (user.id, json.dumps(user.scheduler.to_dict()), user.email))
+                conn.executemany("insert or replace into cards (email, card_id, data) values (?, ?, ?)",
+                                 [(user.email, card.card_id, json.dumps(card.to_dict())) for card in updated_cards])
+                conn.executemany("delete from cards where email = ? and card_id = ?",
+                                 [(user.email, card_id) for card_id in removed_card_ids])
+        logger.info("Applied %s updated and %s removed server cards to cache", len(updated_cards), len(removed_card_ids))
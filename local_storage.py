@@ -4,16 +4,97 @@ Local storage module for securely saving user credentials
 
 import json
 import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import base64
+from config import Config
 from logger_config import get_logger
 
 # Set up logger for this module
 logger = get_logger(__name__)
 
+KEYRING_SERVICE = "emphizor"
+KEYRING_USERNAME = "credential-key"
+
+
+def derive_machine_key() -> bytes:
+    """Fernet key derived from the user and host name, 100k PBKDF2 iterations so this is slow"""
+    machine_info = f"{os.getenv('USER', 'default')}-{os.getenv('HOSTNAME', 'default')}-emphizor"
+    salt = b'emphizor_salt_2024'  # Fixed salt for consistency
+    
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=salt,
+        iterations=100000,
+    )
+    return base64.urlsafe_b64encode(kdf.derive(machine_info.encode()))
+
+
+def load_keyring_key(key_file: Path):
+    """The key kept in the system keyring, None when keyring is not installed or has no backend
+
+    A key file left from before is moved into the keyring, so saved credentials still decrypt.
+    A new key is random, nothing has to be derived.
+    """
+    try:
+        import keyring
+    except ImportError:
+        logger.warning("EMPHIZOR_KEY_STORE is keyring but the keyring package is not installed, using the key file")
+        return None
+    try:
+        key = keyring.get_password(KEYRING_SERVICE, KEYRING_USERNAME)
+        if key:
+            return key.encode()
+        key = key_file.read_bytes() if key_file.exists() else Fernet.generate_key()
+        keyring.set_password(KEYRING_SERVICE, KEYRING_USERNAME, key.decode())
+    except Exception as e:
+        logger.warning("System keyring unavailable, using the key file: %s", e)
+        return None
+    if key_file.exists():
+        os.remove(key_file)
+        logger.info("Moved the credential key from the key file into the system keyring")
+    return key
+
+
+def load_key(key_file: Path) -> bytes:
+    """Load the encryption key, deriving and saving it the first time"""
+    if Config.CREDENTIAL_KEY_STORE == "keyring":
+        key = load_keyring_key(key_file)
+        if key:
+            return key
+    if key_file.exists():
+        return key_file.read_bytes()
+    logger.info("No credential key yet, deriving one")
+    key = derive_machine_key()
+    key_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(key_file, 'wb') as f:
+        f.write(key)
+    return key
+
+
+_ciphers = {}
+_ciphers_lock = threading.Lock()
+
+
+def get_cipher_async(key_file: Path) -> Future:
+    """Future of the Fernet for a key file, loaded once per process on a background thread"""
+    key_file = Path(key_file)
+    with _ciphers_lock:
+        future = _ciphers.get(key_file)
+        if future is None or (future.done() and future.exception() is not None):
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="emphizor-key")
+            future = executor.submit(lambda: Fernet(load_key(key_file)))
+            # The thread exits once the key is loaded
+            executor.shutdown(wait=False)
+            _ciphers[key_file] = future
+        return future
+
+
 class LocalCredentialStorage:
     """Handles secure local storage of user credentials"""
     
@@ -21,44 +102,28 @@ class LocalCredentialStorage:
         logger.info("Initializing LocalCredentialStorage")
         self.app_data_dir = Path.home() / ".emphizor"
         self.credentials_file = self.app_data_dir / "credentials.json"
+        self.session_file = self.app_data_dir / "session.json"
         self.key_file = self.app_data_dir / "key.key"
         
         # Create app data directory if it doesn't exist
         self.app_data_dir.mkdir(exist_ok=True)
-        logger.debug(f"App data directory: {self.app_data_dir}")
+        logger.debug("App data directory: %s", self.app_data_dir)
         
-        # Initialize encryption key
-        self._init_encryption_key()
+        # Load or derive the encryption key in the background, the first
+        # encryption or decryption waits for it
+        self._cipher_future = get_cipher_async(self.key_file)
         logger.info("LocalCredentialStorage initialized successfully")
     
-    def _init_encryption_key(self):
-        """Initialize or load encryption key"""
-        if self.key_file.exists():
-            with open(self.key_file, 'rb') as f:
-                self.key = f.read()
-        else:
-            # Generate new key from machine-specific data
-            machine_info = f"{os.getenv('USER', 'default')}-{os.getenv('HOSTNAME', 'default')}-emphizor"
-            salt = b'emphizor_salt_2024'  # Fixed salt for consistency
-            
-            kdf = PBKDF2HMAC(
-                algorithm=hashes.SHA256(),
-                length=32,
-                salt=salt,
-                iterations=100000,
-            )
-            self.key = base64.urlsafe_b64encode(kdf.derive(machine_info.encode()))
-            
-            # Save the key
-            with open(self.key_file, 'wb') as f:
-                f.write(self.key)
+    @property
+    def cipher(self) -> Fernet:
+        """The process-wide Fernet, blocks until the key is loaded"""
+        return self._cipher_future.result()
     
     def save_credentials(self, email, password):
         """Save email and encrypted password locally"""
-        logger.info(f"Saving credentials for email: {email}")
+        logger.info("Saving credentials for email: %s", email)
         try:
-            f = Fernet(self.key)
-            encrypted_password = f.encrypt(password.encode())
+            encrypted_password = self.cipher.encrypt(password.encode())
             
             credentials = {
                 "email": email,
@@ -71,7 +136,7 @@ class LocalCredentialStorage:
             logger.info("Credentials saved successfully")
             return True
         except Exception as e:
-            logger.error(f"Error saving credentials: {e}", exc_info=True)
+            logger.error("Error saving credentials: %s", e, exc_info=True)
             return False
     
     def load_credentials(self):
@@ -88,17 +153,55 @@ class LocalCredentialStorage:
             email = credentials.get("email")
             encrypted_password = base64.urlsafe_b64decode(credentials.get("password").encode())
             
-            f = Fernet(self.key)
-            password = f.decrypt(encrypted_password).decode()
+            password = self.cipher.decrypt(encrypted_password).decode()
             
-            logger.info(f"Credentials loaded successfully for email: {email}")
+            logger.info("Credentials loaded successfully for email: %s", email)
             return email, password
         except Exception as e:
-            logger.error(f"Error loading credentials: {e}", exc_info=True)
+            logger.error("Error loading credentials: %s", e, exc_info=True)
             return None, None
     
+    def save_session(self, email, access_token, refresh_token):
+        """Save the encrypted Supabase session tokens, used to sign in without the password"""
+        logger.debug("Saving session tokens for email: %s", email)
+        try:
+            cipher = self.cipher
+            session = {
+                "email": email,
+                "access_token": cipher.encrypt(access_token.encode()).decode(),
+                "refresh_token": cipher.encrypt(refresh_token.encode()).decode(),
+            }
+            # Write then rename, the background token refresh may save while the app exits
+            temp_file = self.session_file.with_suffix(".tmp")
+            with open(temp_file, 'w') as file:
+                json.dump(session, file)
+            os.replace(temp_file, self.session_file)
+            return True
+        except Exception as e:
+            logger.error("Error saving session tokens: %s", e, exc_info=True)
+            return False
+    
+    def load_session(self):
+        """Load and decrypt saved session tokens, returns (email, access_token, refresh_token)"""
+        try:
+            if not self.session_file.exists():
+                logger.debug("No session file found")
+                return None, None, None
+            
+            with open(self.session_file, 'r') as file:
+                session = json.load(file)
+            
+            cipher = self.cipher
+            access_token = cipher.decrypt(session["access_token"].encode()).decode()
+            refresh_token = cipher.decrypt(session["refresh_token"].encode()).decode()
+            logger.info("Session tokens loaded for email: %s", session['email'])
+            return session["email"], access_token, refresh_token
+        except Exception as e:
+            logger.error("Error loading session tokens: %s", e, exc_info=True)
+            return None, None, None
+    
     def clear_credentials(self):
-        """Clear saved credentials"""
+        """Clear saved credentials and session tokens"""
         logger.info("Clearing saved credentials")
         try:
             if self.credentials_file.exists():
@@ -106,11 +209,14 @@ class LocalCredentialStorage:
                 logger.info("Credentials file removed successfully")
             else:
                 logger.debug("No credentials file to clear")
+            if self.session_file.exists():
+                os.remove(self.session_file)
+                logger.info("Session file removed successfully")
             return True
         except Exception as e:
-            logger.error(f"Error clearing credentials: {e}", exc_info=True)
+            logger.error("Error clearing credentials: %s", e, exc_info=True)
             return False
     
     def has_saved_credentials(self):
         """Check if credentials are saved"""
-        return self.credentials_file.exists() 
\ No newline at end of file
+        return self.credentials_file.exists() or self.session_file.exists() 
\ No newline at end of file
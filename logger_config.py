@@ -1,77 +1,132 @@
 """
 Logging configuration for Emphizor application
-Provides centralized logging setup with file rotation and multiple log levels
+Module loggers are children of the 'emphizor' logger, whose only handler puts records on a queue.
+One background listener thread formats them and writes the rotating log file and the console,
+so logging never does file I/O on the calling thread
 """
 
+import atexit
 import logging
 import logging.handlers
-import os
-from datetime import datetime
+import queue
+import threading
 from pathlib import Path
 
-def setup_logger(name=None, level=logging.INFO):
-    """
-    Set up a logger with both file and console handlers
-    
-    Args:
-        name: Logger name (defaults to module name)
-        level: Logging level (default: INFO)
-    
-    Returns:
-        Logger instance
+LOGS_DIR = Path("logs")
+ROOT_LOGGER_NAME = "emphizor"
+
+
+class LazyRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Rotating file handler that creates its directory and opens the file on the first record"""
+
+    def __init__(self, filename, **kwargs):
+        super().__init__(filename, delay=True, **kwargs)
+
+    def _open(self):
+        Path(self.baseFilename).parent.mkdir(parents=True, exist_ok=True)
+        return super()._open()
+
+
+class LocalQueueHandler(logging.handlers.QueueHandler):
+    """Queues records for a listener in this process, formatting is left to the listener
+
+    QueueHandler.prepare formats the whole record so it can be pickled. Here only the
+    message arguments are merged, so objects changed after the call are logged as they
+    were, while timestamps and tracebacks are rendered on the listener thread.
     """
-    # Create logs directory if it doesn't exist
-    logs_dir = Path("logs")
-    logs_dir.mkdir(exist_ok=True)
-    
-    # Create logger
-    logger = logging.getLogger(name or __name__)
-    
-    # Avoid adding multiple handlers to the same logger
-    if logger.handlers:
-        return logger
-    
-    logger.setLevel(level)
-    
-    # Create formatters
-    file_formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    
-    console_formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%H:%M:%S'
-    )
-    
-    # File handler with rotation (keeps last 5 files, max 10MB each)
-    file_handler = logging.handlers.RotatingFileHandler(
-        logs_dir / 'emphizor.log',
+
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def create_handlers():
+    """The file and console handlers the listener writes to"""
+    # File handler with rotation (keeps last 5 files, max 10MB each),
+    # the logs directory and file are only created once something is logged
+    file_handler = LazyRotatingFileHandler(
+        LOGS_DIR / 'emphizor.log',
         maxBytes=10*1024*1024,  # 10MB
         backupCount=5
     )
     file_handler.setLevel(logging.DEBUG)
-    file_handler.setFormatter(file_formatter)
-    
+    file_handler.setFormatter(logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    ))
+
     # Console handler
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.INFO)
-    console_handler.setFormatter(console_formatter)
-    
-    # Add handlers to logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
-    
-    return logger
+    console_handler.setFormatter(logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        datefmt='%H:%M:%S'
+    ))
+    return file_handler, console_handler
+
+
+_listener = None
+_queue_handler = None
+_setup_lock = threading.Lock()
+
+
+def setup_logging(level=logging.INFO):
+    """
+    Give the 'emphizor' logger its queue handler and start the listener, once per process
+
+    Args:
+        level: Logging level (default: INFO)
+
+    Returns:
+        The 'emphizor' logger
+    """
+    global _listener, _queue_handler
+    root = logging.getLogger(ROOT_LOGGER_NAME)
+    with _setup_lock:
+        if _listener is not None:
+            return root
+        root.setLevel(level)
+        # The listener's handlers are the only place records are written
+        root.propagate = False
+        # Unbounded, putting a record never waits
+        log_queue = queue.SimpleQueue()
+        _queue_handler = LocalQueueHandler(log_queue)
+        root.addHandler(_queue_handler)
+        _listener = logging.handlers.QueueListener(log_queue, *create_handlers(), respect_handler_level=True)
+        _listener.start()
+    atexit.register(shutdown_logging)
+    return root
+
+
+def shutdown_logging():
+    """Write out the queued records and stop the listener thread"""
+    global _listener, _queue_handler
+    with _setup_lock:
+        listener, _listener = _listener, None
+        queue_handler, _queue_handler = _queue_handler, None
+        if queue_handler is not None:
+            logging.getLogger(ROOT_LOGGER_NAME).removeHandler(queue_handler)
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
 
 def get_logger(name=None):
-    """Get a logger instance for the calling module"""
-    return setup_logger(name)
+    """Get a logger for the calling module, a child of the 'emphizor' logger without handlers of its own"""
+    root = setup_logging()
+    if not name or name == ROOT_LOGGER_NAME:
+        return root
+    if name.startswith(ROOT_LOGGER_NAME + "."):
+        return logging.getLogger(name)
+    return root.getChild(name)
 
 # Create application-wide logger
-app_logger = setup_logger('emphizor')
+app_logger = get_logger()
 
-# Log application startup
-app_logger.info("="*60)
-app_logger.info("EMPHIZOR APPLICATION STARTUP")
-app_logger.info("="*60) 
\ No newline at end of file
+def log_startup_banner():
+    """Log application startup, called by the entry point rather than on import"""
+    app_logger.info("="*60)
+    app_logger.info("EMPHIZOR APPLICATION STARTUP")
+    app_logger.info("="*60)
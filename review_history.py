@@ -0,0 +1,82 @@
+"""
+Review history for Emphizor
+Append-only journal of review logs. Reviews made in this session are kept as ReviewLog objects,
+the stored history is only fetched, a page at a time, when something actually reads it
+"""
+
+import threading
+from fsrs import ReviewLog
+
+# Review logs fetched per request while iterating the stored history
+PAGE_SIZE = 1000
+
+
+class ReviewHistory:
+    """Review logs of a user: the stored history plus the logs appended since loading
+
+    page_loader(offset, limit) returns stored log dictionaries in review order,
+    stored is an alternative list of dictionaries already in memory. Nothing is
+    converted to ReviewLog objects until the history is iterated.
+    The page loader reads the server as it is now, so logs a save uploaded have
+    to be handed to mark_stored() or they would be read twice.
+    """
+
+    def __init__(self, page_loader=None, stored=None, new_logs=()):
+        self._page_loader = page_loader
+        self._stored = stored
+        self._new = list(new_logs)
+        # Saves run on a worker thread while reviews are appended on the GUI thread
+        self._lock = threading.Lock()
+
+    def append(self, review_log):
+        with self._lock:
+            self._new.append(review_log)
+
+    def extend(self, review_logs):
+        with self._lock:
+            self._new.extend(review_logs)
+
+    @property
+    def new_logs(self) -> list:
+        """Logs appended since the history was loaded and not stored yet"""
+        with self._lock:
+            return list(self._new)
+
+    def mark_stored(self, review_logs):
+        """Logs a save uploaded, from now on they are read with the stored history"""
+        if self._page_loader is None and self._stored is None:
+            # Nothing stored to read them back from, e.g. a deck opened from the local cache
+            return
+        uploaded = {id(review_log) for review_log in review_logs}
+        with self._lock:
+            stored_now = [log for log in self._new if id(log) in uploaded]
+            self._new = [log for log in self._new if id(log) not in uploaded]
+            if self._stored is not None:
+                self._stored.extend(log.to_dict() for log in stored_now)
+
+    def iter_stored_dicts(self, page_size=PAGE_SIZE):
+        if self._stored is not None:
+            yield from self._stored
+            return
+        if self._page_loader is None:
+            return
+        offset = 0
+        while True:
+            page = self._page_loader(offset, page_size)
+            yield from page
+            if len(page) < page_size:
+                return
+            offset += page_size
+
+    def __iter__(self):
+        for log_dict in self.iter_stored_dicts():
+            yield ReviewLog.from_dict(log_dict)
+        yield from self.new_logs
+
+    def load_all(self) -> list:
+        """Every review log as a list, this reads the whole stored history"""
+        return list(self)
+
+    def __repr__(self):
+        source = "in memory" if self._stored is not None else "paged" if self._page_loader else "empty"
+        return f"ReviewHistory(stored={source}, new={len(self._new)})"
@@ -0,0 +1,205 @@
+"""
+Review journal for Emphizor
+Append-only file of fixed-width binary review records. Every review is written the moment it is
+made, a watermark in the header counts how many records already reached the server.
+Records hold the fields of an fsrs 5 ReviewLog, which refers to its card by id
+"""
+
+import os
+import struct
+import threading
+from datetime import datetime, timezone
+from logger_config import get_logger
+
+# Set up logger for this module
+logger = get_logger(__name__)
+
+# magic, format version, record size, number of records already uploaded
+HEADER = struct.Struct("<4sHHQ")
+MAGIC = b"EMRJ"
+VERSION = 1
+# card id, rating, review time in ms since the epoch, review duration in ms
+RECORD = struct.Struct("<qBqI")
+NO_DURATION = 0xFFFFFFFF
+_SYNCED_OFFSET = 8
+
+
+def encode_log(log_dict: dict) -> bytes:
+    """Pack a ReviewLog.to_dict() dictionary into one journal record"""
+    review_datetime = datetime.fromisoformat(log_dict["review_datetime"])
+    if review_datetime.tzinfo is None:
+        review_datetime = review_datetime.replace(tzinfo=timezone.utc)
+    timestamp_ms = round(review_datetime.timestamp() * 1000)
+    duration = log_dict.get("review_duration")
+    return RECORD.pack(log_dict["card_id"], int(log_dict["rating"]), timestamp_ms,
+                       NO_DURATION if duration is None else int(duration))
+
+
+def decode_record(record: bytes) -> dict:
+    """Unpack one journal record into a ReviewLog.from_dict() dictionary"""
+    card_id, rating, timestamp_ms, duration = RECORD.unpack(record)
+    review_datetime = datetime.fromtimestamp(timestamp_ms / 1000, tz=timezone.utc)
+    return {
+        "card_id": card_id,
+        "rating": rating,
+        "review_datetime": review_datetime.isoformat(),
+        "review_duration": None if duration == NO_DURATION else duration,
+    }
+
+
+class ReviewJournal:
+    """Review journal of one user
+
+    Records are only ever appended, uploading moves the synced watermark
+    forward. Once everything is uploaded the file is cut back to its header,
+    so it never holds more than the reviews made since the last save.
+
+    append() hands records to the operating system and leaves the fsync to a
+    background thread, reviews are recorded on the GUI thread.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._sync_requested = threading.Event()
+        self._sync_thread = None
+
+    def _read_header(self, f) -> int:
+        f.seek(0)
+        header = f.read(HEADER.size)
+        # Missing, or lost in a crash before it reached the disk, the next append writes it again
+        if len(header) < HEADER.size or header == bytes(HEADER.size):
+            return 0
+        magic, version, record_size, synced = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            raise ValueError(f"Unsupported review journal format in {self.path}")
+        return synced
+
+    def _record_count(self, f) -> int:
+        # A record cut short by a crash does not count and is overwritten by the next append
+        size = f.seek(0, os.SEEK_END)
+        return max(0, size - HEADER.size) // RECORD.size
+
+    def _open(self):
+        try:
+            f = open(self.path, "r+b")
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            f = open(self.path, "w+b")
+        f.seek(0)
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size or header == bytes(HEADER.size):
+            # New, or the header did not reach the disk before a crash. A short file holds
+            # no records, after a zeroed header the records are kept as unsynced
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, VERSION, RECORD.size, 0))
+            if len(header) < HEADER.size:
+                f.truncate()
+        return f
+
+    def append(self, log_dicts: list[dict]):
+        """Write records for the given log dictionaries and flush them to disk"""
+        if not log_dicts:
+            return
+        data = b"".join(encode_log(log_dict) for log_dict in log_dicts)
+        with self._lock, self._open() as f:
+            self._read_header(f)
+            f.seek(HEADER.size + self._record_count(f) * RECORD.size)
+            f.write(data)
+            f.truncate()
+            if self._sync_thread is None:
+                self._sync_thread = threading.Thread(target=self._sync_loop, name="review-journal-sync", daemon=True)
+                self._sync_thread.start()
+        # Records written since the last fsync go to disk together
+        self._sync_requested.set()
+        logger.debug("Journaled %s review logs to %s", len(log_dicts), self.path)
+
+    def _sync_loop(self):
+        while True:
+            self._sync_requested.wait()
+            self._sync_requested.clear()
+            self.sync()
+
+    def sync(self):
+        """Flush the records written so far to the disk"""
+        try:
+            with open(self.path, "r+b") as f:
+                os.fsync(f.fileno())
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning("Could not sync review journal %s: %s", self.path, e)
+
+    def unsynced(self) -> list[dict]:
+        """Log dictionaries of the records that were not uploaded yet, oldest first"""
+        with self._lock:
+            try:
+                f = open(self.path, "rb")
+            except FileNotFoundError:
+                return []
+            with f:
+                synced = self._read_header(f)
+                count = self._record_count(f)
+                f.seek(HEADER.size + min(synced, count) * RECORD.size)
+                data = f.read((count - min(synced, count)) * RECORD.size)
+        return [decode_record(data[i:i + RECORD.size]) for i in range(0, len(data), RECORD.size)]
+
+    def mark_synced(self, count: int):
+        """Record that the oldest `count` unsynced records reached the server"""
+        if count <= 0:
+            return
+        with self._lock:
+            try:
+                f = open(self.path, "r+b")
+            except FileNotFoundError:
+                return
+            with f:
+                self._advance(f, count)
+
+    def mark_logs_synced(self, log_dicts: list[dict]):
+        """Record that the given logs reached the server, oldest first
+
+        Only unsynced records found among them move the watermark. A review whose append
+        failed was never journaled and must not make a later record count as uploaded.
+        """
+        if not log_dicts:
+            return
+        uploaded = iter([encode_log(log_dict) for log_dict in log_dicts])
+        with self._lock:
+            try:
+                f = open(self.path, "r+b")
+            except FileNotFoundError:
+                return
+            with f:
+                synced = self._read_header(f)
+                count = self._record_count(f)
+                f.seek(HEADER.size + min(synced, count) * RECORD.size)
+                matched = 0
+                for _ in range(count - min(synced, count)):
+                    # `in` moves the iterator past the match, so records are matched in order
+                    if f.read(RECORD.size) not in uploaded:
+                        break
+                    matched += 1
+                if matched:
+                    self._advance(f, matched)
+
+    def _advance(self, f, count: int):
+        total = self._record_count(f)
+        synced = min(self._read_header(f) + count, total)
+        if synced == total:
+            # Everything is uploaded, start over. Truncating before resetting the
+            # watermark means a crash in between cannot make records look unsynced again
+            f.truncate(HEADER.size)
+            synced = 0
+        f.seek(_SYNCED_OFFSET)
+        f.write(struct.pack("<Q", synced))
+        f.flush()
+        os.fsync(f.fileno())
+
+    def clear(self):
+        """Drop every record, used when the cache is replaced by a server snapshot"""
+        with self._lock:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,116 @@
+"""
+Background save queue for Emphizor
+Runs App.save_user off the GUI thread, merging repeated save requests and retrying with backoff
+"""
+
+import threading
+import time
+from PySide6.QtCore import QThread, Signal
+from logger_config import get_logger
+
+# Set up logger for this module
+logger = get_logger(__name__)
+
+
+class SaveWorker(QThread):
+    """Worker thread that uploads user changes in the background"""
+    save_started = Signal()
+    save_succeeded = Signal()
+    save_retry_scheduled = Signal(int, float)  # attempt number, delay in seconds
+    save_failed = Signal(str)
+
+    def __init__(self, app, max_attempts=5, base_delay=1.0, max_delay=30.0):
+        super().__init__()
+        self.app = app
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._condition = threading.Condition()
+        self._requested = False
+        self._flush_requested = False
+        self._stopping = False
+        self._busy = False
+        self._last_error = None
+
+    def request_save(self):
+        """Ask for a save, requests made while a save is queued are merged into it"""
+        with self._condition:
+            self._requested = True
+            self._condition.notify_all()
+        logger.debug("Save requested")
+
+    def flush(self, timeout=5.0):
+        """Save right away, skipping any backoff, and wait for the result
+
+        Returns True if all changes reached the server within the timeout.
+        """
+        logger.info("Flushing save queue")
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            self._requested = True
+            self._flush_requested = True
+            self._condition.notify_all()
+            while self._requested or self._busy:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning("Save queue flush timed out")
+                    return False
+                self._condition.wait(remaining)
+            return self._last_error is None
+
+    def stop(self, timeout_ms=3000):
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        self.wait(timeout_ms)
+
+    def _backoff_delay(self, attempt):
+        return min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+
+    def run(self):
+        logger.info("Save worker started")
+        attempt = 0
+        while True:
+            with self._condition:
+                while not self._requested and not self._stopping:
+                    self._condition.wait()
+                if self._stopping and not self._requested:
+                    break
+                self._requested = False
+                self._flush_requested = False
+                self._busy = True
+
+            self.save_started.emit()
+            error = None
+            try:
+                self.app.save_user()
+            except Exception as e:
+                error = e
+
+            with self._condition:
+                self._busy = False
+                self._last_error = error
+                self._condition.notify_all()
+
+            if error is None:
+                attempt = 0
+                self.save_succeeded.emit()
+                continue
+
+            attempt += 1
+            if attempt >= self.max_attempts:
+                logger.error("Save failed after %s attempts: %s", attempt, error)
+                attempt = 0
+                self.save_failed.emit(str(error))
+                continue
+
+            delay = self._backoff_delay(attempt)
+            logger.warning("Save attempt %s failed, retrying in %.0fs: %s", attempt, delay, error)
+            self.save_retry_scheduled.emit(attempt, delay)
+            with self._condition:
+                # New requests wait for the backoff, a flush or shutdown cuts it short
+                self._condition.wait_for(lambda: self._flush_requested or self._stopping, timeout=delay)
+                if self._stopping and not self._flush_requested:
+                    break
+                self._requested = True
+        logger.info("Save worker stopped")
@@ -0,0 +1,86 @@
+"""
+Scheduler optimizer for Emphizor
+Fits FSRS parameters to the user's review history in a separate process, so the GUI keeps
+running while the optimizer works
+"""
+
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from fsrs import Scheduler
+from review_history import ReviewHistory
+from logger_config import get_logger
+
+# Set up logger for this module
+logger = get_logger(__name__)
+
+# Fewer reviews than this give parameters that are worse than the defaults
+MIN_REVIEW_LOGS = 400
+
+
+class NotEnoughReviewsError(ValueError):
+    """Raised when the review history is too short to fit parameters"""
+
+
+def review_log_dicts(review_logs) -> list[dict]:
+    """Review logs as dictionaries, stored history is passed through without building ReviewLog objects"""
+    if isinstance(review_logs, ReviewHistory):
+        return list(review_logs.iter_stored_dicts()) + [log.to_dict() for log in review_logs.new_logs]
+    return [log.to_dict() for log in review_logs]
+
+
+def fit_parameters(log_dicts: list[dict]) -> list[float]:
+    """Run the fsrs optimizer, this is what runs in the optimizer process"""
+    # Only the child process needs the optimizer and its dependencies (fsrs[optimizer])
+    from fsrs import Optimizer, ReviewLog
+    optimizer = Optimizer([ReviewLog.from_dict(log_dict) for log_dict in log_dicts])
+    return [float(parameter) for parameter in optimizer.compute_optimal_parameters()]
+
+
+def scheduler_with_parameters(scheduler, parameters) -> Scheduler:
+    """A copy of the scheduler with new parameters, keeping its desired retention and learning steps"""
+    return Scheduler.from_dict({**scheduler.to_dict(), "parameters": list(parameters)})
+
+
+class SchedulerOptimizer:
+    """Owns the optimizer process, one fit runs at a time"""
+
+    def __init__(self):
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn instead of fork, the GUI process has Qt and network threads running
+                self._executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+            return self._executor
+
+    def optimize(self, review_logs, scheduler) -> Scheduler:
+        """Fit a scheduler to the review history, blocks until the optimizer process is done
+
+        Reading a paged ReviewHistory downloads it, so call this off the GUI thread.
+        """
+        log_dicts = review_log_dicts(review_logs)
+        if len(log_dicts) < MIN_REVIEW_LOGS:
+            raise NotEnoughReviewsError(f"At least {MIN_REVIEW_LOGS} reviews are needed to optimize "
+                                        f"the scheduler, there are {len(log_dicts)}")
+        logger.info("Fitting FSRS parameters to %s review logs", len(log_dicts))
+        start = time.perf_counter()
+        parameters = self._get_executor().submit(fit_parameters, log_dicts).result()
+        logger.info("FSRS parameters fitted in %.1fs", time.perf_counter() - start)
+        return scheduler_with_parameters(scheduler, parameters)
+
+    def shutdown(self):
+        """Stop the optimizer process, a fit still running is abandoned"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        # The executor would wait for a running fit on exit, end its process instead.
+        # shutdown() drops the process table, so take it first
+        processes = list((getattr(executor, "_processes", None) or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
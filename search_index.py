@@ -0,0 +1,99 @@
+"""
+Search index for Emphizor
+Inverted index over card questions and answers with prefix matching, kept current as cards change
+"""
+
+import re
+from bisect import bisect_left, insort
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+# Sorts after every word starting with a given prefix
+_MAX_CHAR = chr(0x10FFFF)
+
+# Query words shorter than this only match whole words, a one letter prefix would match most of the deck
+MIN_PREFIX_LENGTH = 2
+
+
+def tokenize(text: str) -> set[str]:
+    """Lowercased words of a text"""
+    return set(_TOKEN_PATTERN.findall(text.casefold()))
+
+
+def card_tokens(full_card) -> set[str]:
+    return tokenize(f"{full_card.question}\n{full_card.answer}")
+
+
+class SearchIndex:
+    """Maps words to card ids, with the vocabulary kept sorted for prefix lookups
+
+    A query matches cards that contain every query word, either as a whole
+    word or as the start of one ("photo" finds "photosynthesis").
+    """
+
+    def __init__(self, full_cards=()):
+        self._postings = {}
+        self._tokens_by_id = {}
+        for full_card in full_cards:
+            card_id = full_card.card_id
+            tokens = card_tokens(full_card)
+            self._tokens_by_id[card_id] = tokens
+            for token in tokens:
+                card_ids = self._postings.get(token)
+                if card_ids is None:
+                    self._postings[token] = {card_id}
+                else:
+                    card_ids.add(card_id)
+        self._vocabulary = sorted(self._postings)
+
+    def __len__(self):
+        return len(self._tokens_by_id)
+
+    def add(self, full_card):
+        card_id = full_card.card_id
+        if card_id in self._tokens_by_id:
+            self.remove(card_id)
+        tokens = card_tokens(full_card)
+        self._tokens_by_id[card_id] = tokens
+        for token in tokens:
+            card_ids = self._postings.get(token)
+            if card_ids is None:
+                card_ids = self._postings[token] = set()
+                insort(self._vocabulary, token)
+            card_ids.add(card_id)
+
+    def remove(self, card_id):
+        tokens = self._tokens_by_id.pop(card_id, None)
+        if tokens is None:
+            return
+        for token in tokens:
+            card_ids = self._postings[token]
+            card_ids.discard(card_id)
+            if not card_ids:
+                del self._postings[token]
+                del self._vocabulary[bisect_left(self._vocabulary, token)]
+
+    def update(self, full_card):
+        """Re-index a card after its question or answer was edited"""
+        self.add(full_card)
+
+    def _matching_ids(self, word) -> set:
+        if len(word) < MIN_PREFIX_LENGTH:
+            return self._postings.get(word, set())
+        vocabulary = self._vocabulary
+        start = bisect_left(vocabulary, word)
+        end = bisect_left(vocabulary, word + _MAX_CHAR, start)
+        if end - start == 1:
+            return self._postings[vocabulary[start]]
+        return set().union(*(self._postings[token] for token in vocabulary[start:end]))
+
+    def search(self, query: str) -> set:
+        """Ids of the cards matching every word of the query, empty for an empty query"""
+        words = sorted(tokenize(query), key=len, reverse=True)
+        result = None
+        # Longest words first, they usually have the fewest matches
+        for word in words:
+            matches = self._matching_ids(word)
+            result = set(matches) if result is None else result & matches
+            if not result:
+                return set()
+        return result or set()
@@ -47,12 +47,12 @@ class SoundManager(QObject):
                     sound_effect.setSource(QUrl.fromLocalFile(os.path.abspath(sound_path)))
                     sound_effect.setVolume(self.volume)
                     self.sounds[sound_name] = sound_effect
-                    logger.debug(f"Loaded sound effect: {sound_name}")
+                    logger.debug("Loaded sound effect: %s", sound_name)
                 else:
-                    logger.warning(f"Sound file not found: {sound_path}")
+                    logger.warning("Sound file not found: %s", sound_path)
                     
             except Exception as e:
-                logger.error(f"Failed to load sound effect {sound_name}: {str(e)}")
+                logger.error("Failed to load sound effect %s: %s", sound_name, e)
     
     def play_sound(self, sound_name):
         """Play a sound effect by name"""
@@ -64,25 +64,25 @@ class SoundManager(QObject):
                 sound_effect = self.sounds[sound_name]
                 if sound_effect.status() == QSoundEffect.Status.Ready:
                     sound_effect.play()
-                    logger.debug(f"Playing sound: {sound_name}")
+                    logger.debug("Playing sound: %s", sound_name)
                 else:
-                    logger.warning(f"Sound not ready: {sound_name}")
+                    logger.warning("Sound not ready: %s", sound_name)
             except Exception as e:
-                logger.error(f"Failed to play sound {sound_name}: {str(e)}")
+                logger.error("Failed to play sound %s: %s", sound_name, e)
         else:
-            logger.warning(f"Sound effect not found: {sound_name}")
+            logger.warning("Sound effect not found: %s", sound_name)
     
     def set_volume(self, volume):
         """Set the volume for all sound effects (0.0 to 1.0)"""
         self.volume = max(0.0, min(1.0, volume))
         for sound_effect in self.sounds.values():
             sound_effect.setVolume(self.volume)
-        logger.info(f"Volume set to: {self.volume}")
+        logger.info("Volume set to: %s", self.volume)
     
     def set_enabled(self, enabled):
         """Enable or disable all sound effects"""
         self.enabled = enabled
-        logger.info(f"Sound effects {'enabled' if enabled else 'disabled'}")
+        logger.info("Sound effects %s", 'enabled' if enabled else 'disabled')
     
     def is_enabled(self):
         """Check if sound effects are enabled"""
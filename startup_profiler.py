@@ -0,0 +1,126 @@
+"""
+Startup profiler for Emphizor
+Times every module imported during startup and how long it takes to reach the sign in dialog
+and the main window. Enabled with EMPHIZOR_PROFILE_STARTUP=1, the report goes to the log
+"""
+
+import builtins
+import os
+import sys
+import threading
+import time
+from logger_config import get_logger
+
+# Set up logger for this module
+logger = get_logger(__name__)
+
+ENV_VARIABLE = "EMPHIZOR_PROFILE_STARTUP"
+
+
+class StartupProfiler:
+    """Records first imports and named milestones, times are seconds since the profiler was created"""
+
+    def __init__(self, clock=time.perf_counter):
+        self._clock = clock
+        self._start = clock()
+        self._original_import = None
+        # (module, depth, seconds including nested imports, seconds excluding them, finished at)
+        self.imports = []
+        self.milestones = []
+        # Time spent in nested imports, one entry per import in progress
+        self._nested = []
+
+    @property
+    def installed(self) -> bool:
+        return self._original_import is not None
+
+    def elapsed(self) -> float:
+        return self._clock() - self._start
+
+    def install(self):
+        """Time import statements from now on, only on the main thread"""
+        if self.installed:
+            return
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def uninstall(self):
+        if not self.installed:
+            return
+        # Another hook installed on top keeps calling ours, which then has to keep working
+        if builtins.__import__ == self._timed_import:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original_import = self._original_import
+        # Modules already loaded cost nothing, relative imports count towards their package
+        if level or name in sys.modules or threading.current_thread() is not threading.main_thread():
+            return original_import(name, globals, locals, fromlist, level)
+        depth = len(self._nested)
+        self._nested.append(0.0)
+        start = self._clock()
+        try:
+            return original_import(name, globals, locals, fromlist, level)
+        finally:
+            end = self._clock()
+            cumulative = end - start
+            nested = self._nested.pop()
+            if self._nested:
+                self._nested[-1] += cumulative
+            self.imports.append((name, depth, cumulative, cumulative - nested, end - self._start))
+
+    def mark(self, label: str):
+        """Record that startup reached a milestone, e.g. the sign in dialog being shown"""
+        self.milestones.append((label, self.elapsed()))
+
+    def report(self, top=10) -> str:
+        """Each milestone with the imports done before it, heaviest first
+
+        Top level imports are the ones made by Emphizor's own modules, their times include
+        everything they import in turn.
+        """
+        lines = ["Startup profile:"]
+        previous = 0.0
+        for label, at in self.milestones:
+            window = [entry for entry in self.imports if previous < entry[4] <= at]
+            top_level = sorted((entry for entry in window if entry[1] == 0), key=lambda entry: -entry[2])
+            import_seconds = sum(entry[2] for entry in top_level)
+            lines.append(f"  {label}: {at * 1000:.0f}ms ({import_seconds * 1000:.0f}ms importing "
+                         f"{len(window)} modules since {previous * 1000:.0f}ms)")
+            for name, _, cumulative, _, _ in top_level[:top]:
+                lines.append(f"    {cumulative * 1000:8.1f}ms  {name}")
+            previous = at
+        heaviest = sorted(self.imports, key=lambda entry: -entry[3])[:top]
+        if heaviest:
+            lines.append("  Heaviest modules by own import time:")
+            for name, _, _, own, _ in heaviest:
+                lines.append(f"    {own * 1000:8.1f}ms  {name}")
+        return "\n".join(lines)
+
+
+_profiler = None
+
+
+def start():
+    """Install the import hook when profiling is enabled, call before importing the GUI"""
+    global _profiler
+    if _profiler is None and os.environ.get(ENV_VARIABLE) == "1":
+        _profiler = StartupProfiler()
+        _profiler.install()
+        logger.info("Startup profiling enabled")
+
+
+def mark(label: str):
+    if _profiler is not None:
+        _profiler.mark(label)
+
+
+def finish():
+    """Stop timing imports and log the report, later calls do nothing"""
+    global _profiler
+    if _profiler is None:
+        return
+    profiler, _profiler = _profiler, None
+    profiler.uninstall()
+    logger.info(profiler.report())
@@ -0,0 +1,58 @@
+"""
+Tag index for Emphizor
+Maps every tag to the ids of the cards carrying it, so tag filters become set operations
+"""
+
+import sys
+
+# Every distinct tag combination is stored once and shared by all the cards that carry it
+_tag_sets = {}
+
+
+def intern_tags(tags) -> frozenset:
+    """The shared frozenset of interned tag strings equal to `tags`"""
+    key = frozenset(tags)
+    shared = _tag_sets.get(key)
+    if shared is None:
+        shared = frozenset(sys.intern(tag) for tag in key)
+        _tag_sets[shared] = shared
+    return shared
+
+
+class TagIndex:
+    """Inverted index from tag to card ids"""
+
+    def __init__(self, full_cards=()):
+        self._card_ids = {}
+        for full_card in full_cards:
+            self.add(full_card.card_id, full_card.tags)
+
+    def add(self, card_id, tags):
+        for tag in tags:
+            self._card_ids.setdefault(tag, set()).add(card_id)
+
+    def remove(self, card_id, tags):
+        for tag in tags:
+            card_ids = self._card_ids.get(tag)
+            if card_ids is None:
+                continue
+            card_ids.discard(card_id)
+            if not card_ids:
+                del self._card_ids[tag]
+
+    def tags(self) -> list[str]:
+        return sorted(self._card_ids)
+
+    def count(self, tag) -> int:
+        return len(self._card_ids.get(tag, ()))
+
+    def card_ids(self, tag) -> set:
+        return self._card_ids.get(tag, set())
+
+    def card_ids_with_any(self, tags) -> set:
+        """Ids of cards that carry at least one of the given tags"""
+        return set().union(*(self._card_ids[tag] for tag in tags if tag in self._card_ids))
+
+    def covered_by(self, selected_tags) -> bool:
+        """True when every tag in the deck is selected, so no card is filtered out"""
+        return all(tag in selected_tags for tag in self._card_ids)
@@ -9,6 +9,9 @@ import sys
 import os
 import tempfile
 import json
+import itertools
+import importlib.util
+import time
 from datetime import datetime, timedelta
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -26,7 +29,10 @@ sys.modules['cryptography.hazmat.primitives.kdf.pbkdf2'] = Mock()
 # Create improved mock classes that match the real interface
 class MockCard:
     """Mock Card class that matches the fsrs Card interface"""
-    def __init__(self, state="new", elapsed_days=0, difficulty=0.0, stability=0.0, retrievability=0.0, reps=0, lapses=0):
+    _ids = itertools.count(1)
+    
+    def __init__(self, state="new", elapsed_days=0, difficulty=0.0, stability=0.0, retrievability=0.0, reps=0, lapses=0, card_id=None):
+        self.card_id = card_id if card_id is not None else next(MockCard._ids)
         self.state = state
         self.elapsed_days = elapsed_days
         self.difficulty = difficulty
@@ -39,6 +45,7 @@ class MockCard:
     
     def to_dict(self):
         return {
+            "card_id": self.card_id,
             "state": self.state,
             "elapsed_days": self.elapsed_days,
             "difficulty": self.difficulty,
@@ -52,7 +59,7 @@ class MockCard:
     
     @classmethod
     def from_dict(cls, data):
-        card = cls()
+        card = cls(card_id=data.get("card_id"))
         card.state = data.get("state", "new")
         card.elapsed_days = data.get("elapsed_days", 0)
         card.difficulty = data.get("difficulty", 0)
@@ -94,16 +101,22 @@ class MockScheduler:
 
 class MockReviewLog:
     """Mock ReviewLog class that matches the fsrs ReviewLog interface"""
-    def __init__(self, rating=3, elapsed_days=0, review_time=None):
+    def __init__(self, rating=3, elapsed_days=0, review_time=None, card_id=1, review_duration=None):
         self.rating = rating
         self.elapsed_days = elapsed_days
         self.review_time = review_time or datetime.now()
+        self.card_id = card_id
+        self.review_duration = review_duration
     
     def to_dict(self):
+        review_time = self.review_time.isoformat() if isinstance(self.review_time, datetime) else self.review_time
         return {
+            "card_id": self.card_id,
             "rating": self.rating,
             "elapsed_days": self.elapsed_days,
-            "review_time": self.review_time.isoformat() if isinstance(self.review_time, datetime) else self.review_time
+            "review_time": review_time,
+            "review_datetime": review_time,
+            "review_duration": self.review_duration
         }
     
     @classmethod
@@ -111,8 +124,11 @@ class MockReviewLog:
         review_log = cls()
         review_log.rating = data.get("rating", 3)
         review_log.elapsed_days = data.get("elapsed_days", 0)
-        if "review_time" in data:
-            review_log.review_time = datetime.fromisoformat(data["review_time"]) if isinstance(data["review_time"], str) else data["review_time"]
+        review_log.card_id = data.get("card_id", 1)
+        review_log.review_duration = data.get("review_duration")
+        review_time = data.get("review_time", data.get("review_datetime"))
+        if review_time is not None:
+            review_log.review_time = datetime.fromisoformat(review_time) if isinstance(review_time, str) else review_time
         return review_log
 
 # Set up mocks
@@ -125,7 +141,13 @@ mock_supabase = Mock()
 sys.modules['supabase'].create_client = Mock(return_value=mock_supabase)
 
 # Now import our modules
-from base_classes import User, FullCard
+from base_classes import User, FullCard, SignInRequiredError
+from local_cache import LocalDeckCache
+from search_index import tokenize
+from answer_cache import AnswerCache
+from async_runner import AsyncRunner
+from review_history import ReviewHistory
+from review_journal import ReviewJournal
 
 class TestUserClass(unittest.TestCase):
     """Comprehensive tests for User class"""
@@ -211,7 +233,7 @@ class TestFullCardClass(unittest.TestCase):
         
         full_card = FullCard(card, "Python question", "Python answer", set(tags_list))
         
-        self.assertIsInstance(full_card.tags, set)
+        self.assertIsInstance(full_card.tags, frozenset)
         self.assertEqual(full_card.tags, {"python", "programming", "coding"})
         print("✓ Tags conversion to set test passed")
     
@@ -435,6 +457,1549 @@ class TestEdgeCases(unittest.TestCase):
         print("✓ Many tags test passed")
 
 
+class TestChangeTracker(unittest.TestCase):
+    """Tests for change tracking used by incremental saves"""
+    
+    def setUp(self):
+        self.scheduler = MockScheduler()
+        self.user = User("Tracker User", "tracker@example.com", [], [], self.scheduler)
+        
+    def test_new_user_has_no_changes(self):
+        """Test that a freshly loaded user has nothing to save"""
+        self.assertFalse(self.user.changes.has_changes())
+        self.assertTrue(self.user.changes.take().is_empty())
+        print("✓ No changes on new user test passed")
+    
+    def test_add_review_delete_are_tracked(self):
+        """Test that card mutations through User are recorded"""
+        full_card = FullCard(MockCard(), "Q", "A", {"tag"})
+        self.user.add_card(full_card)
+        self.user.record_review(full_card, MockCard(card_id=full_card.card_id), MockReviewLog(rating=3))
+        
+        changes = self.user.changes.take()
+        self.assertEqual(changes.added, {full_card.card_id})
+        self.assertEqual(changes.reviewed, {full_card.card_id})
+        self.assertEqual(len(changes.review_logs), 1)
+        self.assertEqual(changes.dirty_card_ids, {full_card.card_id})
+        self.assertFalse(self.user.changes.has_changes())
+        print("✓ Card mutation tracking test passed")
+    
+    def test_delete_card_range(self):
+        """Test that deleting a block of cards updates the deck, indexes and tracker"""
+        cards = [FullCard(MockCard(), f"Q{i}", f"A{i}", {f"tag{i}"}) for i in range(5)]
+        user = User("Range User", "range@example.com", list(cards), [], self.scheduler)
+        user.delete_card_range(1, 3)
+        
+        self.assertEqual([card.question for card in user.full_cards], ["Q0", "Q4"])
+        self.assertEqual(user.all_tags(), ["tag0", "tag4"])
+        self.assertEqual(len(user.due_index), 2)
+        self.assertNotIn(cards[2].card_id, user.cards_by_id)
+        self.assertEqual(user.changes.take().deleted, {card.card_id for card in cards[1:4]})
+        print("✓ Delete card range test passed")
+    
+    def test_delete_cards_by_id(self):
+        """Test that deleting scattered cards by id updates the deck, indexes and tracker"""
+        cards = [FullCard(MockCard(), f"Q{i}", f"A{i}", {f"tag{i}"}) for i in range(5)]
+        user = User("Bulk User", "bulk@example.com", list(cards), [], self.scheduler)
+        user.delete_cards([cards[0].card_id, cards[3].card_id])
+        
+        self.assertEqual([card.question for card in user.full_cards], ["Q1", "Q2", "Q4"])
+        self.assertEqual(user.all_tags(), ["tag1", "tag2", "tag4"])
+        self.assertEqual(len(user.due_index), 3)
+        self.assertNotIn(cards[3].card_id, user.cards_by_id)
+        self.assertEqual(user.changes.take().deleted, {cards[0].card_id, cards[3].card_id})
+        print("✓ Delete cards by id test passed")
+    
+    def test_deleting_unsaved_card_cancels_out(self):
+        """Test that adding then deleting an unsaved card leaves nothing to upload"""
+        full_card = FullCard(MockCard(), "Q", "A", set())
+        self.user.add_card(full_card)
+        self.user.delete_card(full_card)
+        
+        self.assertTrue(self.user.changes.take().is_empty())
+        self.assertEqual(self.user.full_cards, [])
+        print("✓ Unsaved card delete test passed")
+    
+    def test_remove_tags_marks_only_affected_cards(self):
+        """Test that removing tags only marks cards that carried them as edited"""
+        tagged = FullCard(MockCard(), "Q1", "A1", {"old", "keep"})
+        untagged = FullCard(MockCard(), "Q2", "A2", {"keep"})
+        user = User("U", "u@example.com", [tagged, untagged], [], self.scheduler)
+        
+        user.remove_tags({"old"})
+        
+        self.assertEqual(tagged.tags, {"keep"})
+        self.assertEqual(user.changes.take().edited, {tagged.card_id})
+        print("✓ Tag removal tracking test passed")
+    
+    def test_restore_after_failed_save(self):
+        """Test that restored changes are merged with newer ones"""
+        first = FullCard(MockCard(), "Q1", "A1", set())
+        second = FullCard(MockCard(), "Q2", "A2", set())
+        self.user.add_card(first)
+        failed = self.user.changes.take()
+        self.user.add_card(second)
+        
+        self.user.changes.restore(failed)
+        
+        self.assertEqual(self.user.changes.take().added, {first.card_id, second.card_id})
+        print("✓ Restore after failed save test passed")
+
+
+class TestIncrementalSave(unittest.TestCase):
+    """Tests for App.save_user uploading only what changed"""
+    
+    def setUp(self):
+        from base_classes import App
+        from card_storage import NormalizedStorage
+        self.app = App()
+        self.app.supabase = MagicMock()
+        self.app.storage = NormalizedStorage(self.app.supabase)
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.app.local_cache = LocalDeckCache(self.cache_dir.name)
+        self.app.user = User("Save User", "save@example.com", [], [], MockScheduler())
+        
+    def tearDown(self):
+        self.app.local_cache.close()
+        self.cache_dir.cleanup()
+    
+    def test_save_without_changes_skips_upload(self):
+        """Test that nothing is sent when there are no changes"""
+        self.app.save_user()
+        self.app.supabase.table.assert_not_called()
+        print("✓ Skip empty save test passed")
+    
+    def test_save_sends_only_changed_cards(self):
+        """Test that adding a card upserts just that card row"""
+        old_card = FullCard(MockCard(), "Old", "Old", set())
+        self.app.user.full_cards.append(old_card)
+        new_card = FullCard(MockCard(), "Q", "A", set())
+        self.app.user.add_card(new_card)
+        self.app.save_user()
+        
+        table = self.app.supabase.table
+        rows = table.return_value.upsert.call_args[0][0]
+        self.assertEqual([row["card_id"] for row in rows], [new_card.card_id])
+        table.return_value.update.assert_not_called()
+        table.return_value.insert.assert_not_called()
+        self.assertFalse(self.app.user.changes.has_changes())
+        print("✓ Changed cards only test passed")
+    
+    def test_failed_save_keeps_changes(self):
+        """Test that changes survive a failed upload"""
+        self.app.user.add_card(FullCard(MockCard(), "Q", "A", set()))
+        self.app.supabase.table.return_value.upsert.return_value.execute.side_effect = Exception("offline")
+        
+        with self.assertRaises(Exception):
+            self.app.save_user()
+        self.assertTrue(self.app.user.changes.has_changes())
+        print("✓ Failed save keeps changes test passed")
+
+
+class TestNormalizedStorage(unittest.TestCase):
+    """Tests for per-card storage and the blob migration"""
+    
+    def make_tables(self, users_rows, card_rows=(), log_rows=()):
+        """Return a supabase mock whose tables answer selects with the given rows"""
+        tables = {name: MagicMock(name=name) for name in ("users", "cards", "review_logs")}
+        tables["users"].select.return_value.eq.return_value.execute.return_value.data = list(users_rows)
+        for name, rows in (("cards", card_rows), ("review_logs", log_rows)):
+            query = tables[name].select.return_value.eq.return_value.order.return_value.range.return_value
+            query.execute.return_value.data = list(rows)
+        supabase = MagicMock()
+        supabase.table.side_effect = lambda name: tables[name]
+        return supabase, tables
+    
+    def make_app(self, supabase):
+        from base_classes import App
+        from card_storage import NormalizedStorage
+        app = App()
+        app.supabase = supabase
+        app.storage = NormalizedStorage(supabase)
+        return app
+    
+    def test_card_row_matches_full_card_dict(self):
+        """Test that table rows keep the FullCard.to_dict keys"""
+        from card_storage import card_row
+        full_card = FullCard(MockCard(card_id=42), "Q", "A", {"b", "a"})
+        row = card_row(7, full_card.to_dict())
+        
+        self.assertEqual(row["user_id"], 7)
+        self.assertEqual(row["card_id"], 42)
+        self.assertEqual(row["tags"], ["a", "b"])
+        self.assertEqual(row["question"], "Q")
+        print("✓ Card row conversion test passed")
+    
+    def test_review_log_row_finds_card_id(self):
+        """Test card id lookup for both review log formats"""
+        from card_storage import review_log_row
+        self.assertEqual(review_log_row(1, {"card_id": 5, "rating": 3})["card_id"], 5)
+        self.assertEqual(review_log_row(1, {"card": {"card_id": 6}, "rating": 3})["card_id"], 6)
+        print("✓ Review log row conversion test passed")
+    
+    def test_load_normalized_user(self):
+        """Test that a migrated user is read from the card tables"""
+        card = FullCard(MockCard(card_id=3), "Q", "A", {"t"}).to_dict()
+        supabase, tables = self.make_tables(
+            [{"id": 9, "name": "N", "email": "n@example.com", "scheduler": {}, "storage_version": 2}],
+            card_rows=[card],
+            log_rows=[{"id": 1, "log": MockReviewLog(rating=4).to_dict()}],
+        )
+        user = self.make_app(supabase)._get_user_from_db("n@example.com")
+        
+        self.assertEqual(user.id, 9)
+        self.assertEqual([c.card_id for c in user.full_cards], [3])
+        tables["review_logs"].select.assert_not_called()
+        self.assertEqual(user.review_logs.load_all()[0].rating, 4)
+        tables["users"].update.assert_not_called()
+        print("✓ Load normalized user test passed")
+    
+    def test_blob_user_is_migrated_once(self):
+        """Test that a blob layout user is copied into the tables and the blob cleared"""
+        card = FullCard(MockCard(card_id=8), "Q", "A", set()).to_dict()
+        log = MockReviewLog(rating=2).to_dict()
+        supabase, tables = self.make_tables(
+            [{"id": 4, "name": "B", "email": "b@example.com", "scheduler": {}, "storage_version": 1,
+              "full_cards": [card], "review_logs": [log]}],
+        )
+        user = self.make_app(supabase)._get_user_from_db("b@example.com")
+        
+        self.assertEqual(len(user.full_cards), 1)
+        upserted = tables["cards"].upsert.call_args[0][0]
+        self.assertEqual(upserted[0]["card_id"], 8)
+        inserted = tables["review_logs"].insert.call_args[0][0]
+        self.assertEqual(inserted[0]["log"], log)
+        update = tables["users"].update.call_args[0][0]
+        self.assertEqual(update, {"full_cards": [], "review_logs": [], "storage_version": 2})
+        print("✓ Blob migration test passed")
+    
+    def test_save_changes_deletes_and_appends(self):
+        """Test that deletions and new review logs are sent as row operations"""
+        from card_storage import NormalizedStorage
+        supabase = MagicMock()
+        storage = NormalizedStorage(supabase)
+        kept = FullCard(MockCard(), "Q", "A", set())
+        gone = FullCard(MockCard(), "Q2", "A2", set())
+        user = User("S", "s@example.com", [kept, gone], [], MockScheduler())
+        user.delete_card(gone)
+        user.record_review(kept, kept.card, MockReviewLog(rating=3))
+        
+        storage.save_changes(user, user.changes.take())
+        
+        table = supabase.table.return_value
+        self.assertEqual([r["card_id"] for r in table.upsert.call_args[0][0]], [kept.card_id])
+        table.delete.return_value.eq.return_value.in_.assert_called_once_with("card_id", [gone.card_id])
+        self.assertEqual(len(table.insert.call_args[0][0]), 1)
+        print("✓ Save changes row operations test passed")
+
+
+class TestLocalDeckCache(unittest.TestCase):
+    """Tests for the local SQLite deck cache and offline changes"""
+    
+    def setUp(self):
+        from base_classes import App
+        from card_storage import NormalizedStorage
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.app = App()
+        self.app.supabase = MagicMock()
+        self.app.storage = NormalizedStorage(self.app.supabase)
+        self.app.local_cache = LocalDeckCache(self.cache_dir.name)
+        self.card = FullCard(MockCard(card_id=10), "Cached Q", "Cached A", {"cache"})
+        self.user = User("Cache User", "cache@example.com", [self.card], [], MockScheduler())
+        self.user.id = 5
+        self.app.local_cache.store_user(self.user)
+        
+    def tearDown(self):
+        self.app.local_cache.close()
+        self.cache_dir.cleanup()
+    
+    def test_snapshot_round_trip(self):
+        """Test that a stored user opens from the cache without the server"""
+        user = self.app.load_cached_user("cache@example.com")
+        
+        self.assertEqual(user.id, 5)
+        self.assertEqual(user.name, "Cache User")
+        self.assertEqual(user.full_cards[0].question, "Cached Q")
+        self.assertEqual(user.full_cards[0].tags, {"cache"})
+        self.assertFalse(user.changes.has_changes())
+        self.app.supabase.table.assert_not_called()
+        print("✓ Cache round trip test passed")
+    
+    def test_unknown_user_is_not_cached(self):
+        """Test that an unknown email gives no cached user"""
+        self.assertIsNone(self.app.load_cached_user("nobody@example.com"))
+        print("✓ Unknown cached user test passed")
+    
+    def test_offline_changes_survive_restart(self):
+        """Test that changes from a failed save are uploaded after the next start"""
+        self.app.user = self.user
+        new_card = FullCard(MockCard(card_id=11), "Offline Q", "Offline A", set())
+        self.user.add_card(new_card)
+        self.app.supabase.table.return_value.upsert.return_value.execute.side_effect = Exception("offline")
+        with self.assertRaises(Exception):
+            self.app.save_user()
+        
+        restarted = self.app.load_cached_user("cache@example.com")
+        
+        self.assertEqual([c.card_id for c in restarted.full_cards], [10, 11])
+        self.assertEqual(restarted.changes.snapshot().added, {11})
+        print("✓ Offline changes persistence test passed")
+    
+    def test_successful_save_clears_pending(self):
+        """Test that uploaded changes are no longer pending in the cache"""
+        self.app.user = self.user
+        self.user.add_card(FullCard(MockCard(card_id=12), "Q", "A", set()))
+        self.app.save_user()
+        
+        restarted = self.app.load_cached_user("cache@example.com")
+        
+        self.assertEqual(len(restarted.full_cards), 2)
+        self.assertFalse(restarted.changes.has_changes())
+        print("✓ Pending cleared after save test passed")
+    
+    def test_reconcile_keeps_unsynced_local_edits(self):
+        """Test merging a server copy into a cached deck with local edits"""
+        local = self.app.load_cached_user("cache@example.com")
+        local_only = FullCard(MockCard(card_id=20), "Local", "Local", set())
+        local.add_card(local_only)
+        server_card = FullCard(MockCard(card_id=10), "Edited elsewhere", "A", set())
+        server_new = FullCard(MockCard(card_id=30), "Server new", "A", set())
+        server_user = User("Cache User", "cache@example.com", [server_card, server_new], [], MockScheduler())
+        server_user.id = 5
+        
+        self.app.reconcile(server_user)
+        
+        by_id = {card.card_id: card for card in local.full_cards}
+        self.assertEqual(set(by_id), {10, 20, 30})
+        self.assertEqual(by_id[10].question, "Edited elsewhere")
+        self.assertEqual(local.changes.snapshot().added, {20})
+        print("✓ Reconcile test passed")
+    
+    def test_sign_in_keeps_offline_changes(self):
+        """Test that a password sign in does not drop changes cached by an earlier session"""
+        self.app.user = self.app.load_cached_user("cache@example.com")
+        self.app.user.add_card(FullCard(MockCard(card_id=11), "Offline Q", "Offline A", set()))
+        self.app.user.record_review(self.app.user.full_cards[0], MockCard(card_id=10), MockReviewLog(card_id=10))
+        self.app.supabase.table.return_value.upsert.return_value.execute.side_effect = Exception("offline")
+        with self.assertRaises(Exception):
+            self.app.save_user()
+        
+        server_user = User("Cache User", "cache@example.com",
+                           [FullCard(MockCard(card_id=10), "Cached Q", "Cached A", {"cache"})], [], MockScheduler())
+        server_user.id = 5
+        signed_in = self.app._keep_cached_changes(server_user)
+        self.assertIs(self.app.user, signed_in)
+        self.app._store_in_cache(signed_in)
+        restarted = self.app.load_cached_user("cache@example.com")
+        
+        self.assertEqual({card.card_id for card in signed_in.full_cards}, {10, 11})
+        self.assertEqual({card.card_id for card in restarted.full_cards}, {10, 11})
+        pending = restarted.changes.snapshot()
+        self.assertEqual(pending.added, {11})
+        self.assertEqual(pending.reviewed, {10})
+        self.assertEqual(len(pending.review_logs), 1)
+        print("✓ Offline changes kept on sign in test passed")
+    
+    def test_reconcile_keeps_changes_of_running_save(self):
+        """Test that a card taken by a save still in flight is not removed by a reconcile"""
+        local = self.app.load_cached_user("cache@example.com")
+        local.add_card(FullCard(MockCard(card_id=21), "Saving", "Saving", set()))
+        # What a save does before it uploads
+        in_flight = local.changes.take()
+        self.app.local_cache.store_changes(local, in_flight)
+        server_user = User("Cache User", "cache@example.com",
+                           [FullCard(MockCard(card_id=10), "Cached Q", "Cached A", {"cache"})], [], MockScheduler())
+        server_user.id = 5
+        
+        self.app.reconcile(server_user)
+        local.changes.restore(in_flight)
+        restarted = self.app.load_cached_user("cache@example.com")
+        
+        self.assertIn(21, local.cards_by_id)
+        self.assertEqual(local.changes.snapshot().added, {21})
+        self.assertEqual({card.card_id for card in restarted.full_cards}, {10, 21})
+        print("✓ Reconcile with save in flight test passed")
+    
+    def test_reconcile_resets_live_card_list(self):
+        """Test that a reconcile while the library is open leaves its rows matching the deck"""
+        local = self.app.load_cached_user("cache@example.com")
+        for card_id in (11, 12, 13):
+            local.add_card(FullCard(MockCard(card_id=card_id), f"Q{card_id}", "A", set()))
+        local.changes.saved(local.changes.take())
+        notified = []
+        local.deck_listeners.append(lambda: notified.append(True))
+        server_user = User("Cache User", "cache@example.com",
+                           [FullCard(MockCard(card_id=card_id), f"Q{card_id}", "A", set()) for card_id in (10, 13)],
+                           [], MockScheduler())
+        if importlib.util.find_spec("PySide6") is None:
+            self.app.reconcile(server_user)
+            self.assertEqual(notified, [True])
+            print("✓ Reconcile notifies deck listeners test passed")
+            return
+        from ViewCardsDialog import CardListModel
+        model = CardListModel(local)
+        model.set_filter([local.cards_by_id[12], local.cards_by_id[13]])
+        
+        self.app.reconcile(server_user)
+        self.assertEqual(notified, [True])
+        self.assertEqual(model.rowCount(), 1)
+        self.assertEqual(model.data(model.index(0)), "Q13")
+        model.remove_rows([0])
+        self.assertEqual([card.card_id for card in local.full_cards], [10])
+        print("✓ Reconcile with live card list test passed")
+
+
+@unittest.skipUnless(importlib.util.find_spec("PySide6"), "PySide6 not installed")
+class TestSaveWorker(unittest.TestCase):
+    """Tests for the background save queue"""
+    
+    def make_worker(self, app):
+        from save_queue import SaveWorker
+        return SaveWorker(app, max_attempts=2, base_delay=0.0)
+    
+    def test_repeated_requests_are_merged(self):
+        """Test that several queued requests cause a single save"""
+        app = Mock()
+        worker = self.make_worker(app)
+        for _ in range(5):
+            worker.request_save()
+        worker._stopping = True
+        worker.run()
+        
+        app.save_user.assert_called_once()
+        print("✓ Merged save requests test passed")
+    
+    def test_backoff_delay_is_capped(self):
+        """Test exponential backoff with an upper bound"""
+        from save_queue import SaveWorker
+        worker = SaveWorker(Mock(), base_delay=1.0, max_delay=10.0)
+        
+        self.assertEqual([worker._backoff_delay(n) for n in (1, 2, 3, 4, 5)], [1.0, 2.0, 4.0, 8.0, 10.0])
+        print("✓ Backoff delay test passed")
+
+
+class TestDueIndex(unittest.TestCase):
+    """Tests for the due card index"""
+    
+    def setUp(self):
+        self.now = datetime(2025, 1, 10, 12, 0)
+        self.cards = []
+        for days in (-3, -1, 0, 2, 5):
+            card = MockCard()
+            card.due = self.now + timedelta(days=days)
+            self.cards.append(FullCard(card, f"Q{days}", "A", set()))
+        self.user = User("Due User", "due@example.com", list(self.cards), [], MockScheduler())
+    
+    def test_count_and_order(self):
+        """Test that due cards are counted and listed most overdue first"""
+        index = self.user.due_index
+        
+        self.assertEqual(index.count_due(self.now), 3)
+        self.assertEqual([c.question for c in index.due_cards(self.now)], ["Q-3", "Q-1", "Q0"])
+        print("✓ Due count and order test passed")
+    
+    def test_review_moves_card_out_of_due(self):
+        """Test that a reviewed card is re-sorted by its new due time"""
+        reviewed = MockCard(card_id=self.cards[0].card_id)
+        reviewed.due = self.now + timedelta(days=10)
+        self.user.record_review(self.cards[0], reviewed, MockReviewLog())
+        
+        self.assertEqual(self.user.due_index.count_due(self.now), 2)
+        self.assertEqual(self.user.due_index.count_due(self.now + timedelta(days=10)), 5)
+        print("✓ Review re-sort test passed")
+    
+    def test_add_and_delete_update_index(self):
+        """Test that added and deleted cards are reflected in due queries"""
+        new_card = MockCard()
+        new_card.due = self.now - timedelta(days=7)
+        added = FullCard(new_card, "New", "A", set())
+        self.user.add_card(added)
+        self.user.delete_card(self.cards[1])
+        
+        self.assertEqual([c.question for c in self.user.due_index.due_cards(self.now)], ["New", "Q-3", "Q0"])
+        print("✓ Add and delete index test passed")
+    
+    def test_due_cards_respects_selected_tags(self):
+        """Test the tag subset filter on due cards"""
+        self.cards[0].tags = {"math"}
+        self.cards[1].tags = {"math", "hard"}
+        self.user.rebuild_indexes()
+        
+        due = self.user.due_cards(self.now, {"math"})
+        
+        self.assertEqual([c.question for c in due], ["Q-3", "Q0"])
+        self.assertEqual(self.user.count_due(self.now, {"math", "hard"}), 3)
+        print("✓ Due cards tag filter test passed")
+    
+    def test_assigning_full_cards_rebuilds_index(self):
+        """Test that replacing the card list keeps the index in sync"""
+        self.user.full_cards = self.cards[3:]
+        
+        self.assertEqual(len(self.user.due_index), 2)
+        self.assertEqual(self.user.count_due(self.now, set()), 0)
+        print("✓ Index rebuild test passed")
+
+
+class TestTagIndex(unittest.TestCase):
+    """Tests for the tag to card id index"""
+    
+    def setUp(self):
+        self.math = FullCard(MockCard(), "Q1", "A1", {"math"})
+        self.both = FullCard(MockCard(), "Q2", "A2", {"math", "physics"})
+        self.untagged = FullCard(MockCard(), "Q3", "A3", set())
+        self.user = User("Tag User", "tag@example.com", [self.math, self.both, self.untagged], [], MockScheduler())
+    
+    def test_tags_and_counts(self):
+        """Test tag listing and per-tag counts"""
+        index = self.user.tag_index
+        
+        self.assertEqual(self.user.all_tags(), ["math", "physics"])
+        self.assertEqual(index.count("math"), 2)
+        self.assertEqual(index.count("missing"), 0)
+        print("✓ Tag listing and counts test passed")
+    
+    def test_due_cards_match_subset_filter(self):
+        """Test that due cards and counts agree with the `tags <= selected` rule"""
+        now = datetime.now() + timedelta(days=1)
+        for selected in (set(), {"math"}, {"physics"}, {"math", "physics"}):
+            expected = [c for c in self.user.full_cards if c.tags <= selected]
+            self.assertEqual(self.user.due_cards(now, selected), expected)
+            self.assertEqual(self.user.count_due(now, selected), len(expected))
+        self.assertTrue(self.user.tag_index.covered_by({"math", "physics"}))
+        self.assertFalse(self.user.tag_index.covered_by({"math"}))
+        print("✓ Subset filter equivalence test passed")
+    
+    def test_remove_tags_updates_index_and_cards(self):
+        """Test deleting a tag from the deck"""
+        self.user.remove_tags({"math"})
+        
+        self.assertEqual(self.math.tags, set())
+        self.assertEqual(self.both.tags, {"physics"})
+        self.assertEqual(self.user.all_tags(), ["physics"])
+        self.assertEqual(self.user.changes.take().edited, {self.math.card_id, self.both.card_id})
+        print("✓ Remove tags index test passed")
+    
+    def test_add_and_delete_card(self):
+        """Test that new and deleted cards keep the index current"""
+        chem = FullCard(MockCard(), "Q4", "A4", {"chemistry"})
+        self.user.add_card(chem)
+        self.user.delete_card(self.both)
+        
+        self.assertEqual(self.user.all_tags(), ["chemistry", "math"])
+        self.assertEqual(self.user.tag_index.card_ids("math"), {self.math.card_id})
+        print("✓ Tag index add and delete test passed")
+
+
+class TestSearchIndex(unittest.TestCase):
+    """Tests for full-text search over questions and answers"""
+    
+    def setUp(self):
+        self.scheduler = MockScheduler()
+        self.photo = FullCard(MockCard(), "What is photosynthesis?", "Plants turning light into sugar", {"biology"})
+        self.light = FullCard(MockCard(), "Speed of light?", "About 300,000 km per second", {"physics"})
+        self.cell = FullCard(MockCard(), "What is a cell?", "The basic unit of life", {"biology"})
+        self.user = User("Search User", "search@example.com",
+                         [self.photo, self.light, self.cell], [], self.scheduler)
+    
+    def test_tokenize(self):
+        """Test that tokenizing lowercases and drops punctuation"""
+        self.assertEqual(tokenize("What is DNA?"), {"what", "is", "dna"})
+        print("✓ Tokenize test passed")
+    
+    def test_search_matches_all_words_and_prefixes(self):
+        """Test whole word, prefix and multi-word queries"""
+        self.assertEqual(self.user.search_cards("light"), [self.photo, self.light])
+        self.assertEqual(self.user.search_cards("PHOTO"), [self.photo])
+        self.assertEqual(self.user.search_cards("what light"), [self.photo])
+        self.assertEqual(self.user.search_cards("missing"), [])
+        self.assertEqual(self.user.search_cards("  "), [])
+        print("✓ Search matching test passed")
+    
+    def test_single_letter_matches_whole_words_only(self):
+        """Test that a one letter query is not used as a prefix"""
+        self.assertEqual(self.user.search_cards("a"), [self.cell])
+        print("✓ Single letter search test passed")
+    
+    def test_index_follows_add_and_delete(self):
+        """Test that added and deleted cards are reflected in search results"""
+        dna = FullCard(MockCard(), "What does DNA stand for?", "Deoxyribonucleic acid", set())
+        self.user.add_card(dna)
+        self.user.delete_card(self.cell)
+        
+        self.assertEqual(self.user.search_cards("what"), [self.photo, dna])
+        self.assertEqual(self.user.search_cards("cell"), [])
+        self.assertEqual(self.user.search_cards("deoxy"), [dna])
+        print("✓ Search index add and delete test passed")
+
+
+@unittest.skipUnless(importlib.util.find_spec("PySide6"), "PySide6 not installed")
+class TestCardListModel(unittest.TestCase):
+    """Tests for the library's card list model"""
+    
+    def setUp(self):
+        self.cards = [FullCard(MockCard(), f"Q{i}", f"A{i}", set()) for i in range(6)]
+        self.user = User("List User", "list@example.com", list(self.cards), [], MockScheduler())
+    
+    def make_model(self):
+        from ViewCardsDialog import CardListModel
+        return CardListModel(self.user)
+    
+    def test_scattered_filtered_rows_delete_in_one_pass(self):
+        """Test that removing several blocks from a search result rebuilds the deck once"""
+        model = self.make_model()
+        model.set_filter(self.cards[1:])
+        with patch.object(self.user, "delete_cards", wraps=self.user.delete_cards) as delete_cards:
+            model.remove_rows([0, 2, 4])
+        
+        delete_cards.assert_called_once()
+        self.assertEqual([card.question for card in self.user.full_cards], ["Q0", "Q2", "Q4"])
+        self.assertEqual([card.question for card in model.filtered_cards], ["Q2", "Q4"])
+        print("✓ Filtered bulk delete test passed")
+    
+    def test_contiguous_ranges(self):
+        """Test grouping of unsorted and repeated rows into blocks, last block first"""
+        from ViewCardsDialog import contiguous_ranges
+        
+        self.assertEqual(contiguous_ranges([]), [])
+        self.assertEqual(contiguous_ranges([3]), [(3, 3)])
+        self.assertEqual(contiguous_ranges([5, 1, 2, 7, 6]), [(5, 7), (1, 2)])
+        self.assertEqual(contiguous_ranges([2, 2, 3, 3]), [(2, 3)])
+        print("✓ Contiguous ranges test passed")
+    
+    def test_rows_and_data_follow_filter(self):
+        """Test row count and cell data for the whole deck and for a search result"""
+        model = self.make_model()
+        self.assertEqual(model.rowCount(), 6)
+        self.assertEqual(model.data(model.index(5)), "Q5")
+        
+        model.set_filter([self.cards[4], self.cards[1]])
+        self.assertEqual(model.rowCount(), 2)
+        self.assertEqual(model.data(model.index(0)), "Q4")
+        self.assertIs(model.data(model.index(1), model.CardRole), self.cards[1])
+        from PySide6.QtCore import Qt
+        self.assertIn("Answer: A1", model.data(model.index(1), Qt.ItemDataRole.ToolTipRole))
+        self.assertIsNone(model.data(model.index(2)))
+        print("✓ Card list model filter test passed")
+    
+    def test_remove_rows_on_filtered_view(self):
+        """Test that removing search rows deletes those cards and keeps the rest listed"""
+        model = self.make_model()
+        model.set_filter([self.cards[5], self.cards[2], self.cards[0]])
+        model.remove_rows([2, 0])
+        
+        self.assertEqual(model.rowCount(), 1)
+        self.assertEqual(model.data(model.index(0)), "Q2")
+        self.assertEqual([card.question for card in self.user.full_cards], ["Q1", "Q2", "Q3", "Q4"])
+        self.assertEqual(self.user.changes.take().deleted, {self.cards[0].card_id, self.cards[5].card_id})
+        
+        model.set_filter(None)
+        model.remove_rows([0, 3])
+        self.assertEqual([card.question for card in self.user.full_cards], ["Q2", "Q3"])
+        print("✓ Filtered row removal test passed")
+    
+    def test_delegate_requests_delete_for_button_click(self):
+        """Test that a click on a row's delete button asks to delete that row only"""
+        from PySide6.QtCore import QEvent, QPointF, QRect, Qt
+        from PySide6.QtGui import QMouseEvent
+        from PySide6.QtWidgets import QStyleOptionViewItem
+        from ViewCardsDialog import CardDelegate
+        from ColorProfile import ColorProfile
+        model = self.make_model()
+        delegate = CardDelegate(ColorProfile())
+        option = QStyleOptionViewItem()
+        option.rect = QRect(0, 0, 600, CardDelegate.ROW_HEIGHT)
+        requested = []
+        delegate.delete_requested.connect(requested.append)
+        
+        def release_at(point):
+            return QMouseEvent(QEvent.Type.MouseButtonRelease, QPointF(point), QPointF(point),
+                               Qt.MouseButton.LeftButton, Qt.MouseButton.NoButton, Qt.KeyboardModifier.NoModifier)
+        self.assertTrue(delegate.editorEvent(release_at(delegate._delete_rect(option.rect).center()),
+                                             model, option, model.index(3)))
+        delegate.editorEvent(release_at(option.rect.center()), model, option, model.index(3))
+        
+        self.assertEqual(requested, [3])
+        self.assertEqual(delegate.sizeHint(option, model.index(0)).height(), CardDelegate.ROW_HEIGHT)
+        print("✓ Card delegate delete button test passed")
+
+
+@unittest.skipUnless(importlib.util.find_spec("requests") and importlib.util.find_spec("dotenv"),
+                     "requests or python-dotenv not installed")
+class TestHttpClient(unittest.TestCase):
+    """Tests for the pooled HTTP client against a local server"""
+    
+    @classmethod
+    def setUpClass(cls):
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive, so the client can reuse the connection
+            protocol_version = "HTTP/1.1"
+            
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                body = b"line one\nline two\n"
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, *args):
+                pass
+        
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/"
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+    
+    def setUp(self):
+        from http_client import HttpClient
+        self.client = HttpClient(pool_size=2)
+    
+    def tearDown(self):
+        self.client.close()
+    
+    def test_second_request_reuses_connection(self):
+        """Test that only the first request pays for connecting"""
+        first = self.client.post(self.url, data=b"one")
+        second = self.client.post(self.url, data=b"two")
+        
+        self.assertIsNotNone(first.timing.connect)
+        self.assertIsNone(second.timing.connect)
+        self.assertIsNotNone(second.timing.total)
+        self.assertIn("reused", str(second.timing))
+        print("✓ Pooled connection reuse test passed")
+    
+    def test_streamed_total_waits_for_body(self):
+        """Test that a streamed response has no total until its body is read"""
+        response = self.client.post(self.url, data=b"stream", stream=True)
+        self.assertIsNone(response.timing.total)
+        self.assertIn("streaming", str(response.timing))
+        
+        lines = list(response.iter_lines(decode_unicode=True))
+        self.assertEqual(lines, ["line one", "line two"])
+        self.assertGreaterEqual(response.timing.total, response.timing.ttfb)
+        print("✓ Streamed response timing test passed")
+    
+    def test_get_client_is_shared(self):
+        """Test that every caller gets the same process-wide client"""
+        import http_client
+        with patch.object(http_client, "_client", None):
+            client = http_client.get_client()
+            self.assertIs(http_client.get_client(), client)
+        print("✓ Shared HTTP client test passed")
+
+
+class TestAnswerCache(unittest.TestCase):
+    """Tests for the on-disk cache of generated answers"""
+    
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.cache = AnswerCache(self.cache_dir.name, max_entries=3, ttl_seconds=3600)
+    
+    def tearDown(self):
+        self.cache.close()
+        self.cache_dir.cleanup()
+    
+    def test_hit_ignores_case_and_whitespace(self):
+        """Test that a normalized question returns the stored answer"""
+        self.cache.put("What is DNA?", "model-a", 1, "Deoxyribonucleic acid")
+        self.assertEqual(self.cache.get("  what is   dna? ", "model-a", 1), "Deoxyribonucleic acid")
+        print("✓ Answer cache hit test passed")
+    
+    def test_model_and_prompt_version_are_part_of_key(self):
+        """Test that a different model or prompt version misses"""
+        self.cache.put("What is DNA?", "model-a", 1, "Deoxyribonucleic acid")
+        self.assertIsNone(self.cache.get("What is DNA?", "model-b", 1))
+        self.assertIsNone(self.cache.get("What is DNA?", "model-a", 2))
+        print("✓ Answer cache key test passed")
+    
+    def test_expired_answers_are_dropped(self):
+        """Test that answers older than the TTL are not returned"""
+        self.cache.ttl_seconds = 0
+        self.cache.put("Q", "model-a", 1, "A")
+        time.sleep(0.01)
+        self.assertIsNone(self.cache.get("Q", "model-a", 1))
+        self.assertEqual(len(self.cache), 0)
+        print("✓ Answer cache TTL test passed")
+    
+    def test_least_recently_used_is_evicted(self):
+        """Test that the size cap evicts the least recently used answer"""
+        for i in range(3):
+            self.cache.put(f"Q{i}", "model-a", 1, f"A{i}")
+            time.sleep(0.01)
+        self.cache.get("Q0", "model-a", 1)
+        time.sleep(0.01)
+        self.cache.put("Q3", "model-a", 1, "A3")
+        
+        self.assertEqual(len(self.cache), 3)
+        self.assertEqual(self.cache.get("Q0", "model-a", 1), "A0")
+        self.assertIsNone(self.cache.get("Q1", "model-a", 1))
+        print("✓ Answer cache LRU eviction test passed")
+
+
+@unittest.skipUnless(importlib.util.find_spec("PySide6") and importlib.util.find_spec("dotenv"),
+                     "PySide6 or python-dotenv not installed")
+class TestBatchAnswerGeneration(unittest.TestCase):
+    """Tests for generating answers for many questions at once"""
+    
+    def test_parse_questions(self):
+        """Test that blank lines and repeated questions are skipped"""
+        from BatchGenerateDialog import parse_questions
+        self.assertEqual(parse_questions("Q1\n\n  Q2 \nQ1\n"), ["Q1", "Q2"])
+        print("✓ Parse questions test passed")
+    
+    def test_concurrency_is_bounded_and_failures_reported(self):
+        """Test that no more than max_workers requests run at once"""
+        from BatchGenerateDialog import BatchAnswerGenerationWorker
+        import threading
+        lock = threading.Lock()
+        state = {"running": 0, "peak": 0}
+        
+        def fake_generate(question, answer_cache=None):
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.02)
+            with lock:
+                state["running"] -= 1
+            if question == "bad":
+                raise ValueError("boom")
+            return question.upper()
+        
+        questions = [f"q{i}" for i in range(9)] + ["bad"]
+        worker = BatchAnswerGenerationWorker(questions, max_workers=3)
+        answers, failures, progress = {}, {}, []
+        worker.answer_ready.connect(lambda index, answer: answers.__setitem__(index, answer))
+        worker.answer_failed.connect(lambda index, error: failures.__setitem__(index, error))
+        worker.progress.connect(lambda done, total: progress.append((done, total)))
+        with patch("answer_service.generate_answer", side_effect=fake_generate):
+            worker.run()
+        
+        self.assertLessEqual(state["peak"], 3)
+        self.assertEqual(answers, {i: f"Q{i}" for i in range(9)})
+        self.assertEqual(failures, {9: "boom"})
+        self.assertEqual(progress[-1], (10, 10))
+        print("✓ Bounded batch generation test passed")
+
+
+@unittest.skipUnless(importlib.util.find_spec("requests") and importlib.util.find_spec("dotenv"),
+                     "requests or python-dotenv not installed")
+class TestAnswerStreaming(unittest.TestCase):
+    """Tests for reading streamed answers"""
+    
+    def test_stream_deltas_are_joined_in_order(self):
+        """Test that content pieces are taken from data lines until [DONE]"""
+        from answer_service import iter_stream_deltas
+        lines = [
+            ": OPENROUTER PROCESSING",
+            'data: {"choices": [{"delta": {"role": "assistant"}}]}',
+            "",
+            'data: {"choices": [{"delta": {"content": "Deoxy"}}]}',
+            'data: {"choices": [{"delta": {"content": "ribonucleic acid"}}]}',
+            "data: [DONE]",
+            'data: {"choices": [{"delta": {"content": "ignored"}}]}',
+        ]
+        self.assertEqual(list(iter_stream_deltas(lines)), ["Deoxy", "ribonucleic acid"])
+        print("✓ Stream deltas test passed")
+    
+    def test_stream_error_raises(self):
+        """Test that an error event ends the stream with AnswerGenerationError"""
+        from answer_service import iter_stream_deltas, AnswerGenerationError
+        lines = ['data: {"error": {"message": "rate limited"}}']
+        with self.assertRaises(AnswerGenerationError):
+            list(iter_stream_deltas(lines))
+        print("✓ Stream error test passed")
+
+
+class TestAsyncRunner(unittest.TestCase):
+    """Tests for the background asyncio loop used for network calls"""
+    
+    def setUp(self):
+        self.runner = AsyncRunner(max_workers=4)
+    
+    def tearDown(self):
+        self.runner.stop()
+    
+    def test_coroutine_and_blocking_call(self):
+        """Test that coroutines and blocking functions return their results"""
+        async def add(a, b):
+            return a + b
+        
+        self.assertEqual(self.runner.submit(add(1, 2)).result(timeout=2), 3)
+        self.assertEqual(self.runner.run_blocking(sorted, [3, 1, 2], reverse=True).result(timeout=2), [3, 2, 1])
+        print("✓ Async runner results test passed")
+    
+    def test_blocking_calls_run_concurrently(self):
+        """Test that several blocking calls are in flight at the same time"""
+        import threading
+        barrier = threading.Barrier(3, timeout=2)
+        futures = [self.runner.run_blocking(barrier.wait) for _ in range(3)]
+        
+        self.assertEqual(sorted(future.result(timeout=3) for future in futures), [0, 1, 2])
+        print("✓ Concurrent blocking calls test passed")
+    
+    def test_cancel_all(self):
+        """Test that pending work is cancelled and errors are passed through"""
+        import asyncio
+        
+        async def wait_forever():
+            await asyncio.sleep(60)
+        
+        future = self.runner.submit(wait_forever())
+        failing = self.runner.run_blocking(int, "not a number")
+        with self.assertRaises(ValueError):
+            failing.result(timeout=2)
+        
+        self.runner.cancel_all()
+        self.assertTrue(future.cancelled())
+        self.assertEqual(self.runner.pending(), 0)
+        print("✓ Async runner cancel test passed")
+
+
+class TestLoginPipeline(unittest.TestCase):
+    """Tests for sign in with the users row fetched alongside the password check"""
+    make_tables = TestNormalizedStorage.make_tables
+    
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.row = {"id": 9, "name": "N", "email": "n@example.com", "scheduler": {}, "storage_version": 2}
+    
+    def tearDown(self):
+        self.cache_dir.cleanup()
+    
+    def make_app(self, supabase):
+        app = TestNormalizedStorage.make_app(self, supabase)
+        app.local_cache = LocalDeckCache(self.cache_dir.name)
+        return app
+    
+    def test_login_loads_user_with_one_profile_lookup(self):
+        """Test that a successful login does not look the user up twice"""
+        supabase, tables = self.make_tables([self.row])
+        app = self.make_app(supabase)
+        app.login_or_signup("n@example.com", "secret")
+        app.local_cache.close()
+        
+        self.assertEqual(app.user.id, 9)
+        supabase.auth.sign_in_with_password.assert_called_once()
+        self.assertEqual(tables["users"].select.call_count, 1)
+        print("✓ Single lookup login test passed")
+    
+    def test_wrong_password_is_not_treated_as_signup(self):
+        """Test that a known email with a bad password reports invalid credentials"""
+        supabase, tables = self.make_tables([self.row])
+        supabase.auth.sign_in_with_password.side_effect = Exception("Invalid login credentials")
+        app = self.make_app(supabase)
+        
+        with self.assertRaises(ValueError) as context:
+            app.login_or_signup("n@example.com", "wrong", "N")
+        self.assertIn("Invalid credentials", str(context.exception))
+        supabase.auth.sign_up.assert_not_called()
+        print("✓ Wrong password login test passed")
+    
+    def test_unknown_email_signs_up(self):
+        """Test that an unknown email with a name creates the account"""
+        supabase, tables = self.make_tables([])
+        supabase.auth.sign_in_with_password.side_effect = Exception("Invalid login credentials")
+        tables["users"].insert.return_value.execute.return_value.data = [{"id": 11}]
+        app = self.make_app(supabase)
+        app.login_or_signup("new@example.com", "secret", "New")
+        app.local_cache.close()
+        
+        supabase.auth.sign_up.assert_called_once()
+        self.assertEqual(app.user.id, 11)
+        self.assertEqual(tables["users"].select.call_count, 1)
+        print("✓ Sign up login test passed")
+
+
+class TestSessionRestore(unittest.TestCase):
+    """Tests for resuming the server session from saved tokens"""
+    make_tables = TestNormalizedStorage.make_tables
+    make_app = TestNormalizedStorage.make_app
+    
+    def setUp(self):
+        self.row = {"id": 9, "name": "N", "email": "n@example.com", "scheduler": {}, "storage_version": 2}
+    
+    def test_saved_session_skips_password(self):
+        """Test that saved tokens are used instead of a password sign in"""
+        supabase, tables = self.make_tables([self.row])
+        user = self.make_app(supabase).fetch_server_user("n@example.com", None, ("access", "refresh"))
+        
+        self.assertEqual(user.id, 9)
+        supabase.auth.set_session.assert_called_once_with("access", "refresh")
+        supabase.auth.sign_in_with_password.assert_not_called()
+        print("✓ Session restore test passed")
+    
+    def test_expired_session_falls_back_to_password(self):
+        """Test that a rejected refresh token falls back to the saved password"""
+        supabase, tables = self.make_tables([self.row])
+        supabase.auth.set_session.side_effect = Exception("Invalid Refresh Token")
+        user = self.make_app(supabase).fetch_server_user("n@example.com", "secret", ("access", "refresh"))
+        
+        self.assertEqual(user.id, 9)
+        supabase.auth.sign_in_with_password.assert_called_once()
+        print("✓ Session fallback test passed")
+    
+    def test_rejected_session_requires_sign_in(self):
+        """Test that a refused session without a password asks for a new sign in, network errors do not"""
+        supabase, tables = self.make_tables([self.row])
+        refused = Exception("Invalid Refresh Token")
+        refused.status = 400
+        supabase.auth.set_session.side_effect = refused
+        with self.assertRaises(SignInRequiredError):
+            self.make_app(supabase).fetch_server_user("n@example.com", None, ("access", "refresh"))
+        
+        supabase.auth.set_session.side_effect = ConnectionError("offline")
+        with self.assertRaises(ConnectionError) as raised:
+            self.make_app(supabase).fetch_server_user("n@example.com", None, ("access", "refresh"))
+        self.assertNotIsInstance(raised.exception, SignInRequiredError)
+        print("✓ Rejected session test passed")
+    
+    def test_refreshed_tokens_reach_listener(self):
+        """Test that auth state changes hand the new tokens to the session listener"""
+        supabase, tables = self.make_tables([self.row])
+        app = self.make_app(supabase)
+        saved = []
+        app.session_listener = lambda *tokens: saved.append(tokens)
+        session = Mock(access_token="new-access", refresh_token="new-refresh")
+        session.user.email = "n@example.com"
+        app._on_auth_state_change("TOKEN_REFRESHED", session)
+        app._on_auth_state_change("SIGNED_OUT", None)
+        
+        self.assertEqual(saved, [("n@example.com", "new-access", "new-refresh")])
+        print("✓ Session listener test passed")
+
+
+class TestReviewHistory(unittest.TestCase):
+    """Tests for the lazily loaded review history"""
+    
+    def test_pages_are_loaded_on_iteration(self):
+        """Test that the stored history is read page by page only when iterated"""
+        calls = []
+        stored = [MockReviewLog(rating=1 + i % 4).to_dict() for i in range(5)]
+        
+        def loader(offset, limit):
+            calls.append((offset, limit))
+            return stored[offset:offset + limit]
+        
+        history = ReviewHistory(page_loader=loader)
+        history.append(MockReviewLog(rating=4))
+        self.assertEqual(calls, [])
+        
+        ratings = [log["rating"] for log in history.iter_stored_dicts(page_size=2)]
+        self.assertEqual(calls, [(0, 2), (2, 2), (4, 2)])
+        self.assertEqual(len(ratings), 5)
+        self.assertEqual(len(history.load_all()), 6)
+        self.assertEqual(history.load_all()[-1].rating, 4)
+        print("✓ Paged review history test passed")
+    
+    def test_new_logs_and_extend(self):
+        """Test that appended logs are kept apart from the stored history"""
+        history = ReviewHistory(stored=[MockReviewLog(rating=2).to_dict()])
+        history.extend([MockReviewLog(rating=3)])
+        
+        self.assertEqual([log.rating for log in history.new_logs], [3])
+        self.assertEqual([log.rating for log in history], [2, 3])
+        print("✓ Review history append test passed")
+    
+    def test_uploaded_logs_are_not_read_twice(self):
+        """Test that logs a save uploaded are only read back from the stored history"""
+        server = [MockReviewLog(rating=1).to_dict()]
+        history = ReviewHistory(page_loader=lambda offset, limit: server[offset:offset + limit])
+        uploaded = MockReviewLog(rating=3)
+        history.append(uploaded)
+        server.append(uploaded.to_dict())
+        
+        history.mark_stored([uploaded])
+        
+        self.assertEqual([log.rating for log in history], [1, 3])
+        self.assertEqual(history.new_logs, [])
+        print("✓ Uploaded review logs test passed")
+    
+    def test_cache_only_history_keeps_uploaded_logs(self):
+        """Test that a history without stored logs keeps uploaded logs readable"""
+        log = MockReviewLog(rating=2)
+        history = ReviewHistory(new_logs=[log])
+        
+        history.mark_stored([log])
+        
+        self.assertEqual(list(history), [log])
+        print("✓ Cache only review history test passed")
+    
+    def test_cached_user_keeps_only_unsynced_logs(self):
+        """Test that opening from the cache does not build the synced history"""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            from base_classes import App
+            app = App()
+            app.local_cache = LocalDeckCache(cache_dir)
+            user = User("Log User", "log@example.com", [], [MockReviewLog(rating=1)], MockScheduler())
+            app.local_cache.store_user(user)
+            app.user = app.load_cached_user("log@example.com")
+            app.user.record_review(FullCard(MockCard(), "Q", "A", set()), MockCard(), MockReviewLog(rating=3))
+            app.local_cache.store_changes(app.user, app.user.changes.snapshot())
+            
+            restarted = app.load_cached_user("log@example.com")
+            app.local_cache.close()
+        
+        self.assertEqual([log.rating for log in restarted.review_logs], [3])
+        self.assertEqual(len(restarted.changes.snapshot().review_logs), 1)
+        print("✓ Cached review history test passed")
+
+
+class TestReviewJournal(unittest.TestCase):
+    """Tests for the append-only binary review journal"""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.journal = ReviewJournal(os.path.join(self.tmp.name, "journals", "user.bin"))
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def make_log(self, card_id, rating=3, duration=1500):
+        return {"card_id": card_id, "rating": rating,
+                "review_datetime": "2026-03-01T12:30:45.123000+00:00", "review_duration": duration}
+    
+    def test_append_syncs_in_background(self):
+        """Test that appending does not fsync on the calling thread"""
+        import threading
+        synced_on = []
+        done = threading.Event()
+        def fake_fsync(fd):
+            synced_on.append(threading.current_thread())
+            done.set()
+        with patch('review_journal.os.fsync', side_effect=fake_fsync):
+            self.journal.append([self.make_log(1)])
+            self.assertTrue(done.wait(timeout=5))
+        
+        self.assertNotIn(threading.current_thread(), synced_on)
+        self.assertEqual(len(self.journal.unsynced()), 1)
+        print("✓ Background journal sync test passed")
+    
+    def test_record_round_trip(self):
+        """Test that a log survives encoding into a fixed-width record"""
+        from review_journal import RECORD, encode_log, decode_record
+        log = self.make_log(1760000000123, rating=4)
+        record = encode_log(log)
+        
+        self.assertEqual(len(record), RECORD.size)
+        self.assertEqual(RECORD.size, 21)
+        self.assertEqual(decode_record(record), log)
+        self.assertIsNone(decode_record(encode_log(self.make_log(1, duration=None)))["review_duration"])
+        print("✓ Journal record round trip test passed")
+    
+    def test_append_and_mark_synced(self):
+        """Test that only records past the watermark are unsynced and the file is compacted"""
+        from review_journal import HEADER, RECORD
+        self.journal.append([self.make_log(1), self.make_log(2)])
+        self.journal.append([self.make_log(3)])
+        self.assertEqual([log["card_id"] for log in self.journal.unsynced()], [1, 2, 3])
+        
+        self.journal.mark_synced(2)
+        self.assertEqual([log["card_id"] for log in self.journal.unsynced()], [3])
+        self.assertEqual(os.path.getsize(self.journal.path), HEADER.size + 3 * RECORD.size)
+        
+        self.journal.mark_synced(1)
+        self.assertEqual(self.journal.unsynced(), [])
+        self.assertEqual(os.path.getsize(self.journal.path), HEADER.size)
+        print("✓ Journal watermark test passed")
+    
+    def test_failed_append_does_not_skip_later_records(self):
+        """Test that uploading a review missing from the journal leaves later records unsynced"""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = LocalDeckCache(cache_dir)
+            user = User("Journal User", "journal@example.com", [], [], MockScheduler())
+            cache.store_user(user)
+            user.journal = cache.journal(user.email)
+            card = FullCard(MockCard(card_id=7), "Q", "A", set())
+            with patch.object(user.journal, "append", side_effect=OSError("disk full")):
+                user.record_review(card, card.card, MockReviewLog(card_id=7, rating=1))
+            user.record_review(card, card.card, MockReviewLog(card_id=7, rating=2))
+            saved = user.changes.take()
+            user.record_review(card, card.card, MockReviewLog(card_id=7, rating=3))
+            
+            cache.mark_synced(user.email, saved)
+            unsynced = user.journal.unsynced()
+            cache.close()
+        
+        self.assertEqual(len(saved.review_logs), 2)
+        self.assertEqual([log["rating"] for log in unsynced], [3])
+        print("✓ Failed journal append test passed")
+    
+    def test_short_header_is_rewritten(self):
+        """Test that a journal cut short before its header reached the disk can be appended to"""
+        from review_journal import HEADER
+        os.makedirs(os.path.dirname(self.journal.path))
+        with open(self.journal.path, "wb") as f:
+            f.write(b"EM")
+        
+        self.assertEqual(self.journal.unsynced(), [])
+        self.journal.append([self.make_log(1)])
+        self.journal.append([self.make_log(2)])
+        
+        self.assertEqual([log["card_id"] for log in self.journal.unsynced()], [1, 2])
+        with open(self.journal.path, "rb") as f:
+            self.assertEqual(f.read(4), b"EMRJ")
+        print("✓ Short journal header test passed")
+    
+    def test_torn_record_is_ignored(self):
+        """Test that a record cut short by a crash is dropped and overwritten"""
+        self.journal.append([self.make_log(1)])
+        with open(self.journal.path, "ab") as f:
+            f.write(b"\x01\x02\x03")
+        self.assertEqual(len(self.journal.unsynced()), 1)
+        
+        self.journal.append([self.make_log(2)])
+        self.assertEqual([log["card_id"] for log in self.journal.unsynced()], [1, 2])
+        print("✓ Torn journal record test passed")
+    
+    def test_reviews_are_journaled_before_saving(self):
+        """Test that reviews reach the disk when recorded and a save uploads only those"""
+        from base_classes import App
+        from card_storage import NormalizedStorage
+        app = App()
+        app.supabase = MagicMock()
+        app.storage = NormalizedStorage(app.supabase)
+        app.local_cache = LocalDeckCache(self.tmp.name)
+        card = FullCard(MockCard(card_id=10), "Q", "A", set())
+        app.local_cache.store_user(User("Journal User", "journal@example.com", [card], [], MockScheduler()))
+        user = app.load_cached_user("journal@example.com")
+        
+        for rating in (1, 3):
+            user.record_review(user.full_cards[0], MockCard(card_id=10), MockReviewLog(rating=rating, card_id=10))
+        # Nothing was saved, a restart still finds both reviews
+        self.assertEqual(len(app.load_cached_user("journal@example.com").changes.snapshot().review_logs), 2)
+        
+        user = app.load_cached_user("journal@example.com")
+        app.save_user()
+        app.local_cache.close()
+        
+        inserted = [call.args[0] for call in app.supabase.table.return_value.insert.call_args_list]
+        self.assertEqual([len(rows) for rows in inserted], [2])
+        self.assertEqual(app.local_cache.journal("journal@example.com").unsynced(), [])
+        print("✓ Journaled reviews test passed")
+
+
+@unittest.skipUnless(importlib.util.find_spec("numpy"), "numpy not installed")
+class TestFsrsStats(unittest.TestCase):
+    """Tests for the vectorized deck statistics"""
+    
+    def setUp(self):
+        self.now = datetime(2026, 5, 1, 12, 0)
+        
+    def make_card(self, stability, reviewed_days_ago, due_in_days):
+        card = MockCard(stability=stability, difficulty=5.0)
+        card.last_review = None if reviewed_days_ago is None else self.now - timedelta(days=reviewed_days_ago)
+        card.due = self.now + timedelta(days=due_in_days)
+        return FullCard(card, "Q", "A", set())
+    
+    def test_retrievability_curve(self):
+        """Test that R is 1 right after a review and 0.9 once stability days passed"""
+        import fsrs_stats
+        values = fsrs_stats.retrievability([10.0, 10.0, 10.0], [0.0, 10.0, 100.0])
+        
+        self.assertAlmostEqual(values[0], 1.0)
+        self.assertAlmostEqual(values[1], 0.9)
+        self.assertLess(values[2], values[1])
+        self.assertAlmostEqual(fsrs_stats.retrievability(10.0, 10.0, decay=0.2), 0.9)
+        print("✓ Retrievability curve test passed")
+    
+    def test_forecast_matches_per_card_math(self):
+        """Test due counts, overdue cards and retention against a per-card computation"""
+        import fsrs_stats
+        cards = [self.make_card(10.0, 10, -2), self.make_card(5.0, 1, 0.5),
+                 self.make_card(20.0, 3, 3.5), self.make_card(0.0, None, 0), self.make_card(8.0, 2, 60)]
+        
+        stats = fsrs_stats.deck_forecast(cards, self.now, days=7)
+        
+        self.assertEqual(stats.reviewed, 4)
+        self.assertEqual(stats.overdue, 1)
+        self.assertEqual(list(stats.due_per_day), [3, 0, 0, 1, 0, 0, 0])
+        self.assertEqual(stats.retrievability[3], 0.0)
+        expected = [fsrs_stats.retrievability(10.0, 10), fsrs_stats.retrievability(5.0, 1),
+                    fsrs_stats.retrievability(20.0, 3), fsrs_stats.retrievability(8.0, 2)]
+        self.assertAlmostEqual(stats.mean_retrievability, sum(expected) / 4)
+        lapse_today = (1 - fsrs_stats.retrievability(10.0, 8)) + (1 - fsrs_stats.retrievability(5.0, 1.5))
+        self.assertAlmostEqual(stats.expected_lapses_per_day[0], lapse_today)
+        self.assertAlmostEqual(stats.workload_per_day[0], 3 + lapse_today)
+        print("✓ Deck forecast test passed")
+    
+    def test_empty_deck(self):
+        """Test that a deck without cards gives zero counts and no retention"""
+        import fsrs_stats
+        stats = fsrs_stats.deck_forecast([], self.now, days=3)
+        
+        self.assertIsNone(stats.mean_retrievability)
+        self.assertEqual(list(stats.due_per_day), [0, 0, 0])
+        print("✓ Empty deck statistics test passed")
+
+
+class TestSchedulerOptimizer(unittest.TestCase):
+    """Tests for fitting the scheduler to the review history"""
+    
+    def make_optimizer(self, parameters):
+        from concurrent.futures import Future
+        from scheduler_optimizer import SchedulerOptimizer
+        optimizer = SchedulerOptimizer()
+        fitted = Future()
+        fitted.set_result(parameters)
+        # Stands in for the process pool, the fit itself needs the real fsrs optimizer
+        optimizer._executor = Mock()
+        optimizer._executor.submit.return_value = fitted
+        return optimizer
+    
+    def test_fitted_scheduler_replaces_parameters(self):
+        """Test that the fitted parameters end up in a new scheduler"""
+        from scheduler_optimizer import MIN_REVIEW_LOGS
+        optimizer = self.make_optimizer([0.5, 1.5])
+        logs = [MockReviewLog(rating=3) for _ in range(MIN_REVIEW_LOGS)]
+        
+        scheduler = optimizer.optimize(logs, MockScheduler({"old": True}))
+        
+        self.assertEqual(scheduler.parameters, [0.5, 1.5])
+        submitted = optimizer._executor.submit.call_args.args[1]
+        self.assertEqual(len(submitted), MIN_REVIEW_LOGS)
+        print("✓ Scheduler fit test passed")
+    
+    def test_short_history_is_rejected(self):
+        """Test that a fit is refused before starting the optimizer process"""
+        from scheduler_optimizer import NotEnoughReviewsError
+        optimizer = self.make_optimizer([])
+        
+        with self.assertRaises(NotEnoughReviewsError):
+            optimizer.optimize([MockReviewLog()], MockScheduler())
+        optimizer._executor.submit.assert_not_called()
+        print("✓ Short history rejection test passed")
+    
+    def test_paged_history_is_passed_as_dicts(self):
+        """Test that stored logs reach the optimizer without building ReviewLog objects"""
+        from scheduler_optimizer import review_log_dicts
+        stored = [MockReviewLog(rating=1).to_dict()]
+        history = ReviewHistory(page_loader=lambda offset, limit: stored[offset:offset + limit])
+        history.append(MockReviewLog(rating=4))
+        
+        log_dicts = review_log_dicts(history)
+        
+        self.assertIs(log_dicts[0], stored[0])
+        self.assertEqual([log["rating"] for log in log_dicts], [1, 4])
+        print("✓ Paged history conversion test passed")
+    
+    def test_set_scheduler_is_saved(self):
+        """Test that swapping the scheduler marks it for upload"""
+        user = User("Fit User", "fit@example.com", [], [], MockScheduler())
+        user.set_scheduler(MockScheduler({"w": [1.0]}))
+        
+        self.assertTrue(user.changes.snapshot().scheduler_changed)
+        self.assertEqual(user.scheduler.parameters, {"w": [1.0]})
+        print("✓ Scheduler swap test passed")
+
+
+@unittest.skipUnless(importlib.util.find_spec("PySide6"), "PySide6 not installed")
+class TestThemeEngine(unittest.TestCase):
+    """Tests for the cached application stylesheet"""
+    
+    def test_stylesheet_is_built_once_per_profile(self):
+        """Test that the same colors reuse the cached stylesheet"""
+        from theme import ThemeEngine
+        from ColorProfile import ColorProfile
+        engine = ThemeEngine()
+        
+        first = engine.stylesheet(ColorProfile("#167eaf", "#aaffff"))
+        again = engine.stylesheet(ColorProfile("#167eaf", "#aaffff"))
+        other = engine.stylesheet(ColorProfile("#000000", "#aaffff"))
+        
+        self.assertIs(first, again)
+        self.assertNotEqual(first, other)
+        self.assertIn('QPushButton[role="tag"]', first)
+        print("✓ Stylesheet cache test passed")
+    
+    def test_theme_switch_sets_one_stylesheet(self):
+        """Test that applying a profile is one setStyleSheet call and repeating it is none"""
+        from theme import ThemeEngine
+        from ColorProfile import ColorProfile
+        engine = ThemeEngine()
+        app = Mock()
+        
+        engine.apply(ColorProfile("#167eaf", "#aaffff"), app)
+        engine.apply(ColorProfile("#167eaf", "#aaffff"), app)
+        engine.apply(ColorProfile("#123456", "#aaffff"), app)
+        
+        self.assertEqual(app.setStyleSheet.call_count, 2)
+        print("✓ Theme switch test passed")
+
+
+class TestStartupProfiler(unittest.TestCase):
+    """Tests for the startup profiler and the deferred startup work"""
+    
+    def test_first_imports_are_timed(self):
+        """Test that new imports are recorded with their nesting and milestones split them"""
+        from startup_profiler import StartupProfiler
+        with tempfile.TemporaryDirectory() as module_dir:
+            with open(os.path.join(module_dir, "profiled_outer.py"), "w") as f:
+                f.write("import profiled_inner\n")
+            with open(os.path.join(module_dir, "profiled_inner.py"), "w") as f:
+                f.write("VALUE = 1\n")
+            sys.path.insert(0, module_dir)
+            profiler = StartupProfiler()
+            profiler.install()
+            try:
+                import profiled_outer
+                import json
+                profiler.mark("window shown")
+            finally:
+                profiler.uninstall()
+                sys.path.remove(module_dir)
+                sys.modules.pop("profiled_outer", None)
+                sys.modules.pop("profiled_inner", None)
+        
+        depths = {name: depth for name, depth, _, _, _ in profiler.imports}
+        self.assertEqual(depths, {"profiled_outer": 0, "profiled_inner": 1})
+        self.assertFalse(profiler.installed)
+        report = profiler.report()
+        self.assertIn("window shown", report)
+        self.assertIn("profiled_outer", report)
+        print("✓ Startup import timing test passed")
+    
+    def test_supabase_client_created_on_first_use(self):
+        """Test that App does not create the Supabase client until it is needed"""
+        from base_classes import App
+        with patch('base_classes.create_client') as mock_create_client:
+            app = App()
+            mock_create_client.assert_not_called()
+            client = app.supabase
+            storage = app.storage
+        
+        mock_create_client.assert_called_once()
+        self.assertIs(app.supabase, client)
+        self.assertIs(storage.supabase, client)
+        print("✓ Deferred Supabase client test passed")
+    
+    def test_log_file_created_on_first_record(self):
+        """Test that the logs directory is only made when something is logged"""
+        from logger_config import LazyRotatingFileHandler
+        import logging
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log_path = os.path.join(tmp_dir, "logs", "test.log")
+            handler = LazyRotatingFileHandler(log_path, maxBytes=1024, backupCount=1)
+            self.assertFalse(os.path.exists(os.path.dirname(log_path)))
+            handler.emit(logging.LogRecord("test", logging.INFO, __file__, 1, "hello", None, None))
+            handler.close()
+            with open(log_path) as f:
+                self.assertIn("hello", f.read())
+        print("✓ Deferred log file test passed")
+
+
+@unittest.skipUnless(importlib.util.find_spec("dotenv"), "python-dotenv not installed")
+class TestCredentialKey(unittest.TestCase):
+    """Tests for loading the credential encryption key in the background"""
+    
+    def test_key_derived_once_per_process(self):
+        """Test that the key is derived on a worker once and the cipher is shared"""
+        import local_storage
+        with tempfile.TemporaryDirectory() as key_dir:
+            key_file = os.path.join(key_dir, "key.key")
+            with patch('local_storage.derive_machine_key', return_value=b"derived-key") as derive, \
+                 patch('local_storage.Fernet', side_effect=lambda key: ("cipher", key)):
+                first = local_storage.get_cipher_async(key_file)
+                second = local_storage.get_cipher_async(key_file)
+                cipher = first.result(timeout=5)
+            with open(key_file, 'rb') as f:
+                saved_key = f.read()
+        
+        self.assertIs(first, second)
+        self.assertEqual(cipher, ("cipher", b"derived-key"))
+        self.assertEqual(saved_key, b"derived-key")
+        derive.assert_called_once()
+        print("✓ Background key derivation test passed")
+    
+    def test_key_file_moved_into_keyring(self):
+        """Test that an existing key file is moved into the keyring instead of deriving a new key"""
+        import local_storage
+        passwords = {}
+        fake_keyring = Mock()
+        fake_keyring.get_password.side_effect = lambda service, name: passwords.get((service, name))
+        fake_keyring.set_password.side_effect = lambda service, name, value: passwords.__setitem__((service, name), value)
+        with tempfile.TemporaryDirectory() as key_dir:
+            key_file = os.path.join(key_dir, "key.key")
+            with open(key_file, 'wb') as f:
+                f.write(b"old-file-key")
+            with patch.dict(sys.modules, {"keyring": fake_keyring}), \
+                 patch('local_storage.Config.CREDENTIAL_KEY_STORE', "keyring"), \
+                 patch('local_storage.derive_machine_key') as derive:
+                from pathlib import Path
+                key = local_storage.load_key(Path(key_file))
+                again = local_storage.load_key(Path(key_file))
+            key_file_left = os.path.exists(key_file)
+        
+        self.assertEqual(key, b"old-file-key")
+        self.assertEqual(again, b"old-file-key")
+        self.assertFalse(key_file_left)
+        derive.assert_not_called()
+        print("✓ Keyring key migration test passed")
+
+
+class TestLoggingPipeline(unittest.TestCase):
+    """Tests for the queue based logging pipeline"""
+    
+    def test_module_loggers_share_one_queue_handler(self):
+        """Test that module loggers are handler-free children of the 'emphizor' logger"""
+        import logging
+        from logger_config import get_logger, LocalQueueHandler, ROOT_LOGGER_NAME
+        module_logger = get_logger("some_module")
+        get_logger("some_module")
+        root = logging.getLogger(ROOT_LOGGER_NAME)
+        
+        self.assertEqual(module_logger.name, "emphizor.some_module")
+        self.assertEqual(module_logger.handlers, [])
+        self.assertIs(get_logger("emphizor.some_module"), module_logger)
+        # pytest attaches its capture handlers to non-propagating loggers as well
+        queue_handlers = [handler for handler in root.handlers if isinstance(handler, LocalQueueHandler)]
+        self.assertEqual(len(queue_handlers), 1)
+        self.assertFalse(root.propagate)
+        print("✓ Shared queue handler test passed")
+    
+    def test_records_written_once_on_listener_thread(self):
+        """Test that arguments are merged at the call and the record is handled on the listener thread"""
+        import logging
+        import logging.handlers
+        import queue
+        import threading
+        from logger_config import LocalQueueHandler
+        
+        handled = []
+        class RecordingHandler(logging.Handler):
+            def emit(self, record):
+                handled.append((record.getMessage(), threading.current_thread()))
+        
+        log_queue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(log_queue, RecordingHandler())
+        test_logger = logging.getLogger("pipeline_test")
+        test_logger.propagate = False
+        test_logger.setLevel(logging.DEBUG)
+        queue_handler = LocalQueueHandler(log_queue)
+        test_logger.addHandler(queue_handler)
+        listener.start()
+        try:
+            tags = ["math"]
+            test_logger.info("Tags: %s", tags)
+            tags.append("physics")
+        finally:
+            listener.stop()
+            test_logger.removeHandler(queue_handler)
+        
+        self.assertEqual(len(handled), 1)
+        self.assertEqual(handled[0][0], "Tags: ['math']")
+        self.assertIsNot(handled[0][1], threading.current_thread())
+        print("✓ Listener thread logging test passed")
+
+
 if __name__ == '__main__':
     print("Running comprehensive Emphizor tests...")
     print("=" * 60)
@@ -449,7 +2014,31 @@ if __name__ == '__main__':
         TestFullCardClass,
         TestMockClasses,
         TestAppIntegration,
-        TestEdgeCases
+        TestEdgeCases,
+        TestChangeTracker,
+        TestIncrementalSave,
+        TestNormalizedStorage,
+        TestLocalDeckCache,
+        TestSaveWorker,
+        TestDueIndex,
+        TestTagIndex,
+        TestSearchIndex,
+        TestCardListModel,
+        TestHttpClient,
+        TestAnswerCache,
+        TestBatchAnswerGeneration,
+        TestAnswerStreaming,
+        TestAsyncRunner,
+        TestLoginPipeline,
+        TestSessionRestore,
+        TestReviewHistory,
+        TestReviewJournal,
+        TestFsrsStats,
+        TestSchedulerOptimizer,
+        TestThemeEngine,
+        TestStartupProfiler,
+        TestCredentialKey,
+        TestLoggingPipeline
     ]
     
     for test_class in test_classes:
@@ -0,0 +1,302 @@
+"""
+Theme engine for Emphizor
+Turns a ColorProfile into one application-wide stylesheet. Widgets are picked out by object name
+or by a "role" property instead of each carrying its own stylesheet, so a theme switch is a single
+setStyleSheet call and Qt parses the CSS once
+"""
+
+import threading
+from PySide6.QtWidgets import QApplication
+from logger_config import get_logger
+
+# Set up logger for this module
+logger = get_logger(__name__)
+
+# Dynamic property that selects widget-specific rules, e.g. QPushButton[role="tag"]
+ROLE_PROPERTY = "role"
+TAG_ROLE = "tag"
+
+
+def build_stylesheet(main_color, end_color) -> str:
+    """The application stylesheet for a main and a gradient end QColor"""
+    main = main_color.name()
+    end = end_color.name()
+    main_dark = main_color.darker(140).name()
+    end_dark = end_color.darker(130).name()
+    end_darker = end_color.darker(140).name()
+    end_mid = end_color.darker(110).name()
+    end_light = end_color.lighter(110).name()
+    end_lighter = end_color.lighter(120).name()
+    return f"""
+        QMainWindow {{
+            background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
+                stop: 0 {main}, stop: 1 {end});
+            color: white;
+        }}
+
+        QLabel {{
+            color: white;
+            font-weight: 600;
+            font-size: 14px;
+        }}
+
+        QPushButton {{
+            background: rgba(255, 255, 255, 0.95);
+            border: 2px solid rgba(255, 255, 255, 0.3);
+            border-radius: 15px;
+            padding: 12px 20px;
+            font-weight: 700;
+            font-size: 14px;
+            color: {end_darker};
+            min-height: 20px;
+        }}
+
+        QPushButton:hover {{
+            background: white;
+            border-color: {end_darker};
+        }}
+
+        QPushButton:pressed {{
+            background: rgba(240, 240, 240, 0.9);
+            border-color: {main_color.lighter(120).name()};
+            color: {main_dark};
+        }}
+
+        QPushButton:checked {{
+            background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
+                stop: 0 {end_dark}, stop: 1 {end_light});
+            border-color: {end_mid};
+            color: white;
+        }}
+
+        QTextEdit {{
+            background: rgba(255, 255, 255, 0.98);
+            border: 2px solid rgba(255, 255, 255, 0.3);
+            border-radius: 15px;
+            padding: 15px;
+            font-size: 16px;
+            color: {main_dark};
+            selection-background-color: {end_dark};
+            selection-color: white;
+        }}
+
+        QTextEdit:focus {{
+            border-color: {end_color.darker(105).name()};
+            background: white;
+            color: {main_dark};
+        }}
+
+        QMenuBar {{
+            background: rgba(255, 255, 255, 0.1);
+            border: none;
+            border-radius: 8px;
+            color: white;
+            font-weight: 600;
+            font-size: 14px;
+            padding: 5px;
+        }}
+
+        QMenuBar::item {{
+            padding: 8px 16px;
+            border-radius: 6px;
+            color: white;
+        }}
+
+        QMenuBar::item:selected {{
+            background: {end_dark};
+            color: white;
+        }}
+
+        QMenu {{
+            background: rgba(255, 255, 255, 0.98);
+            border: 2px solid {end_dark};
+            border-radius: 12px;
+            padding: 8px;
+        }}
+
+        QMenu::item {{
+            padding: 8px 16px;
+            border-radius: 6px;
+            color: {main_dark};
+        }}
+
+        QMenu::item:selected {{
+            background: {main_dark};
+            color: {end_mid};
+        }}
+
+        QStatusBar {{
+            background: rgba(255, 255, 255, 0.1);
+            border: none;
+            border-radius: 8px;
+            color: white;
+            font-weight: 600;
+            font-size: 13px;
+            padding: 5px;
+        }}
+
+        QPushButton#addCartButton, QPushButton#practiceButton {{
+            background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
+                stop: 0 {end_dark}, stop: 1 {end_light});
+            border: 2px solid {end_mid};
+            border-radius: 15px;
+            color: white;
+            font-weight: bold;
+            font-size: 16px;
+            padding: 15px 25px;
+            min-height: 25px;
+        }}
+        QPushButton#addCartButton:hover {{
+            background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
+                stop: 0 {end_mid}, stop: 1 {end_lighter});
+            border-color: {end_dark};
+            color: white;
+        }}
+        QPushButton#practiceButton:hover {{
+            background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
+                stop: 0 {end_dark}, stop: 1 {end_dark});
+            border-color: {end_dark};
+            color: white;
+        }}
+        QPushButton#addCartButton:pressed, QPushButton#practiceButton:pressed {{
+            background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
+                stop: 0 {end_light}, stop: 1 {end_mid});
+            color: white;
+        }}
+
+        QPushButton#viewCardsButton {{
+            background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
+                stop: 0 {end_light}, stop: 1 {end_color.darker(105).name()});
+            border: 2px solid {end};
+            border-radius: 15px;
+            color: white;
+            font-weight: bold;
+            font-size: 16px;
+            padding: 15px 25px;
+            min-height: 25px;
+        }}
+        QPushButton#viewCardsButton:hover {{
+            background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
+                stop: 0 {end_lighter}, stop: 1 {end});
+            border-color: {end_light};
+            color: white;
+        }}
+        QPushButton#viewCardsButton:pressed {{
+            background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
+                stop: 0 {end_color.darker(105).name()}, stop: 1 {end_color.lighter(105).name()});
+            color: white;
+        }}
+
+        QPushButton#generateAnswerButton {{
+            background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
+                stop: 0 {main}, stop: 1 {end});
+            border: 2px solid {end_color.darker(105).name()};
+            border-radius: 15px;
+            color: white;
+            font-weight: bold;
+            font-size: 16px;
+            padding: 15px 25px;
+            min-height: 25px;
+        }}
+        QPushButton#generateAnswerButton:hover {{
+            background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
+                stop: 0 {end}, stop: 1 {main});
+            border-color: {main};
+            color: white;
+        }}
+        QPushButton#generateAnswerButton:pressed {{
+            background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
+                stop: 0 {main_color.darker(105).name()}, stop: 1 {end_light});
+            color: white;
+        }}
+        QPushButton#generateAnswerButton:disabled {{
+            background: rgba(255, 255, 255, 0.1);
+            border: 2px solid rgba(255, 255, 255, 0.3);
+            color: rgba(255, 255, 255, 0.5);
+        }}
+
+        QPushButton[{ROLE_PROPERTY}="{TAG_ROLE}"] {{
+            background: rgba(255, 255, 255, 0.9);
+            border: 2px solid rgba(255, 255, 255, 0.3);
+            border-radius: 12px;
+            padding: 8px 12px;
+            margin: 3px;
+            font-weight: 600;
+            font-size: 13px;
+            color: {main_dark};
+            min-width: 60px;
+        }}
+        QPushButton[{ROLE_PROPERTY}="{TAG_ROLE}"]:hover {{
+            background: white;
+            border-color: {end_color.darker(115).name()};
+            color: {end_mid};
+        }}
+        QPushButton[{ROLE_PROPERTY}="{TAG_ROLE}"]:checked {{
+            background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
+                stop: 0 {end_dark}, stop: 1 {end_light});
+            border-color: {end_mid};
+            color: white;
+        }}
+    """
+
+
+def repolish(*widgets):
+    """Apply the style rules to widgets again, e.g. after a property in their selectors changed"""
+    for widget in widgets:
+        style = widget.style()
+        style.unpolish(widget)
+        style.polish(widget)
+
+
+def set_style_property(widget, name, value, *dependents):
+    """Change a property used in selectors and restyle just this widget, no CSS is parsed again
+
+    Children whose rules select on the property, e.g. QFrame[state="on"] QLabel, are given as dependents.
+    """
+    widget.setProperty(name, value)
+    repolish(widget, *dependents)
+
+
+class ThemeEngine:
+    """Builds stylesheets per ColorProfile, caches them and applies them to the application"""
+
+    def __init__(self):
+        self._stylesheets = {}
+        self._applied_key = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def profile_key(color_profile) -> tuple[str, str]:
+        return color_profile.main_color.name(), color_profile.gradient_end_color.name()
+
+    def stylesheet(self, color_profile) -> str:
+        key = self.profile_key(color_profile)
+        with self._lock:
+            stylesheet = self._stylesheets.get(key)
+            if stylesheet is None:
+                stylesheet = build_stylesheet(color_profile.main_color, color_profile.gradient_end_color)
+                self._stylesheets[key] = stylesheet
+        return stylesheet
+
+    def apply(self, color_profile, app=None):
+        """Style the whole application for the profile, nothing happens if it already is"""
+        key = self.profile_key(color_profile)
+        if key == self._applied_key:
+            return
+        app = app or QApplication.instance()
+        app.setStyleSheet(self.stylesheet(color_profile))
+        self._applied_key = key
+        logger.debug("Applied theme %s -> %s", key[0], key[1])
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_theme_engine() -> ThemeEngine:
+    """The process-wide theme engine, there is one application stylesheet"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = ThemeEngine()
+        return _engine